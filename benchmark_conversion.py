@@ -0,0 +1,442 @@
+#!/usr/bin/python
+# coding=utf8
+
+"""
+================================================================================
+  LingSync-to-OLD Conversion Benchmark
+================================================================================
+
+This script times the conversion step of lingsync2old.py (i.e., the
+`lingsync2old` function) on synthetic LingSync corpora of increasing sizes
+(see synthetic_lingsync_corpus.py), so that the scaling of the conversion can
+be measured, and its regressions caught, without real corpora.
+
+For each corpus size, the synthetic corpus is generated (once; it is kept in
+the working directory and reused by later runs) and converted in a fresh
+process, whose wall-clock time, CPU time and peak memory (resident set size)
+are measured, as are those of the conversion's worker processes, if any. The
+audio files that the synthetic datums refer to are served from a local HTTP
+server, so that the conversion's media download step runs too, without
+network access.
+
+The results are printed and appended, one JSON object per line, to a results
+file. If a baseline results file is given, each result is compared to the
+last result in it for the same corpus size and conversion options, and the
+script exits with status 1 if any conversion is slower than its baseline by
+more than the tolerance.
+
+
+Usage
+--------------------------------------------------------------------------------
+
+Benchmark the conversion of corpora of 1,000, 10,000 and 100,000 datums::
+
+    $ ./benchmark_conversion.py --sizes=1000,10000,100000
+
+Check for regressions against earlier results::
+
+    $ ./benchmark_conversion.py --sizes=10000 --repeat=3 \
+            --baseline=_ls2old_benchmark/benchmark-results.jsonl
+
+Full param/option listing:
+
+    --sizes: the comma-separated numbers of datums of the synthetic corpora to
+        convert. Default is 1000,10000,100000,1000000.
+
+    --repeat: the number of times to convert each corpus; the fastest
+        conversion is reported. Default is 1.
+
+    --convert-workers, --compact-records, --sharded-output: passed on to the
+        conversion (see lingsync2old.py).
+
+    --seed: the seed of the synthetic corpora. Default is 0.
+
+    --media-port: the port on which the audio files of the synthetic datums
+        are served. Default is 8765.
+
+    --workdir: the directory where the synthetic corpora, the converted data
+        and the results are kept. Default is '_ls2old_benchmark'.
+
+    --results: the file to which the results are appended. Default is
+        'benchmark-results.jsonl' in the working directory.
+
+    --baseline: a results file to compare the results to.
+
+    --tolerance: the proportion by which a conversion may be slower than its
+        baseline before it is reported as a regression. Default is 0.1.
+
+    --regenerate: boolean that, when `True`, regenerates the synthetic
+        corpora even if they have already been generated.
+
+    --keep-output: boolean that, when `True`, keeps the converted OLD data of
+        each conversion (in the working directory).
+
+Note that peak memory is reported in kilobytes, as Linux reports it.
+
+"""
+
+from lingsync2old import lingsync2old, createdirs
+from synthetic_lingsync_corpus import (get_default_options,
+    write_synthetic_corpus, write_synthetic_media_files)
+import SimpleHTTPServer
+import SocketServer
+import multiprocessing
+import Queue
+import subprocess
+import traceback
+import codecs
+import threading
+import resource
+import platform
+import datetime
+import optparse
+import posixpath
+import urlparse
+import shutil
+import json
+import time
+import sys
+import os
+
+
+# The name of the synthetic LingSync corpora, as passed to `lingsync2old`.
+CORPUS_NAME = 'synthetic'
+
+# The options of the conversion that results are compared by, besides the
+# number of datums.
+CONVERSION_OPTIONS = ('convert_workers', 'compact_records', 'sharded_output')
+
+# How often (in seconds) the conversion process is checked on while its
+# measurements are awaited.
+CONVERSION_POLL_INTERVAL = 1
+
+ANSI_HEADER = '\033[95m'
+ANSI_WARNING = '\033[93m'
+ANSI_FAIL = '\033[91m'
+ANSI_ENDC = '\033[0m'
+
+
+class MediaRequestHandler(SimpleHTTPServer.SimpleHTTPRequestHandler):
+    """Serves the files in `media_dir` (by name) and logs nothing."""
+
+    media_dir = None
+
+    def translate_path(self, path):
+        filename = posixpath.basename(urlparse.urlparse(path).path)
+        return os.path.join(self.media_dir, filename)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_media_files(media_dir, port):
+    """Serve the files in `media_dir` at http://127.0.0.1:`port`/ from a
+    daemon thread and return the server.
+
+    """
+
+    class handler(MediaRequestHandler):
+        pass
+    handler.media_dir = os.path.abspath(media_dir)
+    SocketServer.ThreadingTCPServer.allow_reuse_address = True
+    server = SocketServer.ThreadingTCPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+def get_synthetic_corpus(options, datums):
+    """Return the path of the synthetic corpus of `datums` datums, generating
+    it first, if necessary (or if `options.regenerate` is set), and the number
+    of documents in it.
+
+    """
+
+    corpus_options = get_default_options(datums=datums, seed=options.seed,
+        media_url='http://127.0.0.1:%d/' % options.media_port)
+    path = os.path.join(os.path.abspath(options.workdir),
+        'synthetic-%d-seed%d-port%d.json' % (datums, options.seed,
+        options.media_port))
+    meta_path = path + '.meta'
+    if (options.regenerate or not os.path.isfile(path) or
+            not os.path.isfile(meta_path)):
+        start = time.time()
+        print 'Generating a synthetic LingSync corpus of %d datums...' % (
+            datums,),
+        sys.stdout.flush()
+        documents = write_synthetic_corpus(corpus_options, path)
+        with open(meta_path, 'w') as f:
+            json.dump({'documents': documents}, f)
+        print 'done (%.1fs).' % (time.time() - start,)
+    with open(meta_path) as f:
+        documents = json.load(f)['documents']
+    return path, documents
+
+
+def convert_synthetic_corpus(path, run_dir, options, queue):
+    """Convert the synthetic corpus at `path` in `run_dir` (in the current
+    process, which should be a fresh one) and put the measurements of the
+    conversion in `queue` (or the traceback of its failure).
+
+    """
+
+    try:
+        os.chdir(run_dir)
+        createdirs()
+        sys.stdout = codecs.getwriter('utf8')(open(os.devnull, 'w'))
+        sys.stdin = open(os.devnull)
+        start = time.time()
+        lingsync2old(path, CORPUS_NAME, False, None, options.convert_workers,
+            options.compact_records, False, options.sharded_output)
+        wall = time.time() - start
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        workers_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        queue.put({
+            'wall_seconds': wall,
+            'cpu_seconds': usage.ru_utime + usage.ru_stime,
+            'workers_cpu_seconds': (workers_usage.ru_utime +
+                workers_usage.ru_stime),
+            'peak_rss_kb': usage.ru_maxrss,
+            'workers_peak_rss_kb': workers_usage.ru_maxrss
+        })
+    except BaseException:
+        queue.put({'error': traceback.format_exc()})
+
+
+def get_conversion_measurements(process, queue):
+    """Return the measurements put in `queue` by the conversion `process`
+    (see `convert_synthetic_corpus`). If the process dies without putting
+    any (e.g., it is killed by the out-of-memory killer), return a
+    measurements dict with an error that gives its exit code or signal.
+
+    """
+
+    while True:
+        try:
+            return queue.get(timeout=CONVERSION_POLL_INTERVAL)
+        except Queue.Empty:
+            if process.is_alive():
+                continue
+        # The process may have put its measurements just before exiting.
+        try:
+            return queue.get(timeout=CONVERSION_POLL_INTERVAL)
+        except Queue.Empty:
+            pass
+        process.join()
+        if process.exitcode < 0:
+            return {'error': u'The conversion process was killed by signal'
+                u' %d.\n' % (-process.exitcode,)}
+        return {'error': u'The conversion process exited with code %d'
+            u' without reporting any measurements.\n' % (process.exitcode,)}
+
+
+def benchmark_conversion(options, datums):
+    """Convert the synthetic corpus of `datums` datums `options.repeat` times
+    and return the result of the fastest conversion.
+
+    """
+
+    path, documents = get_synthetic_corpus(options, datums)
+    best = None
+    for _ in xrange(max(1, options.repeat)):
+        run_dir = os.path.join(os.path.abspath(options.workdir),
+            'run-%d' % datums)
+        shutil.rmtree(run_dir, ignore_errors=True)
+        os.makedirs(run_dir)
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=convert_synthetic_corpus,
+            args=(path, run_dir, options, queue))
+        process.start()
+        measurements = get_conversion_measurements(process, queue)
+        process.join()
+        if not options.keep_output:
+            shutil.rmtree(run_dir, ignore_errors=True)
+        if 'error' in measurements:
+            sys.exit(u'%sThe conversion of the synthetic corpus of %d datums'
+                u' failed:\n%s%s' % (ANSI_FAIL, datums,
+                measurements['error'], ANSI_ENDC))
+        if best is None or measurements['wall_seconds'] < best['wall_seconds']:
+            best = measurements
+    result = {
+        'date': datetime.datetime.utcnow().isoformat(),
+        'revision': get_revision(),
+        'python': platform.python_version(),
+        'datums': datums,
+        'documents': documents,
+        'repeat': max(1, options.repeat),
+        'datums_per_second': datums / best['wall_seconds'],
+        'documents_per_second': documents / best['wall_seconds']
+    }
+    for option in CONVERSION_OPTIONS:
+        result[option] = getattr(options, option)
+    result.update(best)
+    return result
+
+
+def get_revision():
+    """Return the git revision of this script's directory, if any."""
+
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short',
+            'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=open(os.devnull, 'w')).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def get_result_key(result):
+    """Return the key by which `result` is compared to baseline results."""
+
+    return (result['datums'],) + tuple(result.get(option) for option in
+        CONVERSION_OPTIONS)
+
+
+def read_baseline(path):
+    """Return a dict mapping the key of each result in the results file at
+    `path` (see `get_result_key`) to the last result with that key.
+
+    """
+
+    baseline = {}
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                result = json.loads(line)
+                baseline[get_result_key(result)] = result
+    return baseline
+
+
+def format_result(result):
+    """Return a line of the table of results."""
+
+    return u'%10d %10d %10.2f %10.2f %12.0f %12.1f' % (result['datums'],
+        result['documents'], result['wall_seconds'],
+        result['cpu_seconds'] + result['workers_cpu_seconds'],
+        result['datums_per_second'],
+        max(result['peak_rss_kb'], result['workers_peak_rss_kb']) / 1024.0)
+
+
+def add_optparser_options(parser):
+    """Add the options of this script to the optparse `parser`."""
+
+    parser.add_option("--sizes", dest="sizes",
+            default="1000,10000,100000,1000000", metavar="SIZES",
+            help="The comma-separated numbers of datums of the synthetic"
+            " corpora to convert. Default is 1000,10000,100000,1000000.")
+
+    parser.add_option("--repeat", dest="repeat", type="int", default=1,
+            metavar="REPEAT",
+            help="The number of times to convert each corpus. Default is 1.")
+
+    parser.add_option("--convert-workers", dest="convert_workers",
+            type="int", default=1, metavar="CONVERT_WORKERS",
+            help="The number of processes over which to spread the"
+            " conversion. Default is 1.")
+
+    parser.add_option("--compact-records", dest="compact_records",
+            action="store_true", default=False, metavar="COMPACTRECORDS",
+            help="Convert with compact records.")
+
+    parser.add_option("--sharded-output", dest="sharded_output",
+            action="store_true", default=False, metavar="SHARDEDOUTPUT",
+            help="Write the converted data as JSON Lines files.")
+
+    parser.add_option("--seed", dest="seed", type="int", default=0,
+            metavar="SEED",
+            help="The seed of the synthetic corpora. Default is 0.")
+
+    parser.add_option("--media-port", dest="media_port", type="int",
+            default=8765, metavar="MEDIA_PORT",
+            help="The port on which the audio files of the synthetic datums"
+            " are served. Default is 8765.")
+
+    parser.add_option("--workdir", dest="workdir",
+            default="_ls2old_benchmark", metavar="WORKDIR",
+            help="The directory where the synthetic corpora, converted data"
+            " and results are kept. Default is _ls2old_benchmark.")
+
+    parser.add_option("--results", dest="results", default=None,
+            metavar="RESULTS",
+            help="The file to which the results are appended. Default is"
+            " benchmark-results.jsonl in the working directory.")
+
+    parser.add_option("--baseline", dest="baseline", default=None,
+            metavar="BASELINE",
+            help="A results file to compare the results to.")
+
+    parser.add_option("--tolerance", dest="tolerance", type="float",
+            default=0.1, metavar="TOLERANCE",
+            help="The proportion by which a conversion may be slower than its"
+            " baseline. Default is 0.1.")
+
+    parser.add_option("--regenerate", dest="regenerate",
+            action="store_true", default=False, metavar="REGENERATE",
+            help="Regenerate the synthetic corpora.")
+
+    parser.add_option("--keep-output", dest="keep_output",
+            action="store_true", default=False, metavar="KEEPOUTPUT",
+            help="Keep the converted OLD data of each conversion.")
+
+
+def main():
+    parser = optparse.OptionParser()
+    add_optparser_options(parser)
+    options, _ = parser.parse_args()
+    try:
+        sizes = [int(size) for size in options.sizes.split(',') if
+            size.strip()]
+    except ValueError:
+        sys.exit('--sizes must be a comma-separated list of integers.')
+    if not os.path.isdir(options.workdir):
+        os.makedirs(options.workdir)
+    results_path = options.results or os.path.join(options.workdir,
+        'benchmark-results.jsonl')
+    baseline = read_baseline(options.baseline) if options.baseline else {}
+
+    media_dir = os.path.join(options.workdir, 'media')
+    write_synthetic_media_files(media_dir)
+    server = serve_media_files(media_dir, options.media_port)
+
+    regressions = []
+    results = []
+    try:
+        for datums in sizes:
+            result = benchmark_conversion(options, datums)
+            results.append(result)
+            with open(results_path, 'a') as f:
+                f.write(json.dumps(result, sort_keys=True) + '\n')
+            previous = baseline.get(get_result_key(result))
+            if previous:
+                ratio = result['wall_seconds'] / previous['wall_seconds']
+                result['baseline_ratio'] = ratio
+                if ratio > 1 + options.tolerance:
+                    regressions.append((result, previous, ratio))
+    finally:
+        server.shutdown()
+
+    print '\n%sConversion benchmark (%s).%s' % (ANSI_HEADER,
+        ', '.join('%s=%s' % (option, getattr(options, option)) for option
+        in CONVERSION_OPTIONS), ANSI_ENDC)
+    print '%10s %10s %10s %10s %12s %12s' % ('Datums', 'Documents',
+        'Wall (s)', 'CPU (s)', 'Datums/s', 'Peak (MB)')
+    for result in results:
+        line = format_result(result)
+        if 'baseline_ratio' in result:
+            line += u'  (%.2fx baseline)' % result['baseline_ratio']
+        print line
+    print 'The results were appended to %s.' % results_path
+
+    if regressions:
+        for result, previous, ratio in regressions:
+            print ('%sRegression: converting %d datums took %.2fs, %.2fx the'
+                ' %.2fs of the baseline (revision %s).%s' % (ANSI_WARNING,
+                result['datums'], result['wall_seconds'], ratio,
+                previous['wall_seconds'], previous.get('revision'),
+                ANSI_ENDC))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -43,6 +43,9 @@ requests.packages.urllib3.disable_warnings()
 
 p = pprint.pprint
 
+# Number of documents requested per `_find` page when no page size is given.
+FIND_PAGE_SIZE = 1000
+
 def verbose():
     """Call this to spit the HTTP requests/responses to stdout.
     From http://stackoverflow.com/questions/10588644/how-can-i-see-the-entire-http-request-thats-being-sent-by-my-python-application
@@ -78,6 +81,20 @@ class FieldDBClient(object):
         self.session.verify = False # https without certificates, wild!
         self.session.headers.update({'Content-Type': 'application/json'})
 
+    def clone(self):
+        """Return a copy of this client that has its own `requests.Session`
+        (with a copy of this client's cookies, so it is logged in too). Use
+        one clone per thread when making requests concurrently.
+
+        """
+
+        clone = copy.copy(self)
+        clone.session = requests.Session()
+        clone.session.verify = self.session.verify
+        clone.session.headers.update(self.session.headers)
+        clone.session.cookies.update(self.session.cookies)
+        return clone
+
     def _process_options(self, options):
 
         self.auth_protocol = options.get('auth_protocol', 'https')
@@ -241,6 +258,45 @@ class FieldDBClient(object):
         url = '%s/_all_dbs' % self.get_couch_url()
         return self.session.get(url).json()
 
+    def get_database_info(self, database_name):
+        """Return the CouchDB info object for `database_name`. Its `update_seq`
+        value can be used as the `since` param of the `_changes` feed.
+
+        """
+
+        url = '%s/%s' % (self.get_couch_url(), database_name)
+        return self.session.get(url).json()
+
+    def get_changes(self, database_name, since=None, limit=None):
+        """Return the `_changes` feed of `database_name` (documents included)
+        for the changes made after update sequence `since`.
+
+        """
+
+        url = '%s/%s/_changes' % (self.get_couch_url(), database_name)
+        params = {'include_docs': 'true'}
+        if since is not None:
+            params['since'] = since
+        if limit:
+            params['limit'] = limit
+        return self.session.get(url, params=params).json()
+
+    def iter_changes(self, database_name, since=None, page_size=None):
+        """Generate the `_changes` feed of `database_name` one response at a
+        time, each holding at most `page_size` results. The `last_seq` of each
+        response is used as the `since` of the next request.
+
+        """
+
+        while True:
+            changes = self.get_changes(database_name, since, page_size)
+            yield changes
+            results = changes.get('results')
+            if changes.get('error') or not results or not page_size or \
+            len(results) < page_size:
+                break
+            since = changes['last_seq']
+
     def get_users(self):
         return self.get_all_docs_list('zfielddbuserscouch')
 
@@ -249,16 +305,24 @@ class FieldDBClient(object):
 
     def get_usernames(self):
         """Use the CouchDB API to get the usernames of the user documents in
-        zfielddbuserscouch.
+        zfielddbuserscouch. Only the `username` field is requested, unless the
+        server does not support `_find`, in which case we fall back to
+        fetching all of the user documents.
 
         """
-        return [u['doc']['username'] for u
-                in self.get_users()['rows']
-                if u['doc'].has_key('username')]
+        docs = self.find_all_documents('zfielddbuserscouch',
+            {'username': {'$exists': True}}, fields=['username'])
+        if docs is None:
+            return [u['doc']['username'] for u
+                    in self.get_users()['rows']
+                    if u['doc'].has_key('username')]
+        return [doc['username'] for doc in docs]
 
     def get__usernames(self):
         """Use the CouchDB API to get the usernames of the user documents in
-        _users.
+        _users. Only the `_id` field is requested, unless the server does not
+        support `_find`, in which case we fall back to fetching all of the
+        user documents.
 
         .. note::
 
@@ -266,9 +330,13 @@ class FieldDBClient(object):
             'org.couchdb.user:username'.
 
         """
-        return [u['doc']['_id'].split(':')[1] for u in
-                self.get__users()['rows']
-                if u['doc'].get('type') == 'user']
+        docs = self.find_all_documents('_users', {'type': 'user'},
+            fields=['_id'])
+        if docs is None:
+            return [u['doc']['_id'].split(':')[1] for u in
+                    self.get__users()['rows']
+                    if u['doc'].get('type') == 'user']
+        return [doc['_id'].split(':')[1] for doc in docs]
 
     def delete_user_and_corpora(self, username):
         """Use the CouchDB API to delete a FieldDB user.
@@ -359,6 +427,127 @@ class FieldDBClient(object):
         url = '%s/%s/_all_docs' % (self.get_couch_url(), database_name)
         return self.session.get(url, params={'include_docs': 'true'}).json()
 
+    def get_all_docs_page(self, database_name, limit=None, startkey=None,
+        skip=0, endkey=None):
+        """Return a page of at most `limit` rows (documents included) from
+        `_all_docs`. In `_all_docs` the key of a row is its document id, so
+        paging is done by passing the id of the last row of the previous page
+        as `startkey` along with `skip=1`. If `endkey` is given, only rows
+        whose ids sort before it are returned.
+
+        """
+
+        url = '%s/%s/_all_docs' % (self.get_couch_url(), database_name)
+        params = {'include_docs': 'true'}
+        if limit:
+            params['limit'] = limit
+        if startkey is not None:
+            params['startkey'] = json.dumps(startkey)
+        if skip:
+            params['skip'] = skip
+        if endkey is not None:
+            params['endkey'] = json.dumps(endkey)
+            params['inclusive_end'] = 'false'
+        return self.session.get(url, params=params).json()
+
+    def iter_all_docs_pages(self, database_name, page_size, startkey=None,
+        endkey=None, skip=0):
+        """Generate the pages of `_all_docs` for `database_name`, each one a
+        dict as returned by CouchDB with at most `page_size` rows. Only one
+        page is held in memory at a time. An error response (e.g.,
+        `{'error': 'unauthorized'}`) is yielded as is and ends the iteration.
+        `startkey` (inclusive) and `endkey` (exclusive) restrict the pages to
+        a range of document ids. Pass `skip=1` to resume after a `startkey`
+        that has already been fetched. If `page_size` is falsy, the whole
+        range is returned as a single page.
+
+        """
+
+        while True:
+            page = self.get_all_docs_page(database_name, page_size,
+                startkey=startkey, skip=skip, endkey=endkey)
+            yield page
+            rows = page.get('rows')
+            if page.get('error') or not rows or not page_size or \
+            len(rows) < page_size:
+                break
+            startkey = rows[-1]['id']
+            skip = 1
+
+    def find_documents(self, database_name, selector, fields=None,
+        limit=None, sort=None):
+        """Return the documents in `database_name` that match the Mango
+        `selector`, using the `_find` API (CouchDB 2.0+). If `fields` is
+        given, only those fields of each document are returned. The response
+        is a dict with a `docs` list or, if the request failed (e.g., because
+        the server predates `_find`), an `error` value.
+
+        """
+
+        url = '%s/%s/_find' % (self.get_couch_url(), database_name)
+        query = {'selector': selector}
+        if fields:
+            query['fields'] = fields
+        if limit:
+            query['limit'] = limit
+        if sort:
+            query['sort'] = sort
+        return self.session.post(url, data=json.dumps(query)).json()
+
+    def iter_find_pages(self, database_name, selector, page_size,
+        startkey=None, endkey=None, skip=0, fields=None):
+        """Generate the pages of `_find` results for `selector`, each one a
+        dict with at most `page_size` documents, in document id order. Paging
+        is done on `_id`, so `startkey`, `endkey` and `skip` mean what they
+        mean for `iter_all_docs_pages`. An error response is yielded as is
+        and ends the iteration. If `page_size` is falsy, pages of
+        `FIND_PAGE_SIZE` documents are requested, since `_find` has no way of
+        returning all of the matching documents at once (without a limit, it
+        returns only 25).
+
+        """
+
+        if fields and '_id' not in fields:
+            fields = fields + ['_id']
+        page_size = page_size or FIND_PAGE_SIZE
+        while True:
+            id_range = {}
+            if startkey is not None:
+                if skip:
+                    id_range['$gt'] = startkey
+                else:
+                    id_range['$gte'] = startkey
+            if endkey is not None:
+                id_range['$lt'] = endkey
+            if id_range:
+                page_selector = {'$and': [selector, {'_id': id_range}]}
+            else:
+                page_selector = selector
+            page = self.find_documents(database_name, page_selector,
+                fields=fields, limit=page_size, sort=[{'_id': 'asc'}])
+            yield page
+            docs = page.get('docs')
+            if page.get('error') or not docs or len(docs) < page_size:
+                break
+            startkey = docs[-1]['_id']
+            skip = 1
+
+    def find_all_documents(self, database_name, selector, fields=None,
+        page_size=FIND_PAGE_SIZE):
+        """Return a list of all of the documents in `database_name` that match
+        `selector` (only `fields` of them, if given), or `None` if the server
+        does not support `_find` or refuses the request.
+
+        """
+
+        docs = []
+        for page in self.iter_find_pages(database_name, selector, page_size,
+                fields=fields):
+            if page.get('error'):
+                return None
+            docs.extend(page.get('docs', []))
+        return docs
+
     def update_document(self, database_name, document_id, document_rev,
         new_document):
         url = '%s/%s/%s' % (self.get_couch_url(), database_name, document_id)
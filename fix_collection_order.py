@@ -37,6 +37,10 @@ Full param/option listing:
         lingsync2old.py and which contains the OLD-compatible dicts that were
         created from the raw LingSync input.
 
+    Either file may also be one that lingsync2old.py compressed (i.e., a
+    .json.gz or .json.bz2 file). The OLD data may also be the directory of
+    JSON Lines files that lingsync2old.py writes with `--sharded-output`.
+
     --old-url: The URL of the OLD whose collections we need to fix.
 
     --old-username: The username of a user on the destination OLD who
@@ -47,8 +51,9 @@ Full param/option listing:
 """
 
 from old_client import OLDClient
+from lingsync2old import (get_lingsync_index, read_lingsync_docs,
+    iter_lingsync_docs, load_old_data)
 import requests
-import json
 import optparse
 import getpass
 import unicodedata
@@ -96,6 +101,10 @@ def add_optparser_options(parser):
         lingsync2old.py and which contains the OLD-compatible dicts that were
         created from the raw LingSync input.
 
+    Either file may also be one that lingsync2old.py compressed (i.e., a
+    .json.gz or .json.bz2 file). The OLD data may also be the directory of
+    JSON Lines files that lingsync2old.py writes with `--sharded-output`.
+
     --old-url: The OLD URL that we will upload the converted LingSync
         data to.
 
@@ -150,15 +159,43 @@ def get_collection_for_lingsync_doc(doc):
     return collection
 
 
+def get_datum_dates_entered(ls_json_file, ls_index, datum_ids):
+    """Return a dict mapping the ids in `datum_ids` to the `dateEntered`
+    values of the LingSync datums with those ids in the LingSync JSON file
+    `ls_json_file`. Only those datums are read from the file, at the offsets
+    recorded in its index `ls_index`. A compressed file has no index (i.e.,
+    `ls_index` is `None`) and is read through instead, one document at a
+    time.
+
+    """
+
+    datum_ids = set(datum_ids)
+    datumid2dateentered = {}
+    if ls_index is None:
+        for doc in iter_lingsync_docs(ls_json_file):
+            if (doc.get('_id') in datum_ids and
+                    get_collection_for_lingsync_doc(doc) == 'datums'):
+                datumid2dateentered[doc['_id']] = doc['dateEntered']
+        return datumid2dateentered
+    spans = [(offset, length) for offset, length, _id, _rev, collection
+        in ls_index['entries'] if collection == 'datums' and _id in datum_ids]
+    for datum in read_lingsync_docs(ls_json_file, spans):
+        datumid2dateentered[datum['_id']] = datum['dateEntered']
+    return datumid2dateentered
+
+
 def fix_collections(options):
     """Make HTTP requests to fix the order of forms in the OLD's collections.
 
     """
 
-    # Get raw LingSync JSON data.
+    # Index the raw LingSync JSON data, so that we can later read just the
+    # datums that we need from it.
     ls_json_file = getattr(options, 'ls_json_file')
     try:
-        ls_data = json.load(open(ls_json_file))
+        if not os.path.isfile(ls_json_file):
+            raise IOError(ls_json_file)
+        ls_index = get_lingsync_index(ls_json_file)
     except:
         sys.exit(u'%sUnable to locate file %s. Aborting.%s' % (ANSI_FAIL,
             ls_json_file, ANSI_ENDC))
@@ -166,18 +203,12 @@ def fix_collections(options):
     # Get converted OLD data.
     old_json_file = getattr(options, 'old_json_file')
     try:
-        old_data = json.load(open(old_json_file))
+        old_data = load_old_data(old_json_file)
     except:
         sys.exit(u'%sUnable to locate file %s. Aborting.%s' % (ANSI_FAIL,
             old_json_file, ANSI_ENDC))
     forms = old_data['forms']
 
-    # `datums` holds the raw LingSync dicts representing all of the datums.
-    datumid2dateentered = {}
-    for datum in (r['doc'] for r in ls_data['rows']
-        if get_collection_for_lingsync_doc(r['doc']) == 'datums'):
-        datumid2dateentered[datum['_id']] = datum['dateEntered']
-
 
     # Get an OLD client.
     old_url = getattr(options, 'old_url', None)
@@ -194,7 +225,7 @@ def fix_collections(options):
 
     # Populate the `formid2dateentered` dict, so that it maps OLD form ids to
     # date entered values taken from the raw LingSync data.
-    formid2dateentered = {}
+    formid2datumid = {}
     patt3 = re.compile('This form was created from LingSync datum (\w+)')
     for form in c.get('forms'):
         form_id = form['id']
@@ -208,6 +239,11 @@ def fix_collections(options):
                 print ('%sWarning: found multiple LingSync datum ids for OLD'
                     ' form %d.%s' % (ANSI_WARNING, form_id, ANSI_ENDC))
             datum_id = datum_id[0]
+        formid2datumid[form_id] = datum_id
+    datumid2dateentered = get_datum_dates_entered(ls_json_file, ls_index,
+        filter(None, formid2datumid.values()))
+    formid2dateentered = {}
+    for form_id, datum_id in formid2datumid.iteritems():
         if datum_id:
             date_entered = datumid2dateentered[datum_id]
         else:
@@ -47,7 +47,8 @@ Full param/option listing:
 
     --force-download: boolean that, when `True`, forces the downloading of the
         LingSync/CouchDB data, even if we have already downloaded it. Default
-        is `False`.
+        is `False`. Without it, an interrupted download is resumed from the
+        last page that was written to disk.
 
     --force-convert: boolean that, when `True`, forces the converting of the
         LingSync JSON data to OLD JSON data, even if we have already converted
@@ -59,6 +60,84 @@ Full param/option listing:
 
     --verbose: boolean that makes this script say more about what it's doing.
 
+    --page-size: the number of LingSync documents to request from CouchDB per
+        page when downloading. Each page is written to disk as it arrives.
+        Set to 0 to request all documents at once (except with
+        `--filter-docs`, where they are still requested in pages of 1000).
+        Default is 1000.
+
+    --download-workers: the number of ranges of LingSync document ids to
+        download concurrently, each over its own CouchDB session. Default
+        is 1.
+
+    --filter-docs: boolean that, when `True`, makes the download request only
+        the LingSync documents that are migrated (sessions, datums, users and
+        datalists) using the CouchDB `_find` API, instead of every document.
+        Requires CouchDB 2.0 or later; otherwise all documents are
+        downloaded. A delta download of documents downloaded this way keeps
+        only the changed documents that are migrated. Default is `False`.
+
+    --compress: the format ('gzip' or 'bz2') in which to compress the
+        downloaded LingSync JSON and the converted OLD JSON files. Files
+        that were saved in any format are read, whatever this is set to.
+        Default is to not compress them.
+
+    --convert-workers: the number of processes over which to spread the
+        conversion of the LingSync documents. The converted data are
+        the same whatever this is set to. Default is 1.
+
+    --compact-records: boolean that, when `True`, makes the conversion hold
+        the OLD forms, tags, speakers and users in compact records (instead of
+        dicts), with each distinct tag, speaker and user held only once, and
+        intern the repeated strings of the LingSync documents as they are
+        loaded. This uses less memory on large corpora, but takes longer. The
+        converted data are the same either way. Default is `False`.
+
+    --incremental-convert: boolean that, when `True`, keeps the conversion
+        of each LingSync document in a cache in the OLD JSON directory, keyed
+        on the document's id and revision, and converts only the documents
+        that are not in it. The LingSync data are then also converted again
+        whenever they have changed (e.g., after `--delta-download`) since they
+        were converted. The converted data are the same either way. Default is
+        `False`.
+
+    --sharded-output: boolean that, when `True`, makes the conversion write
+        the OLD data as a directory of JSON Lines files, one per OLD resource
+        type (forms, collections, etc.) with one resource per line, instead of
+        as a single JSON file. The upload then reads the resources one at a
+        time. Default is `False`.
+
+    --max-warning-examples: the maximum number of conversion warnings of
+        each kind (e.g., values that are too long) about specific LingSync
+        documents to keep and list in the conversion warnings report; the
+        others are only counted. Default is to keep them all.
+
+    --profile: boolean that, when `True`, makes the conversion record the
+        wall-clock and CPU time of each of its stages (reading and converting
+        the LingSync documents, consolidating the resources, downloading the
+        media files, writing the OLD data, etc.) and of the conversion of each
+        type of LingSync document, and the slowest documents. The results are
+        written to a `-profile.txt` file next to the `-summary.txt` file of
+        the OLD data. Default is `False`.
+
+    --profile-pstats: boolean that, when `True`, implies `--profile` and also
+        runs the conversion under cProfile, whose statistics are dumped to a
+        `-profile.pstats` file (for the `pstats` module) and summarized in
+        the profile report. Only the main process is profiled. Default is
+        `False`.
+
+    --file-download-workers: the number of threads that download the
+        LingSync audio/video/image files concurrently. Each file is streamed
+        to a temporary file that is renamed once it is complete. Default is 4.
+
+    --file-download-host-workers: the maximum number of files that are
+        downloaded from any one host at a time. Default is 4.
+
+    --delta-download: boolean that, when `True`, updates an already downloaded
+        copy of the LingSync data by fetching only the documents that have
+        changed (or been deleted) since it was downloaded, using the CouchDB
+        `_changes` feed. Default is `False`.
+
     --ls-url: The LingSync CouchDB URL that we can make requests to for
         extracting the LingSync data. Defaults to 'https://corpus.lingsync.org'.
 
@@ -125,8 +204,6 @@ TODOs
 
 - large file (> 20MB) upload to OLD still not implemented.
 
-- downloading LingSync image files still not implemented.
-
 - make this script sensitive to OLD versions, and maybe to LingSync ones too.
 
 """
@@ -150,6 +227,20 @@ import base64
 import mimetypes
 import codecs
 import random
+from collections import OrderedDict, namedtuple
+import time
+import gzip
+import bz2
+import threading
+import multiprocessing
+import mmap
+import shelve
+import heapq
+import cProfile
+import pstats
+import StringIO
+import tempfile
+from multiprocessing.pool import ThreadPool
 
 p = pprint.pprint
 
@@ -168,6 +259,113 @@ BIG_FILE_SIZE = 20000000
 # data".
 BIG_DATA = 200000000
 
+# The number of threads that download the LingSync media files, the number of
+# them that may download from any one host at a time, and the number of bytes
+# read from a download at a time (see `download_lingsync_media_files`).
+FILE_DOWNLOAD_WORKERS = 4
+FILE_DOWNLOAD_HOST_WORKERS = 4
+FILE_DOWNLOAD_CHUNK_SIZE = 65536
+
+# Minimum number of seconds between two updates of the media file download
+# progress line.
+FILE_DOWNLOAD_PROGRESS_INTERVAL = 0.5
+
+# Holds the `requests` session of each media file download thread.
+FILE_DOWNLOAD_SESSIONS = threading.local()
+
+# Number of documents requested per `_all_docs` page when downloading a
+# LingSync corpus.
+DOWNLOAD_PAGE_SIZE = 1000
+
+# File name extensions of the compressed formats that the downloaded LingSync
+# JSON and the converted OLD JSON can be stored in (see `--compress`).
+COMPRESSED_EXTENSIONS = {
+    'gzip': '.gz',
+    'bz2': '.bz2'
+}
+
+# The LingSync collections whose documents `lingsync2old` converts to OLD
+# resources, in the order in which they are converted.
+MIGRATED_COLLECTIONS = ('sessions', 'datums', 'users', 'datalists')
+
+# The fields whose values identify the OLD resources of each type while the
+# LingSync data are being converted. `update_state` uses them to index the
+# resources it accumulates.
+OLD_RESOURCE_INDEX_FIELDS = {
+    'forms': ('__lingsync_datum_id',),
+    'collections': ('__lingsync_session_id',),
+    'corpora': ('__lingsync_datalist_id',),
+    'tags': ('name',),
+    'speakers': ('first_name', 'last_name'),
+    'users': ('username',),
+    'files': ('__lingsync_datum_id', '__lingsync_file_url')
+}
+
+# Number of LingSync documents that a worker process converts per task when
+# the conversion is spread over several processes (see `--convert-workers`).
+CONVERT_CHUNK_SIZE = 250
+
+# Version of the conversion of LingSync documents to OLD resources. The
+# conversions kept in a conversion cache (see `--incremental-convert`) are keyed
+# on it, so it must be incremented whenever the conversion changes.
+CONVERTER_VERSION = 3
+
+# With `--profile`, the number of slowest LingSync documents whose conversion
+# times are listed in the profile report, and, with `--profile-pstats`, the
+# number of functions listed, by cumulative time (see `ConversionProfile`).
+PROFILE_SLOWEST_DOCS = 20
+PROFILE_PSTATS_LINES = 30
+
+# The name of the stage of the conversion in which the LingSync documents are
+# read and converted, of which the reading is also timed on its own.
+PROFILE_CONVERT_STAGE = 'read and convert LingSync documents'
+
+# Number of bytes read at a time from a LingSync JSON file when its documents
+# are streamed from disk (see `iter_lingsync_docs`).
+JSON_STREAM_CHUNK_SIZE = 65536
+
+# With `--compact-records`, the keys of the LingSync documents, and their
+# string values of up to `STRING_INTERN_MAX_LENGTH` characters, are interned
+# as the documents are loaded, so that the labels, usernames, tag names,
+# session ids, etc. that they repeat are each held in memory once. The table
+# of interned strings is emptied whenever it reaches
+# `STRING_INTERN_TABLE_SIZE` strings.
+STRING_INTERN_MAX_LENGTH = 64
+STRING_INTERN_TABLE_SIZE = 100000
+
+# Extension of the sidecar index of a downloaded LingSync JSON file (see
+# `build_lingsync_index`).
+LINGSYNC_INDEX_EXTENSION = '.idx'
+
+# Matches the (possibly empty) run of JSON whitespace at a position.
+JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+# The layouts of the fields of LingSync datums and sessions, compiled against
+# the specs of their fields (see `compile_lingsync_field_layout`), and the
+# unrecognized attributes of LingSync documents, both keyed by document shape
+# (see `get_lingsync_field_values` and `add_unrecognized_attribute_warnings`).
+# Each cache is emptied whenever it reaches `DOC_SHAPE_CACHE_SIZE` shapes.
+FIELD_LAYOUT_CACHE = {}
+DOC_ATTRS_CACHE = {}
+DOC_SHAPE_CACHE_SIZE = 1000
+
+# The values that LingSync datums derive from the sessions embedded in them,
+# keyed by session `(_id, _rev)`. See `get_lingsync_session_values`. The cache
+# is emptied whenever it reaches `SESSION_VALUES_CACHE_SIZE` sessions.
+SESSION_VALUES_CACHE = {}
+SESSION_VALUES_CACHE_SIZE = 10000
+
+# `_find` selector for the LingSync documents that we migrate. It matches
+# every document to which `get_collection_for_lingsync_doc` assigns one of
+# the collections that `lingsync2old` converts (and possibly a few more,
+# which are discarded there as usual).
+LINGSYNC_MIGRATED_DOCS_SELECTOR = {
+    '$or': [
+        {'collection': {'$in': list(MIGRATED_COLLECTIONS)}},
+        {'fieldDBtype': {'$in': ['Session', 'Datum']}}
+    ]
+}
+
 # ANSI escape sequences for formatting command-line output.
 ANSI_HEADER = '\033[95m'
 ANSI_OKBLUE = '\033[94m'
@@ -194,6 +392,11 @@ OVERFLOWS = set()
 # them so that they can be fixed later ...
 TAGSTOFIX = {}
 
+# This accumulates the revisions of the LingSync sessions that are embedded in
+# datums, keyed by session id, so that we can warn about the datums of a
+# session that embed different revisions of it.
+SESSION_REVS = {}
+
 def flush(string):
     """Print `string` immediately, and with no carriage return.
 
@@ -203,15 +406,379 @@ def flush(string):
     sys.stdout.flush()
 
 
-def download_lingsync_json(config_dict, database_name):
+def download_lingsync_json(config_dict, database_name,
+        page_size=DOWNLOAD_PAGE_SIZE, workers=1, resume=True,
+        filter_docs=False, compress=None):
     """Download the LingSync data in `database_name` using the CouchDB API.
     Save the returned JSON to a local file.
 
+    If `page_size` is a positive integer, the documents are requested from
+    `_all_docs` in pages of that many documents and each page is written to
+    disk as soon as it arrives, so that memory use is bounded by the page size
+    and not by the size of the corpus. A `page_size` of 0 requests all of the
+    documents at once.
+
+    If `workers` is greater than 1, the space of document ids is split into
+    that many ranges, which are downloaded concurrently (each by its own
+    CouchDB session) and then concatenated, in id order, into a single file.
+
+    If `resume` is `True` and an earlier download of `database_name` was
+    interrupted, it is continued from where it stopped (with the ranges it
+    was started with); otherwise any partial download is discarded.
+
+    If `filter_docs` is `True`, CouchDB's `_find` API is used to download only
+    the documents that we migrate (see `LINGSYNC_MIGRATED_DOCS_SELECTOR`),
+    instead of every document in the database. If the server does not support
+    `_find`, all of the documents are downloaded.
+
+    If `compress` is one of the keys of `COMPRESSED_EXTENSIONS`, the JSON file
+    is compressed in that format.
+
     """
 
-    c = FieldDBClient(config_dict)
+    c = get_couchdb_client(config_dict)
+    if c is None:
+        return None
+
+    # Each range of document ids is written to its own part file, one page at
+    # a time. The part files are then concatenated into a temporary file which
+    # is renamed only once it is complete, so that an interrupted download is
+    # never mistaken for a complete one. After every page, a manifest records
+    # how far each range has got, so that an interrupted download can be
+    # resumed from the last page that was safely written.
+    fname = get_lingsync_json_filename(database_name, compress)
+    tmp_fname = '%s.part' % get_lingsync_json_filename(database_name)
+    manifest = None
+    if resume:
+        manifest = read_download_manifest(database_name)
+    if manifest is None:
+        discard_partial_download(database_name)
+        selector = None
+        if filter_docs:
+            selector = get_lingsync_download_selector(c, database_name)
+        # Remember where the database's update sequence was before we started
+        # downloading, so that a later delta download can ask the `_changes`
+        # feed for everything that happened since.
+        manifest = {
+            'update_seq': c.get_database_info(database_name).get('update_seq'),
+            'total_rows': None,
+            'selector': selector,
+            'ranges': []
+        }
+        for index, (startkey, endkey) in enumerate(get_doc_id_ranges(workers)):
+            manifest['ranges'].append({
+                'startkey': startkey,
+                'endkey': endkey,
+                'fname': '%s-%03d' % (tmp_fname, index),
+                'last_key': None,
+                'offset': 0,
+                'doc_count': 0,
+                'done': False
+            })
+        write_download_manifest(database_name, manifest)
+    else:
+        print '\nResuming the partial download of %s' % database_name
+
+    # Get the JSON from CouchDB
+    flush('Downloading all documents from %s' % database_name)
+    progress = {
+        'lock': threading.Lock(),
+        'start': time.time(),
+        'doc_count': sum(r['doc_count'] for r in manifest['ranges']),
+        'manifest': manifest
+    }
+    tasks = []
+    for range_ in manifest['ranges']:
+        if range_['done']:
+            continue
+        tasks.append({
+            'client': c.clone(),
+            'database_name': database_name,
+            'page_size': page_size,
+            'range': range_,
+            'progress': progress
+        })
+    if len(tasks) > 1:
+        pool = ThreadPool(len(tasks))
+        try:
+            results = pool.map(download_doc_id_range, tasks)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = map(download_doc_id_range, tasks)
+
+    errors = filter(None, results)
+    if [e for e in errors if e.get('error') == 'unauthorized']:
+        print (u'\n%sUser %s is not authorized to access the LingSync'
+            u' corpus %s.%s' % (ANSI_FAIL, config_dict['admin_username'],
+            database_name, ANSI_ENDC))
+        discard_partial_download(database_name)
+        return None
+    if errors:
+        # Keep the part files and the manifest, so that the download can be
+        # resumed from the last page that was written.
+        print (u'\n%sThe download of the LingSync corpus %s failed (%s); run'
+            u' this script again to resume it.%s' % (ANSI_FAIL,
+            database_name, u'; '.join(set(get_couchdb_error_message(e) for e
+            in errors)), ANSI_ENDC))
+        return None
+
+    # `_find` responses do not say how many documents there are in total.
+    total_rows = manifest['total_rows']
+    if total_rows is None:
+        total_rows = sum(r['doc_count'] for r in manifest['ranges'])
+    merge_lingsync_json_parts([r['fname'] for r in manifest['ranges']],
+        tmp_fname, total_rows, compress)
+    os.rename(tmp_fname, fname)
+    # The update sequence is the one from before the first page of the
+    # (possibly resumed) download was requested.
+    if manifest['update_seq'] is not None:
+        write_lingsync_checkpoint(database_name, manifest['update_seq'],
+            manifest['selector'])
+    # The part files are only removed now, so that an interrupted merge can
+    # be redone when the download is resumed.
+    discard_partial_download(database_name)
+    print '\nDownloaded all documents from %s' % database_name
+    print 'Wrote all documents JSON file to %s' % fname
+
+    return fname
+
+
+def get_lingsync_download_selector(c, database_name):
+    """Return the `_find` selector that matches the LingSync documents that we
+    migrate, or `None` if the CouchDB server of client `c` does not support
+    `_find`, in which case all documents should be downloaded.
+
+    """
+
+    resp = c.find_documents(database_name, LINGSYNC_MIGRATED_DOCS_SELECTOR,
+        fields=['_id'], limit=1)
+    if resp.get('error') and resp.get('error') != 'unauthorized':
+        print (u'\n%sWarning: unable to filter the LingSync documents on the'
+            u' server (%s); downloading all of them.%s' % (ANSI_WARNING,
+            resp.get('reason', resp['error']), ANSI_ENDC))
+        return None
+    return LINGSYNC_MIGRATED_DOCS_SELECTOR
+
+
+def get_doc_id_ranges(count):
+    """Split the space of CouchDB document ids into `count` contiguous ranges
+    and return them as a list of `(startkey, endkey)` tuples. `startkey` is
+    inclusive, `endkey` is exclusive and `None` means unbounded. The split
+    points assume the hexadecimal ids that CouchDB generates, but every id,
+    whatever its form, falls into exactly one range.
+
+    """
+
+    count = max(1, count or 1)
+    split_points = ['%04x' % (i * 0x10000 // count) for i in range(1, count)]
+    return zip([None] + split_points, split_points + [None])
+
+
+def download_doc_id_range(task):
+    """Download the LingSync documents whose ids are in the range described
+    by `task` (a dict built in `download_lingsync_json`) and write their
+    `_all_docs` rows, comma-separated and one page at a time, to the range's
+    part file. If the download has a `_find` selector, only the documents
+    that match it are downloaded, and they are written as `_all_docs` rows
+    too. If the range was partially downloaded before, the part file is
+    truncated to the last recorded page and the download resumes after the
+    last recorded key. Return `None` if the whole range was downloaded, else
+    the error response of the page that failed (e.g., `{'error':
+    'unauthorized'}`), in which case the range is left unfinished in the
+    manifest.
+
+    """
+
+    c = task['client']
+    range_ = task['range']
+    progress = task['progress']
+    if range_['offset'] and os.path.isfile(range_['fname']):
+        outfile = open(range_['fname'], 'r+')
+        outfile.truncate(range_['offset'])
+        outfile.seek(range_['offset'])
+    else:
+        outfile = open(range_['fname'], 'w')
+        with progress['lock']:
+            progress['doc_count'] -= range_['doc_count']
+        range_.update({'last_key': None, 'offset': 0, 'doc_count': 0})
+    if range_['last_key'] is None:
+        startkey, skip = range_['startkey'], 0
+    else:
+        startkey, skip = range_['last_key'], 1
+    selector = progress['manifest']['selector']
+    if selector is None:
+        pages = c.iter_all_docs_pages(task['database_name'],
+            task['page_size'], startkey=startkey, endkey=range_['endkey'],
+            skip=skip)
+    else:
+        pages = c.iter_find_pages(task['database_name'], selector,
+            task['page_size'], startkey=startkey, endkey=range_['endkey'],
+            skip=skip)
+    with outfile:
+        first = range_['offset'] == 0
+        for page in iter_couchdb_pages(pages):
+            error = get_couchdb_page_error(page)
+            if error is not None:
+                return error
+            rows = page.get('rows')
+            if rows is None:
+                rows = [get_all_docs_row(doc) for doc in page.get('docs', [])]
+            for row in rows:
+                if not first:
+                    outfile.write(', ')
+                json.dump(row, outfile)
+                first = False
+            outfile.flush()
+            os.fsync(outfile.fileno())
+            with progress['lock']:
+                manifest = progress['manifest']
+                if manifest['total_rows'] is None:
+                    manifest['total_rows'] = page.get('total_rows')
+                if rows:
+                    range_['last_key'] = rows[-1]['id']
+                range_['offset'] = outfile.tell()
+                range_['doc_count'] += len(rows)
+                write_download_manifest(task['database_name'], manifest)
+                progress['doc_count'] += len(rows)
+                print_download_progress(progress['doc_count'],
+                    manifest['total_rows'], progress['start'])
+    with progress['lock']:
+        range_['done'] = True
+        write_download_manifest(task['database_name'], progress['manifest'])
+    return None
+
+
+def iter_couchdb_pages(pages):
+    """Generate the CouchDB pages of the iterator `pages`. A request that
+    fails outright (e.g., on a connection error, or with a response that is
+    not JSON) is turned into an error page, which ends the iteration.
+
+    """
+
+    try:
+        for page in pages:
+            yield page
+    except (requests.exceptions.RequestException, ValueError) as e:
+        yield {'error': 'request_failed', 'reason': unicode(e)}
+
+
+def get_couchdb_page_error(page, key=None):
+    """Return the error response in the CouchDB page `page`, or `None` if
+    `page` is a page of results. Any response with an `error` value is an
+    error (not just `unauthorized`, but also, e.g., `timeout`, `not_found`
+    and server errors), as is one that is not a dict or that has no `key`
+    list (or, by default, neither a `rows` nor a `docs` list), so that a
+    failed request is never mistaken for the last, empty page.
+
+    """
+
+    if type(page) is not type({}):
+        return {'error': 'bad_response', 'reason': repr(page)[:200]}
+    if page.get('error'):
+        return page
+    if key is None:
+        results = page.get('rows', page.get('docs'))
+    else:
+        results = page.get(key)
+    if type(results) is not type([]):
+        return {'error': 'bad_response',
+            'reason': u'the response has no %s' % (key or 'rows')}
+    return None
 
-    # Login to the LingSync CouchDB.
+
+def get_couchdb_error_message(error):
+    """Return a short message describing the CouchDB error response `error`.
+
+    """
+
+    if error.get('reason'):
+        return u'%s: %s' % (error['error'], error['reason'])
+    return unicode(error['error'])
+
+
+def get_download_manifest_filename(database_name):
+    """Get the relative path to the manifest that records the progress of an
+    unfinished download of the LingSync corpus `database_name`.
+
+    """
+
+    return '%s.part-manifest' % get_lingsync_json_filename(database_name)
+
+
+def read_download_manifest(database_name):
+    """Return the manifest of the unfinished download of `database_name`, or
+    `None` if there is no such download.
+
+    """
+
+    path = get_download_manifest_filename(database_name)
+    if not os.path.isfile(path):
+        return None
+    try:
+        return json.load(open(path))
+    except ValueError:
+        return None
+
+
+def write_download_manifest(database_name, manifest):
+    """Write the download manifest of `database_name` to disk. It is written
+    to a temporary file which is then renamed, so that an interruption never
+    leaves a half-written manifest behind.
+
+    """
+
+    path = get_download_manifest_filename(database_name)
+    tmp_path = '%s.tmp' % path
+    with open(tmp_path, 'w') as outfile:
+        json.dump(manifest, outfile)
+    os.rename(tmp_path, path)
+
+
+def discard_partial_download(database_name):
+    """Remove the part files and manifest of an unfinished download of
+    `database_name`, if there are any.
+
+    """
+
+    manifest = read_download_manifest(database_name)
+    if manifest is not None:
+        for range_ in manifest['ranges']:
+            if os.path.isfile(range_['fname']):
+                os.remove(range_['fname'])
+    path = get_download_manifest_filename(database_name)
+    if os.path.isfile(path):
+        os.remove(path)
+
+
+def merge_lingsync_json_parts(part_fnames, fname, total_rows, compress=None):
+    """Concatenate the `_all_docs` rows in the part files `part_fnames`, in
+    order, into a single `_all_docs`-style JSON object in `fname` (compressed
+    in the `compress` format, if given). The part files are left in place.
+
+    """
+
+    with open_data_file(fname, 'w', compress) as outfile:
+        outfile.write('{"rows": [')
+        first = True
+        for part_fname in part_fnames:
+            if os.path.getsize(part_fname):
+                if not first:
+                    outfile.write(', ')
+                with open(part_fname) as infile:
+                    shutil.copyfileobj(infile, outfile)
+                first = False
+        outfile.write('], "total_rows": %d, "offset": 0}' % (total_rows,))
+
+
+def get_couchdb_client(config_dict):
+    """Return a `FieldDBClient` that is logged in to the LingSync CouchDB, or
+    `None` if we cannot log in.
+
+    """
+
+    c = FieldDBClient(config_dict)
     couchdb_login_resp = c.login_couchdb()
     try:
         assert couchdb_login_resp['ok'] is True
@@ -219,33 +786,582 @@ def download_lingsync_json(config_dict, database_name):
     except:
         print 'Unable to log in to CouchDB.'
         return None
+    return c
 
-    # Get the JSON from CouchDB
-    flush('Downloading all documents from %s' % database_name)
-    all_docs = c.get_all_docs_list(database_name)
-    if type(all_docs) is type({}) and all_docs.get('error') == 'unauthorized':
-        print (u'%sUser %s is not authorized to access the LingSync corpus'
-            u' %s.%s' % (ANSI_FAIL, config_dict['admin_username'],
-            database_name, ANSI_ENDC))
+
+def download_lingsync_changes(config_dict, database_name,
+        page_size=DOWNLOAD_PAGE_SIZE, filter_docs=False):
+    """Bring a previously downloaded copy of the LingSync data in
+    `database_name` up to date by requesting only the documents that have
+    changed since the update sequence stored in its checkpoint file. New and
+    modified documents replace their local counterparts (keeping their
+    position in the dump; new documents are added at the end) and deleted
+    documents are removed. The existing dump is streamed, one row at a time,
+    into the updated one, so it is never loaded in its entirety.
+
+    If the dump was downloaded with a `_find` selector (see `--filter-docs`),
+    or if `filter_docs` is `True`, only the changed documents that match the
+    selector are kept, and the ones that no longer match it are removed, so
+    that the dump holds what a full download with that selector would.
+
+    """
+
+    fname = find_data_file(get_lingsync_json_filename(database_name))
+    checkpoint = read_lingsync_checkpoint_data(database_name)
+    since = checkpoint.get('update_seq')
+    if since is None or fname is None:
         return None
-    print 'Downloaded all documents from %s' % database_name
+    selector = checkpoint.get('selector')
+    if selector is None and filter_docs:
+        selector = LINGSYNC_MIGRATED_DOCS_SELECTOR
 
-    # Write the LingSync/CouchDB JSON to a local file
-    fname = get_lingsync_json_filename(database_name)
-    with open(fname, 'w') as outfile:
-        json.dump(all_docs, outfile)
-    print 'Wrote all documents JSON file to %s' % fname
+    c = get_couchdb_client(config_dict)
+    if c is None:
+        return None
 
+    flush('Downloading the changes to %s since update sequence %s' % (
+        database_name, since))
+    changed = {}
+    deleted = set()
+    last_seq = since
+    for changes in iter_couchdb_pages(c.iter_changes(database_name, since,
+            page_size)):
+        error = get_couchdb_page_error(changes, 'results')
+        if error is not None and error.get('error') == 'unauthorized':
+            print (u'%sUser %s is not authorized to access the LingSync'
+                u' corpus %s.%s' % (ANSI_FAIL, config_dict['admin_username'],
+                database_name, ANSI_ENDC))
+            return None
+        if error is not None:
+            # Nothing has been written yet, so the delta download can simply
+            # be run again.
+            print (u'\n%sThe download of the changes to the LingSync corpus'
+                u' %s failed (%s); run this script again to retry it.%s' % (
+                ANSI_FAIL, database_name, get_couchdb_error_message(error),
+                ANSI_ENDC))
+            return None
+        for change in changes['results']:
+            doc_id = change['id']
+            if change.get('deleted') or (selector is not None and
+                    not lingsync_doc_matches_selector(change.get('doc', {}),
+                    selector)):
+                deleted.add(doc_id)
+                changed.pop(doc_id, None)
+            else:
+                deleted.discard(doc_id)
+                changed[doc_id] = change['doc']
+        last_seq = changes.get('last_seq', last_seq)
+    print '\nDownloaded %d changed and %d deleted documents.' % (
+        len(changed), len(deleted))
+
+    if changed or deleted:
+        tmp_fname = '%s.part' % fname
+        row_count = 0
+        with open_data_file(tmp_fname, 'w',
+                get_data_file_compression(fname)) as outfile:
+            outfile.write('{"rows": [')
+            for _, _, row in iter_lingsync_rows(fname):
+                doc_id = row['id']
+                if doc_id in deleted:
+                    continue
+                doc = changed.pop(doc_id, None)
+                if doc is not None:
+                    row = get_all_docs_row(doc)
+                if row_count:
+                    outfile.write(', ')
+                json.dump(row, outfile)
+                row_count += 1
+            for doc_id in sorted(changed):
+                if row_count:
+                    outfile.write(', ')
+                json.dump(get_all_docs_row(changed[doc_id]), outfile)
+                row_count += 1
+            outfile.write('], "total_rows": %d, "offset": 0}' % (row_count,))
+        os.rename(tmp_fname, fname)
+        print 'Merged the changes into %s' % fname
+
+    write_lingsync_checkpoint(database_name, last_seq, selector)
     return fname
 
 
-def get_lingsync_json_filename(database_name):
+def lingsync_doc_matches_selector(doc, selector):
+    """Return `True` if the LingSync document `doc` matches the Mango
+    `selector`, as CouchDB's `_find` would. Only the operators that our
+    selectors use (`$and`, `$or`, `$in`, `$exists` and equality) are
+    supported.
+
+    """
+
+    for field, condition in selector.iteritems():
+        if field == '$and':
+            if not all(lingsync_doc_matches_selector(doc, s) for s in
+                    condition):
+                return False
+        elif field == '$or':
+            if not any(lingsync_doc_matches_selector(doc, s) for s in
+                    condition):
+                return False
+        elif type(condition) is type({}):
+            for operator, operand in condition.iteritems():
+                if operator == '$in':
+                    if field not in doc or doc[field] not in operand:
+                        return False
+                elif operator == '$exists':
+                    if (field in doc) != operand:
+                        return False
+                elif operator == '$eq':
+                    if field not in doc or doc[field] != operand:
+                        return False
+                else:
+                    raise ValueError(u'Unsupported selector operator %s' % (
+                        operator,))
+        elif field not in doc or doc[field] != condition:
+            return False
+    return True
+
+
+def get_all_docs_row(doc):
+    """Return `doc` wrapped in a row like the ones that `_all_docs` returns.
+
+    """
+
+    return {
+        'id': doc['_id'],
+        'key': doc['_id'],
+        'value': {'rev': doc.get('_rev')},
+        'doc': doc
+    }
+
+
+def get_lingsync_checkpoint_filename(database_name):
+    """Get the relative path to the file where we store the CouchDB update
+    sequence that the downloaded LingSync JSON of `database_name` is current
+    with.
+
+    """
+
+    return os.path.join(LINGSYNC_DIR, '%s-checkpoint.json' % database_name)
+
+
+def read_lingsync_checkpoint(database_name):
+    """Return the stored update sequence for `database_name`, or `None`.
+
+    """
+
+    return read_lingsync_checkpoint_data(database_name).get('update_seq')
+
+
+def read_lingsync_checkpoint_data(database_name):
+    """Return the checkpoint of `database_name` (a dict with its
+    `update_seq` and the `selector` that its documents were downloaded with),
+    or an empty dict if there is none.
+
+    """
+
+    path = get_lingsync_checkpoint_filename(database_name)
+    if not os.path.isfile(path):
+        return {}
+    try:
+        return json.load(open(path))
+    except ValueError:
+        return {}
+
+
+def write_lingsync_checkpoint(database_name, update_seq, selector=None):
+    """Store `update_seq` as the update sequence that the downloaded LingSync
+    JSON of `database_name` is current with, along with the `_find`
+    `selector` that the documents were downloaded with, if any.
+
+    """
+
+    path = get_lingsync_checkpoint_filename(database_name)
+    with open(path, 'w') as outfile:
+        json.dump({'update_seq': update_seq, 'selector': selector}, outfile)
+
+
+def print_download_progress(doc_count, total_rows, start):
+    """Overwrite the current line of the terminal with the number of documents
+    downloaded so far and the download rate in documents per second.
+
+    """
+
+    elapsed = time.time() - start
+    if elapsed > 0:
+        rate = doc_count / elapsed
+    else:
+        rate = 0.0
+    if total_rows is None:
+        sys.stdout.write('\rDownloaded %d documents (%.1f docs/sec)' % (
+            doc_count, rate))
+    else:
+        sys.stdout.write('\rDownloaded %d/%d documents (%.1f docs/sec)' % (
+            doc_count, total_rows, rate))
+    sys.stdout.flush()
+
+
+def get_lingsync_json_filename(database_name, compress=None):
     """Get the relative path to the file where the downloaded LingSync JSON are
-    saved for the LingSync corpus `database_name`.
+    saved for the LingSync corpus `database_name`, compressed in the
+    `compress` format, if given.
+
+    """
+
+    return os.path.join(LINGSYNC_DIR, '%s.json%s' % (database_name,
+        COMPRESSED_EXTENSIONS.get(compress, '')))
+
+
+def get_data_file_compression(path):
+    """Return the compression format (a key of `COMPRESSED_EXTENSIONS`) that
+    the file at `path` is stored in, judging by its extension, or `None` if
+    it is not compressed.
+
+    """
+
+    for compress, extension in COMPRESSED_EXTENSIONS.items():
+        if path.endswith(extension):
+            return compress
+    return None
+
+
+def find_data_file(path):
+    """Return the path to the existing file that holds the data meant for
+    `path`, whether it is stored uncompressed or in any of the compressed
+    formats, preferring `path` itself. Return `None` if there is no such
+    file.
+
+    """
+
+    compress = get_data_file_compression(path)
+    if compress:
+        base_path = path[:-len(COMPRESSED_EXTENSIONS[compress])]
+    else:
+        base_path = path
+    candidates = [path, base_path] + [base_path + extension for extension in
+        sorted(COMPRESSED_EXTENSIONS.values())]
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def open_data_file(path, mode='r', compress=None):
+    """Open the (possibly compressed) JSON data file at `path`. Compressed
+    files are (de)compressed as a stream, as they are read or written. If
+    `compress` is not given, the format is determined from the extension of
+    `path`.
+
+    """
+
+    if compress is None:
+        compress = get_data_file_compression(path)
+    if compress == 'gzip':
+        return gzip.open(path, mode + 'b', 6)
+    elif compress == 'bz2':
+        return bz2.BZ2File(path, mode + 'b')
+    return open(path, mode)
+
+
+class JSONStreamReader(object):
+    """Decodes the JSON text in the file-like `infile` one value at a time,
+    holding only a small window of the text in memory. `expect` consumes the
+    structural characters (braces, brackets, colons and commas), `decode`
+    decodes the complete value (e.g., an object) that comes next and `tell`
+    returns the byte offset in the text of the next unconsumed character.
+    Objects are decoded with the `object_pairs_hook`, if given.
+
+    """
+
+    def __init__(self, infile, chunk_size=JSON_STREAM_CHUNK_SIZE,
+            object_pairs_hook=None):
+        self.infile = infile
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder(object_pairs_hook=object_pairs_hook)
+        self.buffer = ''
+        self.pos = 0
+        self.offset = 0 # offset in the text of the start of the buffer
+        self.eof = False
+
+    def fill(self, size):
+        """Drop the consumed part of the buffer and append (at least) `size`
+        more bytes to it. Return `False` if the file is exhausted.
+
+        """
+
+        if self.pos:
+            self.buffer = self.buffer[self.pos:]
+            self.offset += self.pos
+            self.pos = 0
+        data = self.infile.read(max(size, self.chunk_size))
+        if not data:
+            self.eof = True
+            return False
+        self.buffer += data
+        return True
+
+    def tell(self):
+        """Return the byte offset in the text of the next character.
+
+        """
+
+        return self.offset + self.pos
+
+    def peek(self):
+        """Skip whitespace and return the next character, without consuming
+        it, or the empty string at the end of the file.
+
+        """
+
+        while True:
+            self.pos = JSON_WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill(self.chunk_size):
+                return ''
+
+    def expect(self, chars):
+        """Consume and return the next character, which must be one of those
+        in `chars`.
+
+        """
+
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(u'Expected one of %s but found %s' % (
+                u', '.join(repr(c) for c in chars), repr(char)))
+        self.pos += 1
+        return char
+
+    def decode(self):
+        """Decode and return the next JSON value. If it does not fit in the
+        buffer, the buffer is grown (geometrically, so that a large value is
+        not re-scanned too often) until it does.
+
+        """
+
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except ValueError:
+                if self.eof or not self.fill(size):
+                    raise
+                size *= 2
+                continue
+            # A number at the end of the buffer may continue past it.
+            if end == len(self.buffer) and not self.eof and self.fill(size):
+                continue
+            self.pos = end
+            return value
+
+
+def iter_lingsync_rows(fname, meta=None, object_pairs_hook=None):
+    """Generate the rows of the `_all_docs`-style LingSync JSON file `fname`
+    (which may be compressed), one at a time, as they are read from disk; the
+    file is never loaded in its entirety. Each row is generated as an
+    `(offset, length, row)` tuple, where `offset` and `length` give the
+    location of the row's JSON text in the (uncompressed) file. If `meta` is
+    given, the other top-level values in the file (e.g., `total_rows`, or an
+    `error` returned by CouchDB) are stored in it, as is the number of rows
+    (under 'rows') if there is a `rows` array. The rows are decoded with the
+    `object_pairs_hook`, if given.
+
+    """
+
+    if meta is None:
+        meta = {}
+    with open_data_file(fname) as infile:
+        reader = JSONStreamReader(infile, object_pairs_hook=object_pairs_hook)
+        reader.expect('{')
+        if reader.peek() == '}':
+            return
+        while True:
+            key = reader.decode()
+            reader.expect(':')
+            if key == u'rows' and reader.peek() == '[':
+                reader.expect('[')
+                meta['rows'] = 0
+                if reader.peek() == ']':
+                    reader.expect(']')
+                else:
+                    while True:
+                        reader.peek()
+                        offset = reader.tell()
+                        row = reader.decode()
+                        meta['rows'] += 1
+                        yield offset, reader.tell() - offset, row
+                        if reader.expect(',]') == ']':
+                            break
+            else:
+                meta[key] = reader.decode()
+            if reader.expect(',}') == '}':
+                break
+
+
+def iter_lingsync_docs(fname, meta=None, intern_strings=False):
+    """Generate the LingSync documents (i.e., `rows[i]['doc']`) in the
+    `_all_docs`-style JSON file `fname`, one at a time, as they are read from
+    disk. See `iter_lingsync_rows`. The sessions embedded in their datums are
+    shared as they are loaded (see `share_lingsync_session`) and, if
+    `intern_strings` is `True`, so are their repeated strings (see
+    `make_interning_hook`), which makes the loading slower.
 
     """
 
-    return os.path.join(LINGSYNC_DIR, '%s.json' % database_name)
+    sessions = {}
+    object_pairs_hook = None
+    if intern_strings:
+        object_pairs_hook = make_interning_hook({})
+    for offset, length, row in iter_lingsync_rows(fname, meta,
+            object_pairs_hook):
+        doc = row.get('doc', {})
+        share_lingsync_session(doc, sessions)
+        yield doc
+
+
+def make_interning_hook(strings):
+    """Return an `object_pairs_hook` for `json.JSONDecoder` that makes dicts
+    whose keys, and whose string values of up to `STRING_INTERN_MAX_LENGTH`
+    characters, are interned in the dict `strings`, i.e., that uses a single
+    object for all of the equal strings.
+
+    """
+
+    def interning_hook(pairs):
+        if len(strings) >= STRING_INTERN_TABLE_SIZE:
+            strings.clear()
+        intern_string = strings.setdefault
+        return dict([(intern_string(key, key),
+            intern_string(value, value) if value.__class__ is unicode and
+            len(value) <= STRING_INTERN_MAX_LENGTH else value)
+            for key, value in pairs])
+    return interning_hook
+
+
+def share_lingsync_session(doc, sessions):
+    """Replace the session embedded in the LingSync datum `doc` (if any) with
+    the equal one in `sessions`, which maps the `(_id, _rev)` of each session
+    to the first copy of it that was embedded in a datum, so that all of the
+    datums of a session share a single instance of it. The embedded revision
+    is recorded in `SESSION_REVS`. A datum that embeds a different revision
+    keeps its own copy (and is warned about by `lingsync2old`).
+
+    """
+
+    session = doc.get('session')
+    if not isinstance(session, dict) or not session.get('_id'):
+        return
+    key = (session['_id'], session.get('_rev'))
+    try:
+        shared = sessions.setdefault(key, session)
+        SESSION_REVS.setdefault(key[0], set()).add(key[1])
+    except TypeError:
+        return
+    if shared is not session and shared == session:
+        doc['session'] = shared
+
+
+def get_lingsync_index_filename(fname):
+    """Return the path to the sidecar index of the LingSync JSON file `fname`.
+
+    """
+
+    return '%s%s' % (fname, LINGSYNC_INDEX_EXTENSION)
+
+
+def get_lingsync_index(fname):
+    """Return the index of the uncompressed LingSync JSON file `fname`,
+    reading it from its sidecar file if that is up to date, or else building
+    it (and saving it, for next time) with a single pass over `fname`. Return
+    `None` if `fname` is compressed, since its documents cannot then be read
+    from their offsets. See `build_lingsync_index`.
+
+    """
+
+    if get_data_file_compression(fname):
+        return None
+    index = read_lingsync_index(fname)
+    if index is None:
+        index = build_lingsync_index(fname)
+    return index
+
+
+def build_lingsync_index(fname):
+    """Index the LingSync JSON file `fname` and save the index to its sidecar
+    file. The index is a dict whose `entries` list holds an `(offset, length,
+    _id, _rev, collection)` tuple for each row of `fname`, in order, where
+    `offset` and `length` locate the row's JSON text in `fname`, and whose
+    `meta` dict holds the other top-level values of `fname` (see
+    `iter_lingsync_rows`). The sidecar file records the size and modification
+    time of `fname`, so that a stale index is never used.
+
+    """
+
+    flush('Indexing LingSync JSON file %s...' % fname)
+    stat = os.stat(fname)
+    index = {'size': stat.st_size, 'mtime': stat.st_mtime, 'meta': {},
+        'entries': []}
+    for offset, length, row in iter_lingsync_rows(fname, index['meta']):
+        doc = row.get('doc', {})
+        index['entries'].append((offset, length, doc.get('_id'),
+            doc.get('_rev'), get_collection_for_lingsync_doc(doc)))
+    # One JSON array per line, after a header line, keeps the index compact
+    # and lets it be read back one entry at a time.
+    path = get_lingsync_index_filename(fname)
+    tmp_path = '%s.tmp' % path
+    with open(tmp_path, 'w') as outfile:
+        outfile.write('%s\n' % json.dumps(dict((key, index[key]) for key in
+            ('size', 'mtime', 'meta'))))
+        for entry in index['entries']:
+            outfile.write('%s\n' % json.dumps(entry, separators=(',', ':')))
+    os.rename(tmp_path, path)
+    print 'Done.'
+    return index
+
+
+def read_lingsync_index(fname):
+    """Return the index of the LingSync JSON file `fname` from its sidecar
+    file, or `None` if there is no such file or if `fname` has been modified
+    since it was indexed. See `build_lingsync_index`.
+
+    """
+
+    path = get_lingsync_index_filename(fname)
+    if not os.path.isfile(path):
+        return None
+    stat = os.stat(fname)
+    with open(path) as infile:
+        index = json.loads(infile.readline())
+        if (index.get('size'), index.get('mtime')) != (stat.st_size,
+                stat.st_mtime):
+            return None
+        index['entries'] = [tuple(json.loads(line)) for line in infile]
+    return index
+
+
+def read_lingsync_docs(fname, spans):
+    """Return the LingSync documents in the rows of the uncompressed LingSync
+    JSON file `fname` located by the `(offset, length)` tuples in `spans`
+    (see `build_lingsync_index`). The file is memory-mapped, so only the
+    requested rows are read and decoded. As with `iter_lingsync_docs`, the
+    sessions embedded in their datums are shared.
+
+    """
+
+    decoder = json.JSONDecoder()
+    sessions = {}
+    docs = []
+    with open(fname, 'rb') as infile:
+        dump = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            for offset, length in spans:
+                doc = decoder.decode(dump[offset:offset + length]).get(
+                    'doc', {})
+                share_lingsync_session(doc, sessions)
+                docs.append(doc)
+        finally:
+            dump.close()
+    return docs
 
 
 def add_optparser_options(parser):
@@ -274,7 +1390,8 @@ def add_optparser_options(parser):
 
     --force-download: boolean that, when `True`, forces the downloading of the
         LingSync/CouchDB data, even if we have already downloaded it. Default
-        is `False`.
+        is `False`. Without it, an interrupted download is resumed from the
+        last page that was written to disk.
 
     --force-convert: boolean that, when `True`, forces the converting of the
         LingSync JSON data to OLD JSON data, even if we have already converted
@@ -286,6 +1403,84 @@ def add_optparser_options(parser):
 
     --verbose: boolean that makes this script say more about what it's doing.
 
+    --page-size: the number of LingSync documents to request from CouchDB per
+        page when downloading. Each page is written to disk as it arrives.
+        Set to 0 to request all documents at once (except with
+        `--filter-docs`, where they are still requested in pages of 1000).
+        Default is 1000.
+
+    --download-workers: the number of ranges of LingSync document ids to
+        download concurrently, each over its own CouchDB session. Default
+        is 1.
+
+    --filter-docs: boolean that, when `True`, makes the download request only
+        the LingSync documents that are migrated (sessions, datums, users and
+        datalists) using the CouchDB `_find` API, instead of every document.
+        Requires CouchDB 2.0 or later; otherwise all documents are
+        downloaded. A delta download of documents downloaded this way keeps
+        only the changed documents that are migrated. Default is `False`.
+
+    --compress: the format ('gzip' or 'bz2') in which to compress the
+        downloaded LingSync JSON and the converted OLD JSON files. Files
+        that were saved in any format are read, whatever this is set to.
+        Default is to not compress them.
+
+    --convert-workers: the number of processes over which to spread the
+        conversion of the LingSync documents. The converted data are
+        the same whatever this is set to. Default is 1.
+
+    --compact-records: boolean that, when `True`, makes the conversion hold
+        the OLD forms, tags, speakers and users in compact records (instead of
+        dicts), with each distinct tag, speaker and user held only once, and
+        intern the repeated strings of the LingSync documents as they are
+        loaded. This uses less memory on large corpora, but takes longer. The
+        converted data are the same either way. Default is `False`.
+
+    --incremental-convert: boolean that, when `True`, keeps the conversion
+        of each LingSync document in a cache in the OLD JSON directory, keyed
+        on the document's id and revision, and converts only the documents
+        that are not in it. The LingSync data are then also converted again
+        whenever they have changed (e.g., after `--delta-download`) since they
+        were converted. The converted data are the same either way. Default is
+        `False`.
+
+    --sharded-output: boolean that, when `True`, makes the conversion write
+        the OLD data as a directory of JSON Lines files, one per OLD resource
+        type (forms, collections, etc.) with one resource per line, instead of
+        as a single JSON file. The upload then reads the resources one at a
+        time. Default is `False`.
+
+    --max-warning-examples: the maximum number of conversion warnings of
+        each kind (e.g., values that are too long) about specific LingSync
+        documents to keep and list in the conversion warnings report; the
+        others are only counted. Default is to keep them all.
+
+    --profile: boolean that, when `True`, makes the conversion record the
+        wall-clock and CPU time of each of its stages (reading and converting
+        the LingSync documents, consolidating the resources, downloading the
+        media files, writing the OLD data, etc.) and of the conversion of each
+        type of LingSync document, and the slowest documents. The results are
+        written to a `-profile.txt` file next to the `-summary.txt` file of
+        the OLD data. Default is `False`.
+
+    --profile-pstats: boolean that, when `True`, implies `--profile` and also
+        runs the conversion under cProfile, whose statistics are dumped to a
+        `-profile.pstats` file (for the `pstats` module) and summarized in
+        the profile report. Only the main process is profiled. Default is
+        `False`.
+
+    --file-download-workers: the number of threads that download the
+        LingSync audio/video/image files concurrently. Each file is streamed
+        to a temporary file that is renamed once it is complete. Default is 4.
+
+    --file-download-host-workers: the maximum number of files that are
+        downloaded from any one host at a time. Default is 4.
+
+    --delta-download: boolean that, when `True`, updates an already downloaded
+        copy of the LingSync data by fetching only the documents that have
+        changed (or been deleted) since it was downloaded, using the CouchDB
+        `_changes` feed. Default is `False`.
+
     """
 
     parser.add_option("--ls-url", dest="ls_url",
@@ -337,6 +1532,84 @@ def add_optparser_options(parser):
             action="store_true", default=False, metavar="VERBOSE",
             help="Make this script say more about what it's doing.")
 
+    parser.add_option("--page-size", dest="page_size", type="int",
+            default=DOWNLOAD_PAGE_SIZE, metavar="PAGE_SIZE",
+            help="The number of LingSync documents to request per page when"
+            " downloading. Set to 0 to request all documents at once. Default"
+            " is %d." % DOWNLOAD_PAGE_SIZE)
+
+    parser.add_option("--download-workers", dest="download_workers",
+            type="int", default=1, metavar="DOWNLOAD_WORKERS",
+            help="The number of ranges of LingSync document ids to download"
+            " concurrently. Default is 1.")
+
+    parser.add_option("--filter-docs", dest="filter_docs",
+            action="store_true", default=False, metavar="FILTERDOCS",
+            help="Use this option if you want to download only the LingSync"
+            " documents that are migrated, using the CouchDB _find API.")
+
+    parser.add_option("--compress", dest="compress", type="choice",
+            choices=sorted(COMPRESSED_EXTENSIONS), default=None,
+            metavar="COMPRESS",
+            help="Compress the downloaded LingSync JSON and the converted OLD"
+            " JSON files, using 'gzip' or 'bz2'.")
+
+    parser.add_option("--convert-workers", dest="convert_workers",
+            type="int", default=1, metavar="CONVERT_WORKERS",
+            help="The number of processes over which to spread the conversion"
+            " of the LingSync data. Default is 1.")
+
+    parser.add_option("--compact-records", dest="compact_records",
+            action="store_true", default=False, metavar="COMPACTRECORDS",
+            help="Use this option if you want the conversion to hold the OLD"
+            " data in compact records, to save memory on large corpora.")
+
+    parser.add_option("--incremental-convert", dest="incremental_convert",
+            action="store_true", default=False, metavar="INCREMENTALCONVERT",
+            help="Use this option if you want to cache the conversion of each"
+            " LingSync document and convert only the new or changed ones.")
+
+    parser.add_option("--sharded-output", dest="sharded_output",
+            action="store_true", default=False, metavar="SHARDEDOUTPUT",
+            help="Use this option if you want the converted OLD data to be"
+            " written as one JSON Lines file per OLD resource type.")
+
+    parser.add_option("--max-warning-examples", dest="max_warning_examples",
+            type="int", default=None, metavar="MAX_WARNING_EXAMPLES",
+            help="The maximum number of conversion warnings of each kind"
+            " about specific LingSync documents to keep and report. Default"
+            " is to keep them all.")
+
+    parser.add_option("--profile", dest="profile",
+            action="store_true", default=False, metavar="PROFILE",
+            help="Use this option if you want the conversion to record and"
+            " report the time taken by each of its stages and types of"
+            " LingSync document.")
+
+    parser.add_option("--profile-pstats", dest="profile_pstats",
+            action="store_true", default=False, metavar="PROFILEPSTATS",
+            help="Use this option if you want the conversion to also be run"
+            " under cProfile, with its statistics dumped to a pstats file.")
+
+    parser.add_option("--file-download-workers",
+            dest="file_download_workers", type="int",
+            default=FILE_DOWNLOAD_WORKERS, metavar="FILE_DOWNLOAD_WORKERS",
+            help="The number of LingSync audio/video/image files to download"
+            " concurrently. Default is %d." % FILE_DOWNLOAD_WORKERS)
+
+    parser.add_option("--file-download-host-workers",
+            dest="file_download_host_workers", type="int",
+            default=FILE_DOWNLOAD_HOST_WORKERS,
+            metavar="FILE_DOWNLOAD_HOST_WORKERS",
+            help="The maximum number of files to download from any one host"
+            " at a time. Default is %d." % FILE_DOWNLOAD_HOST_WORKERS)
+
+    parser.add_option("-u", "--delta-download", dest="delta_download",
+            action="store_true", default=False, metavar="DELTADOWNLOAD",
+            help="Use this option if you want to update the already downloaded"
+            " LingSync data with only the documents that have changed since"
+            " they were downloaded.")
+
 
 ################################################################################
 # OLD resource schemata
@@ -463,56 +1736,665 @@ old_schemata = {
 
 }
 
+# The keys of each of the `old_schemata` whose values are lists, which must
+# not be shared by the resources created from it. See `new_old_resource`.
+old_schemata_list_keys = dict((schema_name, tuple(key for key, value in
+    schema.iteritems() if isinstance(value, list))) for schema_name, schema in
+    old_schemata.iteritems())
 
-def get_collection_for_lingsync_doc(doc):
-    """A LingSync document is identified by its `collection` attribute, which is
-    valuated by a string like 'sessions', or 'datums'. Sometimes, however,
-    there is no `collection` attribute and the `fieldDBtype` attribute is
-    used and evaluates to a capitalized, singular analog, e.g., 'Session' or
-    'Datum'. This function returns a collection value for a LingSync document.
+
+def new_old_resource(schema_name):
+    """Return a new OLD resource-as-dict built from `old_schemata[schema_name]`.
+    This is equivalent to, but much cheaper than, a deep copy of the schema:
+    the schema is copied shallowly, since its values are immutable, except
+    for its lists (which hold only immutable values), which are copied
+    individually.
 
     """
 
-    type2collection = {
-        'Session': 'sessions',
-        'Corpus': 'private_corpuses', # or 'corpuses'?
-        'Datum': 'datums'
-    }
-    collection = doc.get('collection')
-    if not collection:
-        fieldDBtype = doc.get('fieldDBtype')
-        if fieldDBtype:
-            collection = type2collection.get(fieldDBtype)
-    return collection
+    resource = old_schemata[schema_name].copy()
+    for key in old_schemata_list_keys[schema_name]:
+        resource[key] = list(resource[key])
+    return resource
 
 
-def lingsync2old(fname, lingsync_db_name, force_file_download):
-    """Convert the LingSync database (named `lingsync_db_name`, whose data are
-    stored in the JSON file `fname`) to an OLD-compatible JSON file. This is
-    the primary "convert" function that represents Step 2.
+################################################################################
+# Compact OLD resource records
+################################################################################
+
+# With `--compact-records`, the OLD forms, tags, speakers and users that the
+# conversion accumulates are held in the `__slots__` records below, instead of
+# in dicts, and each distinct tag, speaker and user is a single record that
+# is shared by every resource it is embedded in (see `compact_old_object`).
+# The records serialize to the same JSON as the dicts would have.
+
+class OLDRecord(object):
+    """Base class of the compact records of OLD resources. A record supports
+    the parts of the dict interface that the conversion uses. Its `fields`
+    (the keys of an OLD resource of its type) are stored in slots; any other
+    keys are kept in its `extra` dict. Records are equal to records, or dicts,
+    with the same items.
 
     """
 
-    # Maps names of OLD resources (pluralized) to lists of dicts, where each
-    # such dict is a valid payload for an OLD POST request.
-    old_data = {}
+    __slots__ = ('extra',)
+    fields = ()
+    slot_names = {}
 
-    # Holds warning messages accrued via the transformation of LingSync data
-    # structures to OLD ones.
-    warnings = {}
+    def __init__(self, resource=None):
+        self.extra = None
+        if resource:
+            for key, value in resource.iteritems():
+                self[key] = value
 
-    # This holds all of the `language` values from the LingSync sessions that
+    def __getitem__(self, key):
+        slot_name = self.slot_names.get(key)
+        if slot_name is not None:
+            try:
+                return getattr(self, slot_name)
+            except AttributeError:
+                raise KeyError(key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        slot_name = self.slot_names.get(key)
+        if slot_name is not None:
+            setattr(self, slot_name, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def iteritems(self):
+        for key in self.fields:
+            try:
+                yield key, getattr(self, self.slot_names[key])
+            except AttributeError:
+                pass
+        if self.extra:
+            for item in self.extra.iteritems():
+                yield item
+
+    def items(self):
+        return list(self.iteritems())
+
+    def keys(self):
+        return [key for key, value in self.iteritems()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def to_dict(self):
+        return dict(self.iteritems())
+
+    def __eq__(self, other):
+        if isinstance(other, OLDRecord):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self.__init__(state)
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self.to_dict())
+
+
+def make_old_record_class(class_name, schema_name, private_keys=()):
+    """Return a subclass of `OLDRecord` whose fields are the keys of
+    `old_schemata[schema_name]` and the `private_keys` (e.g.,
+    '__lingsync_datum_id'). Private keys are stored in slots whose names are
+    prefixed with 'private', since Python would mangle them otherwise.
+
+    """
+
+    fields = tuple(old_schemata[schema_name]) + tuple(private_keys)
+    slot_names = dict((key, 'private%s' % key if key.startswith('__') else key)
+        for key in fields)
+    return type(class_name, (OLDRecord,), {
+        '__slots__': tuple(slot_names[key] for key in fields),
+        'fields': fields,
+        'slot_names': slot_names})
+
+
+OLDForm = make_old_record_class('OLDForm', 'form', ('date_entered',
+    '__lingsync_datum_id', '__lingsync_session_id', '__lingsync_deleted'))
+OLDTag = make_old_record_class('OLDTag', 'tag')
+OLDSpeaker = make_old_record_class('OLDSpeaker', 'speaker')
+OLDUser = make_old_record_class('OLDUser', 'user')
+
+# Maps the names of OLD resources (as in `old_data`) to their record classes.
+OLD_RECORD_CLASSES = {
+    'forms': OLDForm,
+    'tags': OLDTag,
+    'speakers': OLDSpeaker,
+    'users': OLDUser
+}
+
+# Maps the keys of OLD resources whose values are embedded tags, speakers or
+# users (or lists thereof) to the names of the resources embedded there.
+OLD_EMBEDDED_RESOURCES = {
+    'tags': 'tags',
+    'speaker': 'speakers',
+    'elicitor': 'users',
+    'verifier': 'users'
+}
+
+
+def compact_old_object(old_object, interned):
+    """Replace the OLD forms, tags, speakers and users in `old_object` (see
+    `update_state`) with compact records, in place. Tags, speakers and users
+    are interned in the dict `interned`, so that equal ones are a single
+    record, shared by all of the resources (over all `old_object`s) that they
+    are embedded in.
+
+    """
+
+    old_object['old_value'] = compact_old_resource(
+        old_object['old_resource'], old_object['old_value'], interned)
+    for resource_name, resources in (
+            old_object['old_auxiliary_resources'].iteritems()):
+        resources[:] = [compact_old_resource(resource_name, resource, interned)
+            for resource in resources]
+
+
+def compact_old_resource(resource_name, resource, interned):
+    """Return the OLD `resource` (of the type `resource_name`) as a compact
+    record, if it is a form, tag, speaker or user. The tags, speakers and
+    users embedded in it are replaced by interned records, in any case.
+
+    """
+
+    if not isinstance(resource, dict):
+        return resource
+    for key, embedded_name in OLD_EMBEDDED_RESOURCES.iteritems():
+        value = resource.get(key)
+        if isinstance(value, list):
+            resource[key] = [intern_old_record(embedded_name, embedded,
+                interned) for embedded in value]
+        elif isinstance(value, dict):
+            resource[key] = intern_old_record(embedded_name, value, interned)
+    if resource_name == 'forms':
+        return OLDForm(resource)
+    if resource_name in OLD_RECORD_CLASSES:
+        return intern_old_record(resource_name, resource, interned)
+    return resource
+
+
+def intern_old_record(resource_name, resource, interned):
+    """Return the record in `interned` that is equal to the OLD `resource` (a
+    tag, speaker or user dict or record), adding a record of `resource` to
+    `interned` if there is none. A resource with an unhashable value is
+    returned as a record, uninterned.
+
+    """
+
+    if isinstance(resource, dict):
+        resource = OLD_RECORD_CLASSES[resource_name](resource)
+    if not isinstance(resource, OLDRecord):
+        return resource
+    try:
+        return interned.setdefault(
+            (resource_name, tuple(sorted(resource.iteritems()))), resource)
+    except TypeError:
+        return resource
+
+
+def old_record_to_json(obj):
+    """Serialize OLD records as dicts; passed as the `default` of `json.dump`.
+
+    """
+
+    if isinstance(obj, OLDRecord):
+        return obj.to_dict()
+    raise TypeError('%r is not JSON serializable' % (obj,))
+
+
+def get_collection_for_lingsync_doc(doc):
+    """A LingSync document is identified by its `collection` attribute, which is
+    valuated by a string like 'sessions', or 'datums'. Sometimes, however,
+    there is no `collection` attribute and the `fieldDBtype` attribute is
+    used and evaluates to a capitalized, singular analog, e.g., 'Session' or
+    'Datum'. This function returns a collection value for a LingSync document.
+
+    """
+
+    type2collection = {
+        'Session': 'sessions',
+        'Corpus': 'private_corpuses', # or 'corpuses'?
+        'Datum': 'datums'
+    }
+    collection = doc.get('collection')
+    if not collection:
+        fieldDBtype = doc.get('fieldDBtype')
+        if fieldDBtype:
+            collection = type2collection.get(fieldDBtype)
+    return collection
+
+
+def classify_lingsync_docs(docs, collection_counts):
+    """Classify the LingSync documents generated by `docs` in a single pass,
+    generating a `(collection, doc)` tuple for each document in one of the
+    collections in `MIGRATED_COLLECTIONS` (in document order) and counting
+    every document in `collection_counts`, which maps each collection
+    (u'NOT DATA' for documents without one) to its number of documents.
+
+    """
+
+    for doc in docs:
+        collection = get_collection_for_lingsync_doc(doc)
+        if collection in MIGRATED_COLLECTIONS:
+            yield collection, doc
+        if collection is None:
+            collection = u'NOT DATA'
+        collection_counts[collection] = collection_counts.get(collection, 0) + 1
+
+
+def classify_lingsync_index(index, collection_counts):
+    """Like `classify_lingsync_docs`, but classify the LingSync documents by
+    the entries of the `index` of their JSON file (see
+    `build_lingsync_index`) and generate, in place of each document, the
+    `(offset, length)` span of its row in that file.
+
+    """
+
+    for offset, length, _id, _rev, collection in index['entries']:
+        if collection in MIGRATED_COLLECTIONS:
+            yield collection, (offset, length)
+        if collection is None:
+            collection = u'NOT DATA'
+        collection_counts[collection] = collection_counts.get(collection, 0) + 1
+
+
+def get_conversion_cache_filename(database_name):
+    """Return the relative path of the cache of the conversions of the
+    documents of the LingSync database `database_name`.
+
+    """
+
+    return os.path.join(OLD_DIR, '%s-conversion-cache' % database_name)
+
+
+def open_conversion_cache(database_name, reset=False):
+    """Open (creating it, if need be) the cache of the conversions of the
+    documents of the LingSync database `database_name`, emptying it first if
+    `reset` is `True`. The cache is a shelf that maps the keys returned by
+    `get_conversion_cache_key` to the `(old_object, tagstofix, overflows)`
+    conversions of the documents (see `convert_lingsync_doc_with_state`).
+
+    """
+
+    if not os.path.isdir(OLD_DIR):
+        os.makedirs(OLD_DIR)
+    return shelve.open(get_conversion_cache_filename(database_name),
+        flag='n' if reset else 'c', protocol=2)
+
+
+def get_conversion_cache_key(collection, doc, lingsync_db_name):
+    """Return the key of the conversion of the LingSync `doc` from
+    `collection` in a conversion cache, or `None` if `doc` lacks an id or a
+    revision. Besides the id and revision of `doc`, the key holds those of the
+    session embedded in it, if any (since a datum is converted using its
+    embedded session), the corpus name and `CONVERTER_VERSION`.
+
+    """
+
+    if not (doc.get('_id') and doc.get('_rev')):
+        return None
+    session = doc.get('session')
+    if isinstance(session, dict):
+        session = [session.get('_id'), session.get('_rev')]
+    else:
+        session = None
+    return json.dumps([CONVERTER_VERSION, lingsync_db_name, collection,
+        doc['_id'], doc['_rev'], session])
+
+
+def iter_conversion_items(classified_docs, lingsync_db_name, cache=None,
+        cache_keys=None):
+    """Generate a `(collection, key, doc, cached)` tuple for each
+    `(collection, doc)` tuple generated by `classified_docs`. If `cache` is
+    given, `key` is the key of the conversion of `doc` in it and `cached` is
+    the conversion found there, if any, in which case `doc` is `None`, since
+    it needn't be converted. Otherwise `key` and `cached` are `None`. Each key
+    is also added to the `cache_keys` dict, if given, mapped to whether its
+    conversion was found in `cache`.
+
+    """
+
+    for collection, doc in classified_docs:
+        key = cached = None
+        if cache is not None:
+            key = get_conversion_cache_key(collection, doc, lingsync_db_name)
+            if key is not None:
+                cached = cache.get(key)
+                if cached is not None:
+                    doc = None
+                if cache_keys is not None:
+                    cache_keys[key] = cached is not None
+        yield collection, key, doc, cached
+
+
+def prune_conversion_cache(cache, cache_keys):
+    """Remove from the conversion `cache` the conversions whose keys are not
+    in `cache_keys`, i.e., those of documents that have since been changed or
+    deleted.
+
+    """
+
+    for key in cache.keys():
+        if key not in cache_keys:
+            del cache[key]
+
+
+def iter_lingsync_doc_chunks(conversion_items, lingsync_db_name, semaphore,
+        fname=None, timed=False, stop=None):
+    """Group the `(collection, key, doc, cached)` tuples generated by
+    `conversion_items` (see `iter_conversion_items`) into `(collection, items,
+    lingsync_db_name, fname, timed)` tasks of up to `CONVERT_CHUNK_SIZE`
+    `(key, doc, cached)` items of the same collection, in document order.
+    `semaphore` is acquired before each task is generated, which keeps a
+    process pool from reading (far) ahead of the conversion. If the
+    `threading.Event` `stop` is set (by the time the semaphore is acquired),
+    no more tasks are generated.
+
+    """
+
+    chunks = dict((collection, []) for collection in MIGRATED_COLLECTIONS)
+    for collection, key, doc, cached in conversion_items:
+        chunk = chunks[collection]
+        chunk.append((key, doc, cached))
+        if len(chunk) == CONVERT_CHUNK_SIZE:
+            semaphore.acquire()
+            if stop is not None and stop.is_set():
+                return
+            yield collection, chunk, lingsync_db_name, fname, timed
+            chunks[collection] = []
+    for collection in MIGRATED_COLLECTIONS:
+        if chunks[collection]:
+            semaphore.acquire()
+            if stop is not None and stop.is_set():
+                return
+            yield (collection, chunks[collection], lingsync_db_name, fname,
+                timed)
+
+
+def iter_converted_lingsync_docs(classified_docs, lingsync_db_name,
+        workers=1, fname=None, cache=None, cache_keys=None, profile=None):
+    """Convert the LingSync documents in the `(collection, doc)` tuples
+    generated by `classified_docs` and generate `(collection, old_object)`
+    tuples, in document order within each collection. The original documents
+    are dropped from the `old_object`s (all but their ids, which
+    `update_state` needs) as soon as they are converted. If `fname` is given,
+    each "doc" is instead the `(offset, length)` span of the document's row
+    in the uncompressed LingSync JSON file `fname` (see
+    `classify_lingsync_index`), from which the document is read only when it
+    is converted.
+
+    If `workers` is greater than 1, the documents are converted in chunks by
+    a pool of that many processes. Each process returns the changes that each
+    document made to `TAGSTOFIX` and `OVERFLOWS` and that its chunk made to
+    `SESSION_REVS`, which are merged into this process's in document order,
+    so the end result is the same as that of a serial conversion.
+
+    If a conversion `cache` is given (see `open_conversion_cache`; it requires
+    the documents themselves, not their spans), the documents whose
+    conversions are in it are not converted again, and the conversions of the
+    others are added to it. The keys of the conversions of all of the
+    documents are added to `cache_keys` (see `iter_conversion_items`).
+
+    If a `ConversionProfile` `profile` is given, the conversion of each
+    document is timed in it.
+
+    """
+
+    conversion_items = iter_conversion_items(classified_docs,
+        lingsync_db_name, cache, cache_keys)
+    if workers > 1:
+        # At most two chunks per process are read ahead of the conversion.
+        semaphore = threading.Semaphore(2 * workers)
+        stop = threading.Event()
+        pool = multiprocessing.Pool(workers)
+        try:
+            for collection, results, session_revs, timings in pool.imap(
+                    convert_lingsync_docs_chunk,
+                    iter_lingsync_doc_chunks(conversion_items,
+                    lingsync_db_name, semaphore, fname,
+                    profile is not None, stop)):
+                semaphore.release()
+                merge_conversion_state({}, set(), session_revs)
+                for timing in timings:
+                    profile.add_doc_time(*timing)
+                for key, converted, conversion in results:
+                    yield collection, apply_conversion(key, converted,
+                        conversion, cache)
+            pool.close()
+        except:
+            # The pool's task handler thread may be waiting on the semaphore
+            # (in `iter_lingsync_doc_chunks`) for results that will never
+            # come; it must be let go (and stop generating tasks), or
+            # `terminate` would wait for it forever.
+            stop.set()
+            semaphore.release()
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+    else:
+        timings = []
+        for collection, key, doc, cached in conversion_items:
+            conversion = cached
+            if conversion is None:
+                if fname:
+                    doc = read_lingsync_docs(fname, [doc])[0]
+                if profile is None:
+                    conversion = convert_lingsync_doc_with_state(collection,
+                        doc, lingsync_db_name)
+                else:
+                    conversion = convert_lingsync_doc_timed(collection, doc,
+                        lingsync_db_name, timings)
+                    profile.add_doc_time(*timings.pop())
+            yield collection, apply_conversion(key, cached is None,
+                conversion, cache)
+
+
+def apply_conversion(key, converted, conversion, cache=None):
+    """Merge the `TAGSTOFIX` and `OVERFLOWS` entries of the `(old_object,
+    tagstofix, overflows)` `conversion` of a LingSync document into this
+    process's and return its `old_object`. If the document was `converted`
+    (i.e., the conversion was not taken from `cache`), add the conversion to
+    `cache` (if given) under `key`.
+
+    """
+
+    if converted and cache is not None and key is not None:
+        cache[key] = conversion
+    old_object, tagstofix, overflows = conversion
+    merge_conversion_state(tagstofix, overflows, {})
+    return old_object
+
+
+def convert_lingsync_doc(collection, doc, lingsync_db_name):
+    """Convert the LingSync `doc` from `collection` (one of
+    `MIGRATED_COLLECTIONS`) and return the resulting `old_object` (or
+    `None`), keeping only the id of `doc` in it.
+
+    """
+
+    if collection == 'sessions':
+        old_object = process_lingsync_session(doc)
+    elif collection == 'datums':
+        # The `collections` argument is not used by `process_lingsync_datum`.
+        old_object = process_lingsync_datum(doc, None, lingsync_db_name)
+    elif collection == 'users':
+        old_object = process_lingsync_user(doc)
+    else:
+        old_object = process_lingsync_datalist(doc)
+    if old_object:
+        old_object['originaldoc'] = {'_id': doc['_id']}
+    return old_object
+
+
+def convert_lingsync_doc_with_state(collection, doc, lingsync_db_name):
+    """Convert the LingSync `doc` from `collection` (see
+    `convert_lingsync_doc`) and return an `(old_object, tagstofix, overflows)`
+    tuple, where `tagstofix` and `overflows` hold the entries that the
+    conversion would have added to `TAGSTOFIX` and `OVERFLOWS`, which are left
+    unchanged (see `merge_conversion_state`).
+
+    """
+
+    global TAGSTOFIX, OVERFLOWS
+    tagstofix, overflows = TAGSTOFIX, OVERFLOWS
+    TAGSTOFIX, OVERFLOWS = {}, set()
+    try:
+        old_object = convert_lingsync_doc(collection, doc, lingsync_db_name)
+        return old_object, TAGSTOFIX, OVERFLOWS
+    finally:
+        TAGSTOFIX, OVERFLOWS = tagstofix, overflows
+
+
+def convert_lingsync_doc_timed(collection, doc, lingsync_db_name, timings):
+    """Convert the LingSync `doc` from `collection` (see
+    `convert_lingsync_doc_with_state`), appending the `(collection, doc_id,
+    wall, cpu)` timing of its conversion to `timings`.
+
+    """
+
+    wall, cpu = time.time(), time.clock()
+    conversion = convert_lingsync_doc_with_state(collection, doc,
+        lingsync_db_name)
+    timings.append((collection, doc.get('_id'), time.time() - wall,
+        time.clock() - cpu))
+    return conversion
+
+
+def convert_lingsync_docs_chunk(task):
+    """Convert a chunk of LingSync documents in a worker process. `task` is a
+    `(collection, items, lingsync_db_name, fname, timed)` tuple, whose items
+    are `(key, doc, cached)` tuples (see `iter_lingsync_doc_chunks`), where, if
+    `fname` is given, each `doc` is the span of the document's row in the
+    LingSync JSON file `fname`, which the worker reads for itself. Return the
+    collection, a `(key, converted, conversion)` tuple for each item, where
+    `conversion` is `cached`, if given, or else the conversion of `doc` (see
+    `convert_lingsync_doc_with_state`), the entries that the reading added to
+    `SESSION_REVS` and, if `timed` is `True`, the timings of the conversions
+    (see `convert_lingsync_doc_timed`).
+
+    """
+
+    collection, items, lingsync_db_name, fname, timed = task
+    SESSION_REVS.clear()
+    if fname:
+        docs = read_lingsync_docs(fname, [doc for key, doc, cached in items
+            if cached is None])
+    else:
+        docs = [doc for key, doc, cached in items if cached is None]
+    docs = iter(docs)
+    results = []
+    timings = []
+    for key, doc, cached in items:
+        if cached is None and timed:
+            results.append((key, True, convert_lingsync_doc_timed(collection,
+                next(docs), lingsync_db_name, timings)))
+        elif cached is None:
+            results.append((key, True, convert_lingsync_doc_with_state(
+                collection, next(docs), lingsync_db_name)))
+        else:
+            results.append((key, False, cached))
+    return collection, results, dict(SESSION_REVS), timings
+
+
+def merge_conversion_state(tagstofix, overflows, session_revs):
+    """Merge the `TAGSTOFIX`, `OVERFLOWS` and `SESSION_REVS` entries that the
+    conversion of a document (or a worker process's reading of a chunk of
+    them) accrued into this process's. They must be merged in document order.
+
+    """
+
+    for tag, meta in tagstofix.iteritems():
+        merged_meta = TAGSTOFIX.setdefault(tag, {})
+        merged_meta.setdefault('datum_ids', []).extend(
+            meta.get('datum_ids', []))
+        if 'tags_created' in meta:
+            merged_meta['tags_created'] = meta['tags_created']
+    OVERFLOWS.update(overflows)
+    for session_id, revs in session_revs.iteritems():
+        SESSION_REVS.setdefault(session_id, set()).update(revs)
+
+
+def lingsync2old(fname, lingsync_db_name, force_file_download, compress=None,
+        convert_workers=1, compact_records=False, incremental=False,
+        sharded_output=False, max_warning_examples=None, profile=None,
+        file_download_workers=FILE_DOWNLOAD_WORKERS,
+        file_download_host_workers=FILE_DOWNLOAD_HOST_WORKERS):
+    """Convert the LingSync database (named `lingsync_db_name`, whose data are
+    stored in the JSON file `fname`) to an OLD-compatible JSON file
+    (compressed in the `compress` format, if given). This is the primary
+    "convert" function that represents Step 2. If `convert_workers` is greater
+    than 1, the documents are converted by that many processes. If
+    `compact_records` is `True`, the OLD forms, tags, speakers and users are
+    held in compact records while they are accumulated, and the repeated
+    strings of the LingSync documents are interned as they are loaded. If
+    `incremental` is `True`, only the documents whose conversions are not in
+    the conversion cache (see `open_conversion_cache`) are converted; the
+    steps that combine the converted documents are always run in full. If
+    `sharded_output` is `True`, the OLD data are written as a directory of
+    JSON Lines files (see `write_old_data_shards`). If `max_warning_examples`
+    is given, at most that many warnings of each kind about specific
+    documents are kept and reported; the rest are only counted. If a
+    `ConversionProfile` `profile` is given, the stages of the conversion and
+    the conversion of each document are timed in it, and its report is
+    written (see `write_conversion_profile`). The media files are downloaded
+    by `file_download_workers` threads, at most `file_download_host_workers`
+    of them per host (see `download_lingsync_media_files`).
+
+    """
+
+    if profile:
+        profile.start(convert_workers)
+
+    # Maps names of OLD resources (pluralized) to lists of dicts, where each
+    # such dict is a valid payload for an OLD POST request.
+    old_data = {}
+
+    # Holds warning messages accrued via the transformation of LingSync data
+    # structures to OLD ones.
+    warnings = ConversionWarnings(max_warning_examples)
+
+    # This holds all of the `language` values from the LingSync sessions that
     # we process. Since the OLD assumes a single language, we will arbitrarily
     # choose the first one when creating the OLD's application settings.
     languages = set()
 
-    lingsync_data = json.load(open(fname))
-    try:
-        rows = lingsync_data['rows']
-    except KeyError:
-        p(lingsync_data)
-        sys.exit(u'%sUnable to load LingSync data. Aborting.%s' % (ANSI_FAIL,
-            ANSI_ENDC))
+    # Hash index of the resources in `old_data`, which keeps `update_state`
+    # from having to compare each new resource to all of the existing ones.
+    old_data_index = {}
 
     # - LingSync sessions are turned into OLD collections.
     # - LingSync datums are turned into OLD forms.
@@ -523,34 +2405,79 @@ def lingsync2old(fname, lingsync_db_name, force_file_download):
     # - LingSync documents with no `collection` value are logic, not data; i.e.,
     #   mapreduces or something else.
 
-    # Note: we don't necessarily need to loop through all rows for each
-    # collection type. We may need to process the sessions first, because the
-    # datums refer to them. However, it seems that every datum redundantly
-    # holds a copy of its session anyway, so this may not be necessary.
-
-    # LS-Session to OLD-Collection.
+    # The LingSync documents are streamed from disk, one at a time, and each
+    # is classified just once and converted (possibly by several processes)
+    # as soon as it is read; only the resulting `old_object`s are kept. Those
+    # are then added to `old_data` collection by collection, in the order of
+    # `MIGRATED_COLLECTIONS`, and in document order within each collection.
+    # Worker processes read their documents themselves, by their offsets in
+    # the (uncompressed) JSON file, so that this process need not decode them,
+    # unless the conversion cache is used, which needs the documents' revisions.
+    collection_counts = {}
+    index = cache = None
+    cache_keys = {}
+    if incremental:
+        cache = open_conversion_cache(lingsync_db_name)
+    elif convert_workers > 1:
+        index = get_lingsync_index(fname)
+    if index:
+        meta = index['meta']
+        classified_docs = classify_lingsync_index(index, collection_counts)
+    else:
+        meta = {}
+        classified_docs = classify_lingsync_docs(iter_lingsync_docs(fname,
+            meta, compact_records), collection_counts)
+    if profile:
+        classified_docs = profile.iter_timed(classified_docs)
+    old_objects = dict((collection, []) for collection in MIGRATED_COLLECTIONS)
+    # Maps the values of tags, speakers and users to their shared records,
+    # with `compact_records`.
+    interned = {}
+    try:
+        for collection, old_object in iter_converted_lingsync_docs(
+                classified_docs, lingsync_db_name, convert_workers,
+                index and fname, cache, cache_keys, profile):
+            if compact_records and old_object:
+                compact_old_object(old_object, interned)
+            old_objects[collection].append(old_object)
+        if cache is not None:
+            prune_conversion_cache(cache, cache_keys)
+    finally:
+        if cache is not None:
+            cache.close()
+    del interned
+    if cache is not None:
+        cached_count = sum(cache_keys.itervalues())
+        print ('Converted %d LingSync documents; the conversions of the other'
+            ' %d were taken from the cache.' % (len(cache_keys) - cached_count,
+            cached_count))
+    if 'rows' not in meta:
+        p(meta)
+        sys.exit(u'%sUnable to load LingSync data. Aborting.%s' % (ANSI_FAIL,
+            ANSI_ENDC))
+    if profile:
+        profile.lap(PROFILE_CONVERT_STAGE)
+
+    # Warn about datums that embed different revisions of their session.
+    for session_id, revs in SESSION_REVS.iteritems():
+        if len(revs) > 1:
+            warnings.setdefault('general', set()).add(u'The LingSync datums'
+                u' of session %s embed different revisions of it (%s); each'
+                u' datum was converted using the revision that it embeds.' % (
+                session_id, u', '.join(sorted(map(unicode, revs)))))
+
+    # LS-Session to OLD-Collection and LS-Datum to OLD-Form.
     # Deal with LingSync sessions first, since they contain data that will
     # be needed for datums-come-forms later on.
-    # if r.get('doc', {}).get('collection') == 'sessions':
-    for r in rows:
-        if get_collection_for_lingsync_doc(r.get('doc', {})) == 'sessions':
-            old_object = process_lingsync_session(r['doc'])
+    for collection in ('sessions', 'datums'):
+        for old_object in old_objects.pop(collection):
             if old_object:
                 old_data, warnings = update_state(old_object, old_data,
-                    warnings)
+                    warnings, old_data_index)
                 # Add any language extracted from the session.
-                if old_object.get('language'):
+                if collection == 'sessions' and old_object.get('language'):
                     languages.add(old_object['language'])
 
-    # LS-Datum to OLD-Form.
-    for r in rows:
-        if get_collection_for_lingsync_doc(r.get('doc', {})) == 'datums':
-            old_object = process_lingsync_datum(r['doc'],
-                old_data['collections'], lingsync_db_name)
-            if old_object:
-                old_data, warnings = update_state(
-                    old_object, old_data, warnings)
-
     # Note: LingSync corpus and private_corpus documents don't appear to
     # contain any data that need to be migrated to the OLD. They contain
     # metadata about the corpus, including licensing information and basic info
@@ -559,40 +2486,54 @@ def lingsync2old(fname, lingsync_db_name, force_file_download):
     # documents in the JSON dump being analyzed.
 
     # LS-User to OLD-User
-    for r in rows:
-        if get_collection_for_lingsync_doc(r.get('doc', {})) == 'users':
-            old_object = process_lingsync_user(r['doc'])
-            old_data, warnings = update_state(old_object, old_data, warnings)
+    for old_object in old_objects.pop('users'):
+        old_data, warnings = update_state(old_object, old_data, warnings,
+            old_data_index)
 
     # LS-Datalist to OLD-Corpus
-    for r in rows:
-        if get_collection_for_lingsync_doc(r.get('doc', {})) == 'datalists':
-            old_object = process_lingsync_datalist(r['doc'])
-            old_data, warnings = update_state(old_object, old_data, warnings)
+    for old_object in old_objects.pop('datalists'):
+        old_data, warnings = update_state(old_object, old_data, warnings,
+            old_data_index)
+
+    if profile:
+        profile.lap('add the OLD resources')
 
     # Merge/consolidate duplicate users, speakers and tags.
     old_data, warnings = consolidate_resources(old_data, warnings)
+    if profile:
+        profile.lap('consolidate users, speakers and tags')
 
     # Get an OLD application settings, using the language(s) and
     # grammaticalities extracted from the LingSync corpus.
     old_application_settings, warnings = get_old_application_settings(old_data,
         languages, warnings)
     old_data['applicationsettings'] = [old_application_settings]
+    if profile:
+        profile.lap('get the application settings')
 
     # Download audio, video or image files from the LingSync application, if
     # necessary.
     old_data, warnings, exit_status = download_lingsync_media_files(old_data,
-        warnings, lingsync_db_name, force_file_download)
+        warnings, lingsync_db_name, force_file_download, file_download_workers,
+        file_download_host_workers)
 
     if exit_status == 'aborted':
         print ('You chose not to migrate audio/video/image files from LingSync'
             ' to OLD because they were too large.')
+    if profile:
+        profile.lap('download the media files')
 
     # Tell the user what we've accomplished.
-    print_summary(lingsync_db_name, rows, old_data, warnings)
+    print_summary(lingsync_db_name, collection_counts, old_data, warnings)
+    if profile:
+        profile.lap('write the summaries and warnings')
 
     # Save our OLD data to a JSON file in OLD_DIR/
-    old_data_fname = write_old_data_to_disk(old_data, lingsync_db_name)
+    old_data_fname = write_old_data_to_disk(old_data, lingsync_db_name,
+        compress, sharded_output)
+    if profile:
+        profile.stop('write the OLD data')
+        write_conversion_profile(profile, lingsync_db_name)
 
     return old_data_fname
 
@@ -644,11 +2585,19 @@ def human_bytes(num_bytes):
         return '%d bytes' % num_bytes
 
 
-def download_lingsync_media_files(old_data, warnings, lingsync_db_name, force_file_download):
+def download_lingsync_media_files(old_data, warnings, lingsync_db_name,
+        force_file_download, workers=FILE_DOWNLOAD_WORKERS,
+        host_workers=FILE_DOWNLOAD_HOST_WORKERS):
     """If `old_data` contains OLD file resources generated from LingSync files,
     then we need to download their file data and save them for later upload to
     the OLD.
 
+    The files are downloaded by a pool of `workers` threads, with at most
+    `host_workers` of them downloading from any one host at a time. Each file
+    is streamed to a temporary file that is renamed only once it is complete,
+    so an interrupted download never leaves a partial file behind (which would
+    otherwise be taken for a downloaded one).
+
     """
 
     if len(old_data.get('files', [])) == 0:
@@ -690,11 +2639,14 @@ def download_lingsync_media_files(old_data, warnings, lingsync_db_name, force_fi
             old_data['files'] = []
             return (old_data, warnings, 'aborted')
     dirpath = create_files_directory_safely(lingsync_db_name)
-    downloaded_files = []
+
+    # Several OLD files may share a filename (e.g., when two datums refer to
+    # the same LingSync file); each file path is downloaded only once.
+    file_paths = []
+    tasks = OrderedDict()
     for file in old_data['files']:
         url = file.get('__lingsync_file_url')
         fname = file.get('filename')
-        fsize = file.get('__lingsync_file_size')
         if not fname:
             try:
                 fname = os.path.split(url)[1]
@@ -702,50 +2654,148 @@ def download_lingsync_media_files(old_data, warnings, lingsync_db_name, force_fi
                 fname = None
         if url and fname:
             filepath = os.path.join(dirpath, fname)
-            outcome, warnings = download_lingsync_file(url, filepath,
-                fsize, warnings, force_file_download)
-            if outcome:
-                file['__local_file_path'] = filepath
-                downloaded_files.append(file)
-            else:
-                warnings['general'].add(u'We were unable to download the'
-                    u' file data for a file associated to LingSync datum'
-                    u' %s; download and/or local write failed.' % (
-                    file['__lingsync_datum_id'],))
+            if filepath not in tasks:
+                tasks[filepath] = {
+                    'url': url,
+                    'filepath': filepath,
+                    'fsize': file.get('__lingsync_file_size'),
+                    'host': urlparse.urlparse(url).netloc
+                }
         else:
+            filepath = None
             warnings['general'].add(u'We were unable to download the file'
                 u' data for a file associated to LingSync datum %s; URL or'
                 u' filename was not retrievable.' % (
                 file['__lingsync_datum_id'],))
+        file_paths.append(filepath)
+
+    workers = max(1, workers or 1)
+    host_workers = max(1, host_workers or workers)
+    progress = {
+        'lock': threading.Lock(),
+        'start': time.time(),
+        'file_count': 0,
+        'total_files': len(tasks),
+        'byte_count': 0,
+        'total_bytes': sum(t['fsize'] or 0 for t in tasks.itervalues() if
+            force_file_download or not os.path.isfile(t['filepath'])),
+        'host_semaphores': {},
+        'file_mode': get_default_file_mode(),
+        'force_file_download': force_file_download,
+        'warnings': warnings
+    }
+    for task in tasks.itervalues():
+        task['progress'] = progress
+        progress['host_semaphores'].setdefault(task['host'],
+            threading.BoundedSemaphore(host_workers))
+    if tasks:
+        flush('Downloading %d LingSync files' % len(tasks))
+    if workers > 1 and len(tasks) > 1:
+        pool = ThreadPool(min(workers, len(tasks)))
+        try:
+            outcomes = pool.map(download_lingsync_file_task, tasks.values())
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        outcomes = map(download_lingsync_file_task, tasks.values())
+    if tasks:
+        print
+    outcomes = dict(zip(tasks.keys(), outcomes))
+
+    downloaded_files = []
+    for file, filepath in zip(old_data['files'], file_paths):
+        if filepath is None:
+            continue
+        if outcomes[filepath]:
+            file['__local_file_path'] = filepath
+            downloaded_files.append(file)
+        else:
+            warnings['general'].add(u'We were unable to download the'
+                u' file data for a file associated to LingSync datum'
+                u' %s; download and/or local write failed.' % (
+                file['__lingsync_datum_id'],))
     old_data['files'] = downloaded_files
     return (old_data, warnings, 'ok')
 
 
-def download_lingsync_file(url, filepath, fsize, warnings, force_file_download):
-    """Download a LingSync file at `url` save it to `filepath`.
+def download_lingsync_file_task(task):
+    """Download the LingSync file described by `task` (a dict built in
+    `download_lingsync_media_files`), once a download slot for its host is
+    free, and report the progress of all of the downloads. Return `True` if
+    the file was downloaded (or had been already).
 
     """
 
-    if os.path.isfile(filepath) and (not force_file_download):
-        return (True, warnings)
+    progress = task['progress']
+    with progress['host_semaphores'][task['host']]:
+        outcome, _ = download_lingsync_file(task['url'], task['filepath'],
+            task['fsize'], progress['warnings'],
+            progress['force_file_download'], progress)
+    with progress['lock']:
+        progress['file_count'] += 1
+        print_file_download_progress(progress)
+    return outcome
+
+
+def get_file_download_session():
+    """Return the `requests` session of the current thread, so that each
+    download thread reuses its connections from one file to the next.
+
+    """
+
+    session = getattr(FILE_DOWNLOAD_SESSIONS, 'session', None)
+    if session is None:
+        session = FILE_DOWNLOAD_SESSIONS.session = requests.Session()
+    return session
 
-    file_is_big = False
-    if fsize and fsize > BIG_FILE_SIZE:
-        file_is_big = True
 
-    with open(filepath, 'wb') as handle:
-        response = requests.get(url, stream=file_is_big, verify=False)
+def download_lingsync_file(url, filepath, fsize, warnings, force_file_download,
+        progress=None):
+    """Download a LingSync file at `url` save it to `filepath`. The file is
+    streamed to a temporary file in the same directory, which is given the
+    permissions of a newly created file and renamed to `filepath` once it is
+    complete. If a `progress` dict is given (see
+    `download_lingsync_media_files`), the downloaded bytes are counted in it.
 
-        if not response.ok:
-            warnings['general'].add(u'Attempt to download LingSync file at %s'
-                u' failed.' % (url,))
-            return (False, warnings)
+    """
+
+    if os.path.isfile(filepath) and (not force_file_download):
+        return (True, warnings)
 
-        if file_is_big:
-            for block in response.iter_content(1024):
-                handle.write(block)
+    dirpath, fname = os.path.split(filepath)
+    handle, tmp_filepath = tempfile.mkstemp(prefix='%s.' % fname,
+        suffix='.part', dir=dirpath)
+    try:
+        with os.fdopen(handle, 'wb') as outfile:
+            response = get_file_download_session().get(url, stream=True,
+                verify=False)
+            try:
+                if not response.ok:
+                    warnings['general'].add(u'Attempt to download LingSync'
+                        u' file at %s failed.' % (url,))
+                    return (False, warnings)
+                for block in response.iter_content(FILE_DOWNLOAD_CHUNK_SIZE):
+                    outfile.write(block)
+                    if progress is not None:
+                        with progress['lock']:
+                            progress['byte_count'] += len(block)
+                            print_file_download_progress(progress)
+            finally:
+                response.close()
+        # `mkstemp` creates the file readable by its owner only.
+        if progress is not None:
+            os.chmod(tmp_filepath, progress['file_mode'])
         else:
-            handle.write(response.content)
+            os.chmod(tmp_filepath, get_default_file_mode())
+        os.rename(tmp_filepath, filepath)
+    except (requests.exceptions.RequestException, IOError, OSError) as e:
+        warnings['general'].add(u'Attempt to download LingSync file at %s'
+            u' failed: %s.' % (url, e))
+        return (False, warnings)
+    finally:
+        if os.path.isfile(tmp_filepath):
+            os.remove(tmp_filepath)
 
     if os.path.isfile(filepath):
         return (True, warnings)
@@ -753,13 +2803,54 @@ def download_lingsync_file(url, filepath, fsize, warnings, force_file_download):
         return (False, warnings)
 
 
+def get_default_file_mode():
+    """Return the permissions that `open` gives a new file, i.e., 0666 less
+    the bits in the process's umask. The umask can only be read by setting
+    it, so this must not be called while other threads are creating files.
+
+    """
+
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0666 & ~umask
+
+
+def print_file_download_progress(progress):
+    """Overwrite the current line of the terminal with the number of LingSync
+    files and bytes downloaded so far, the download rate in bytes per second
+    and, if the sizes of the files are known, the estimated time remaining.
+    Call with `progress['lock']` held.
+
+    """
+
+    now = time.time()
+    if (now - progress.get('printed', 0) < FILE_DOWNLOAD_PROGRESS_INTERVAL and
+            progress['file_count'] < progress['total_files']):
+        return
+    progress['printed'] = now
+    elapsed = now - progress['start']
+    if elapsed > 0:
+        rate = progress['byte_count'] / elapsed
+    else:
+        rate = 0.0
+    line = '\rDownloaded %d/%d files, %s (%s/sec)' % (progress['file_count'],
+        progress['total_files'], human_bytes(progress['byte_count']),
+        human_bytes(int(rate)))
+    remaining = progress['total_bytes'] - progress['byte_count']
+    if rate and progress['total_bytes'] and remaining > 0:
+        line = '%s, about %s left' % (line,
+            datetime.timedelta(seconds=int(remaining / rate)))
+    sys.stdout.write(line.ljust(79))
+    sys.stdout.flush()
+
+
 def get_old_application_settings(old_data, languages, warnings):
     """Return an OLD application settings dict, given a set of (object)
     language names and the grammaticalities (in the forms in `old_data`).
 
     """
 
-    appset = copy.deepcopy(old_schemata['applicationsettings'])
+    appset = new_old_resource('applicationsettings')
     if languages:
         languages = list(languages)
         language = languages[0]
@@ -809,7 +2900,7 @@ def consolidate_speakers(duplicates):
 
     """
 
-    return_speaker = copy.deepcopy(old_schemata['speaker'])
+    return_speaker = new_old_resource('speaker')
     speaker_warnings = []
     for attr in return_speaker:
         if attr in ['first_name', 'last_name']:
@@ -830,6 +2921,38 @@ def consolidate_speakers(duplicates):
     return (return_speaker, speaker_warnings)
 
 
+def group_resources(resources, key_func):
+    """Group `resources` by the value that `key_func` returns for each of them,
+    in a single pass. Return a list of the groups (lists of resources) in the
+    order in which each group's first resource occurs in `resources`.
+
+    Keys are hashed. The rare unhashable key (e.g., a LingSync username that
+    is an object) is compared with the other unhashable keys one by one.
+
+    """
+
+    groups = []
+    hashed = {}
+    unhashable = []
+    for resource in resources:
+        key = key_func(resource)
+        try:
+            group = hashed.setdefault(key, [])
+        except TypeError:
+            group = None
+            for other_key, other_group in unhashable:
+                if other_key == key:
+                    group = other_group
+                    break
+            if group is None:
+                group = []
+                unhashable.append((key, group))
+        if not group:
+            groups.append(group)
+        group.append(resource)
+    return groups
+
+
 def consolidate_resources(old_data, warnings):
     """Look for duplicate users, speakers and tags in `old_data` and merge the
     duplicates into a single resource of the relevant type.
@@ -843,18 +2966,13 @@ def consolidate_resources(old_data, warnings):
         users = old_data['users']
         consolidated_users = []
         consolidate_users_warnings = []
-        processed = []
-        for user in users:
-            if user not in processed:
-                username = user['username']
-                duplicates = [u for u in users if u['username'] == username]
-                processed += duplicates
-                if len(duplicates) > 1:
-                    new_user, user_warnings = consolidate_users(duplicates)
-                    consolidate_users_warnings += user_warnings
-                    consolidated_users.append(new_user)
-                else:
-                    consolidated_users.append(user)
+        for duplicates in group_resources(users, lambda u: u['username']):
+            if len(duplicates) > 1:
+                new_user, user_warnings = consolidate_users(duplicates)
+                consolidate_users_warnings += user_warnings
+                consolidated_users.append(new_user)
+            else:
+                consolidated_users.append(duplicates[0])
         old_data['users'] = consolidated_users
         for warning in consolidate_users_warnings:
             warnings['general'].add(warning)
@@ -866,22 +2984,15 @@ def consolidate_resources(old_data, warnings):
         speakers = old_data['speakers']
         consolidated_speakers = []
         consolidate_speakers_warnings = []
-        processed = []
-        for speaker in speakers:
-            if speaker not in processed:
-                first_name = speaker['first_name']
-                last_name = speaker['last_name']
-                duplicates = [u for u in speakers if
-                        u['first_name'] == first_name and
-                        u['last_name'] == last_name]
-                processed += duplicates
-                if len(duplicates) > 1:
-                    new_speaker, speaker_warnings = consolidate_speakers(
-                        duplicates)
-                    consolidate_speakers_warnings += speaker_warnings
-                    consolidated_speakers.append(new_speaker)
-                else:
-                    consolidated_speakers.append(speaker)
+        for duplicates in group_resources(speakers,
+                lambda s: (s['first_name'], s['last_name'])):
+            if len(duplicates) > 1:
+                new_speaker, speaker_warnings = consolidate_speakers(
+                    duplicates)
+                consolidate_speakers_warnings += speaker_warnings
+                consolidated_speakers.append(new_speaker)
+            else:
+                consolidated_speakers.append(duplicates[0])
         old_data['speakers'] = consolidated_speakers
         for warning in consolidate_speakers_warnings:
             warnings['general'].add(warning)
@@ -893,26 +3004,23 @@ def consolidate_resources(old_data, warnings):
         tags = old_data['tags']
         consolidated_tags = []
         consolidate_tags_warnings = []
-        processed = []
-        for tag in tags:
-            if tag not in processed:
+        for duplicates in group_resources(tags, lambda t: t['name']):
+            tag = duplicates[0]
+            if len(duplicates) > 1:
                 name = tag['name']
                 description = tag['description']
-                duplicates = [t for t in tags if t['name'] == name]
-                processed += duplicates
-                if len(duplicates) > 1:
-                    new_tag = tag
-                    new_description = u'\n\n'.join([t['description'] for t in
-                        duplicates if t['description']])
-                    new_tag['description'] = description
-                    if new_description != description:
-                        consolidate_tags_warnings.append(u'Changed description'
-                            u' of tag \u2018%s\u2019 from \u2018%s\u2019 to'
-                            u' \u2018%s\u2019' % (name, description,
-                            new_description))
-                    consolidated_tags.append(new_tag)
-                else:
-                    consolidated_tags.append(tag)
+                new_tag = tag
+                new_description = u'\n\n'.join([t['description'] for t in
+                    duplicates if t['description']])
+                new_tag['description'] = description
+                if new_description != description:
+                    consolidate_tags_warnings.append(u'Changed description'
+                        u' of tag \u2018%s\u2019 from \u2018%s\u2019 to'
+                        u' \u2018%s\u2019' % (name, description,
+                        new_description))
+                consolidated_tags.append(new_tag)
+            else:
+                consolidated_tags.append(tag)
         old_data['tags'] = consolidated_tags
         for warning in consolidate_tags_warnings:
             warnings['general'].add(warning)
@@ -920,42 +3028,160 @@ def consolidate_resources(old_data, warnings):
     return old_data, warnings
 
 
-def get_old_json_filename(database_name):
+def get_old_json_filename(database_name, compress=None):
     """Return the relative path where we store the JSON file that holds the
-    LingSync data in a format that the OLD can ingest.
+    LingSync data in a format that the OLD can ingest, compressed in the
+    `compress` format, if given.
+
+    """
+
+    return os.path.join(OLD_DIR, '%s.json%s' % (database_name,
+        COMPRESSED_EXTENSIONS.get(compress, '')))
+
+
+def get_old_jsonl_dirname(database_name):
+    """Return the relative path of the directory where we store the JSON Lines
+    files that hold the LingSync data in a format that the OLD can ingest
+    (see `write_old_data_shards`).
+
+    """
+
+    return os.path.join(OLD_DIR, '%s-jsonl' % database_name)
+
+
+def get_old_jsonl_filename(dirname, resource_name, compress=None):
+    """Return the path of the JSON Lines file in the directory `dirname` that
+    holds the OLD resources named `resource_name` (e.g., 'forms'), compressed
+    in the `compress` format, if given.
 
     """
 
-    return os.path.join(OLD_DIR, '%s.json' % database_name)
+    return os.path.join(dirname, '%s.jsonl%s' % (resource_name,
+        COMPRESSED_EXTENSIONS.get(compress, '')))
+
 
+def find_old_data(database_name, compress=None, sharded=False):
+    """Return the path to the existing file (or, if `sharded` is `True`, the
+    directory of JSON Lines files) that holds the converted OLD data of the
+    LingSync database `database_name`, or `None` if there is none.
 
-def write_old_data_to_disk(old_data, database_name):
+    """
+
+    if sharded:
+        dirname = get_old_jsonl_dirname(database_name)
+        if os.path.isdir(dirname):
+            return dirname
+        return None
+    return find_data_file(get_old_json_filename(database_name, compress))
+
+
+def write_old_data_to_disk(old_data, database_name, compress=None,
+        sharded=False):
     """Save the OLD data extracted from the LingSync corpuse to a JSON file so
-    we don't need to re-migrate/convert it every time.
+    we don't need to re-migrate/convert it every time. A compressed file is
+    not indented, since nobody will be reading it as is. If `sharded` is
+    `True`, the data are instead saved as a directory of JSON Lines files (see
+    `write_old_data_shards`).
 
     """
 
-    fname = get_old_json_filename(database_name)
-    with open(fname, 'w') as outfile:
-        json.dump(old_data, outfile, indent=4)
+    if sharded:
+        return write_old_data_shards(old_data, database_name, compress)
+    fname = get_old_json_filename(database_name, compress)
+    # Keys are sorted so that the file does not depend on the order in which
+    # the dicts' keys happened to be inserted, which differs, e.g., for dicts
+    # that have been passed back from worker processes.
+    with open_data_file(fname, 'w', compress) as outfile:
+        if compress:
+            json.dump(old_data, outfile, sort_keys=True,
+                default=old_record_to_json)
+        else:
+            json.dump(old_data, outfile, indent=4, sort_keys=True,
+                default=old_record_to_json)
     return fname
 
 
-def get_lingsync_corpus_summary(rows):
-    """Return a string summarizing the LingSync documents that we downloaded.
+def write_old_data_shards(old_data, database_name, compress=None):
+    """Save the OLD data extracted from the LingSync corpus to a directory
+    that holds one JSON Lines file per OLD resource type (e.g.,
+    forms.jsonl), each resource being encoded on a line of its own as it is
+    written, so that the whole is never held as a single JSON string, and so
+    that the resources can be read back one at a time (see
+    `OLDResourceFile`). The files are written to a temporary directory,
+    which then replaces any existing one. Return the path to the directory.
+
+    """
+
+    dirname = get_old_jsonl_dirname(database_name)
+    tmp_dirname = dirname + '.tmp'
+    if os.path.isdir(tmp_dirname):
+        shutil.rmtree(tmp_dirname)
+    os.makedirs(tmp_dirname)
+    for resource_name, resources in sorted(old_data.iteritems()):
+        with open_data_file(get_old_jsonl_filename(tmp_dirname, resource_name,
+                compress), 'w', compress) as outfile:
+            for resource in resources:
+                outfile.write(json.dumps(resource, sort_keys=True,
+                    default=old_record_to_json))
+                outfile.write('\n')
+    if os.path.isdir(dirname):
+        shutil.rmtree(dirname)
+    os.rename(tmp_dirname, dirname)
+    return dirname
+
+
+class OLDResourceFile(object):
+    """The OLD resources held one per line in the (possibly compressed) JSON
+    Lines file at `path` (see `write_old_data_shards`). They are decoded one
+    at a time, each time that the object is iterated over.
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def __iter__(self):
+        with open_data_file(self.path) as infile:
+            for line in infile:
+                if line.strip():
+                    yield json.loads(line)
+
+    def __nonzero__(self):
+        with open_data_file(self.path) as infile:
+            for line in infile:
+                if line.strip():
+                    return True
+        return False
+
+
+def load_old_data(path):
+    """Return the converted OLD data stored at `path`, which is either a
+    (possibly compressed) JSON file or a directory of JSON Lines files (see
+    `write_old_data_shards`). In the latter case, the resources of each type
+    are an `OLDResourceFile`, which reads them lazily.
+
+    """
+
+    if os.path.isdir(path):
+        old_data = {}
+        for fname in os.listdir(path):
+            if '.jsonl' in fname:
+                old_data[fname.split('.jsonl')[0]] = OLDResourceFile(
+                    os.path.join(path, fname))
+        return old_data
+    with open_data_file(path) as infile:
+        return json.load(infile)
+
+
+def get_lingsync_corpus_summary(collection_counts):
+    """Return a string summarizing the LingSync documents that we downloaded,
+    given the number of documents in each collection.
 
     """
 
-    collections = {}
     summary = [u'\nLingSync documents downloaded.']
-    for r in rows:
-        collection = get_collection_for_lingsync_doc(r.get('doc', {}))
-        if collection is None:
-            collection = u'NOT DATA'
-        collections.setdefault(collection, 0)
-        collections[collection] += 1
-    for c in sorted(collections.keys()):
-        collection_count = collections[c]
+    for c in sorted(collection_counts.keys()):
+        collection_count = collection_counts[c]
         summary.append(u'  %s: %d' % (c, collection_count))
     return u'\n'.join(summary)
 
@@ -963,104 +3189,419 @@ def get_lingsync_corpus_summary(rows):
 def get_summary_of_old_data(old_data):
     """Return a string summarizing the OLD resources that will be created.
 
-    """
+    """
+
+    summary = [u'\nOLD resources to be created.']
+    for resource_name in sorted(old_data.keys()):
+        resource_list = old_data[resource_name]
+        summary.append(u'  %s: %d' % (resource_name, len(resource_list)))
+    return u'\n'.join(summary)
+
+
+################################################################################
+# Conversion warnings
+################################################################################
+
+# Maps the codes of the warnings about specific LingSync documents to the
+# templates of their messages. The conversion functions record each such
+# warning as a `(code, params)` tuple, which is only formatted (see
+# `format_conversion_warning`) when the warnings are reported.
+CONVERSION_WARNINGS = {
+    'unprocessable-comment': u'Unable to process the following comment:'
+        u' \u2018%s\u2019',
+    'unrecognized-attribute': u'\u2018%s\u2019 not a recognized attribute in'
+        u' %s %s',
+    'unrecognized-label': u'\u2018%s\u2019 not a recognized label in fields'
+        u' for %s %s',
+    'datalist-without-title': u'Datalist %s has no title value; the corpus'
+        u' generated from it has "%s" as its name value.',
+    'value-too-long': u'The %s "%s" of %s %s is too long and will be'
+        u' truncated.',
+    'utterance-too-long': u'The utterance "%s" of datum %s is too long (%d'
+        u' chars) and will be truncated.',
+    'unparseable-date': u'Unable to parse %s to an OLD-compatible date in'
+        u' MM/DD/YYYY format for datum %s.',
+    'unrecognized-audio-video-attribute': u'Attribute \u2018%s\u2019 is not'
+        u' recognized in the `audioVideo` value of datum %s',
+    'unrecognized-image-attribute': u'Attribute \u2018%s\u2019 is not'
+        u' recognized in the `images` value of datum %s',
+    'ignored-images': u'Datum %s has an `images` attribute that has been'
+        u' ignored.',
+    'unusable-tags-value': u'Unable to use value \u2018%s\u2019 from'
+        u' datumField tags of datum %s',
+    'tag-object-without-tag': u'Tag object \u2018%s\u2019 from'
+        u' datum.datumTags of datum %s has no `tag` attribute and cannot be'
+        u' used.',
+    'unusable-datum-tag': u'Unable to use tag \u2018%s\u2019 from'
+        u' datum.datumTags of datum %s',
+    'unusable-datum-tags-value': u'Unable to use value \u2018%s\u2019 from'
+        u' datum.datumTags of datum %s',
+    'datum-with-several-consultants': u'Datum %s has more than one consultant'
+        u' listed. Since OLD forms only allow one speaker, we are just going'
+        u' to associate the first speaker to the OLD form created form this'
+        u' LingSync datum. The additional LingSync speakers will still be'
+        u' created as OLD speakers, however, and ALL LingSync consultants will'
+        u' be documented in the form\'s comments field.',
+    'session-without-goal': u'Session %s has no goal so its date elicited is'
+        u' being used for title of the the OLD collection built from it.',
+    'session-without-date-elicited': u'Session %s has no date elicited so its'
+        u' id is being used for the title of the OLD collection built from'
+        u' it.',
+    'goal-too-long': u'The goal "%s" of session %s is too long and will be'
+        u' truncated. However, its non-truncated form is in the collection\'s'
+        u' description field.',
+    'session-with-several-consultants': u'Session %s has more than one'
+        u' consultant listed. Since OLD collections only allow one speaker, we'
+        u' are just going to associate the first speaker to the OLD collection'
+        u' created form this LingSync session. The additional LingSync'
+        u' speakers will still be created as OLD speakers, however, and all'
+        u' OLD collections will list all of the consultants from their source'
+        u' LingSync sessions in their description values.'
+}
+
+
+def format_conversion_warning(warning):
+    """Return the message of the `(code, params)` `warning` (see
+    `CONVERSION_WARNINGS`).
+
+    """
+
+    code, params = warning
+    return CONVERSION_WARNINGS[code] % params
+
+
+def format_warning_locus(locus):
+    """Return the description of the `(old_resource, lingsync_type, doc_id)`
+    `locus` of the warnings about a LingSync document.
+
+    """
+
+    return u'OLD %s resource generated from LingSync %s %s' % locus
+
+
+class ConversionWarnings(dict):
+    """The warnings accrued by a conversion. The general warnings are held,
+    as formatted messages, in a set under the 'general' key, its only key. The
+    warnings about specific LingSync documents are held as `(code, params)`
+    records (see `CONVERSION_WARNINGS`) in `doc_warnings`, which maps the
+    `(old_resource, lingsync_type, doc_id)` locus of each document to its
+    records, and are counted by code in `counts`. If `max_examples` is given,
+    only the first that many warnings of each code are kept; the others are
+    only counted.
+
+    """
+
+    def __init__(self, max_examples=None):
+        dict.__init__(self)
+        self['general'] = set()
+        self.max_examples = max_examples
+        self.doc_warnings = {}
+        self.counts = {}
+        self.kept_counts = {}
+
+    def add_doc_warnings(self, locus, warnings):
+        """Add the `(code, params)` `warnings` about the document at
+        `locus`, ignoring repeated ones.
+
+        """
+
+        kept = list(self.doc_warnings.get(locus, ()))
+        seen = set(kept)
+        for warning in warnings:
+            if warning in seen:
+                continue
+            seen.add(warning)
+            code = warning[0]
+            self.counts[code] = self.counts.get(code, 0) + 1
+            kept_count = self.kept_counts.get(code, 0)
+            if self.max_examples is None or kept_count < self.max_examples:
+                self.kept_counts[code] = kept_count + 1
+                kept.append(warning)
+        if kept:
+            self.doc_warnings[locus] = tuple(kept)
+
+    def count(self):
+        """Return the number of warnings, whether kept or not."""
+
+        return len(self.get('general', ())) + sum(self.counts.itervalues())
+
+
+def print_summary(lingsync_db_name, collection_counts, old_data, warnings):
+    """Print a summary of the OLD data and warnings generated.
+    Also save to disk the summaries of downloaded LingSync data and converted
+    OLD data. We save these so that the --verbose option can work consistently.
+
+    """
+
+    lingsync_summary = get_lingsync_corpus_summary(collection_counts)
+    path = os.path.join(LINGSYNC_DIR, '%s-summary.txt' % lingsync_db_name)
+    with codecs.open(path, mode='w', encoding='utf-8') as f:
+        f.write(lingsync_summary)
+    print lingsync_summary
+
+    old_summary = get_summary_of_old_data(old_data)
+    path = os.path.join(OLD_DIR, '%s-summary.txt' % lingsync_db_name)
+    with codecs.open(path, mode='w', encoding='utf-8') as f:
+        f.write(old_summary)
+    print old_summary
+
+    # The warnings report is written and printed line by line, as it is
+    # formatted.
+    path = os.path.join(OLD_DIR, '%s-conversion-warnings.txt' %
+        lingsync_db_name)
+    with codecs.open(path, mode='w', encoding='utf-8') as f:
+        for index, line in enumerate(iter_conversion_warnings_report(
+                warnings)):
+            if index:
+                f.write(u'\n')
+            f.write(line)
+            print line
+
+
+def iter_conversion_warnings_report(warnings):
+    """Generate the lines of the report of the `ConversionWarnings`
+    `warnings`: the general warnings, then the warnings about each document
+    (in the order of their formatted loci), and, if some warnings were not
+    kept, the number of warnings of each kind that are not listed.
+
+    """
+
+    warnings_count = warnings.count()
+    if not warnings_count:
+        yield u'\nNo warnings.'
+        return
+    if warnings_count == 1:
+        yield u'\n%s%d Conversion Warning.%s' % (ANSI_WARNING, warnings_count,
+            ANSI_ENDC)
+    else:
+        yield u'\n%s%d Conversion Warnings.%s' % (ANSI_WARNING,
+            warnings_count, ANSI_ENDC)
+
+    index = 0
+    if warnings.get('general'):
+        yield u'\n  General warnings:'
+        for warning in warnings['general']:
+            index += 1
+            yield u'    %d. %s' % (index, warning)
+
+    for warning_locus, locus in sorted((format_warning_locus(locus), locus)
+            for locus in warnings.doc_warnings):
+        yield u'\n  Warning(s) for %s:' % warning_locus
+        for warning in sorted(set(format_conversion_warning(warning) for
+                warning in warnings.doc_warnings[locus])):
+            index += 1
+            yield u'    %d. %s' % (index, warning)
+
+    omitted = [(code, count - warnings.kept_counts.get(code, 0), count) for
+        code, count in sorted(warnings.counts.iteritems())
+        if count > warnings.kept_counts.get(code, 0)]
+    if omitted:
+        yield (u'\n  Warnings not listed (at most %d of each kind are'
+            u' listed):' % warnings.max_examples)
+        for code, omitted_count, count in omitted:
+            yield u'    %s: %d of %d' % (code, omitted_count, count)
+
+
+################################################################################
+# Conversion profiling
+################################################################################
+
+class ConversionProfile(object):
+    """The timings of a conversion (see `--profile`). `stages` maps the name
+    of each stage of the conversion, in order, to its `[wall, cpu]` times (in
+    seconds), which are measured between successive calls to `lap`; `reading`
+    holds the part of those times that was spent reading (and classifying)
+    the LingSync documents (see `iter_timed`); `doc_types` maps each LingSync
+    collection to the `[count, wall, cpu]` of the conversion of its documents;
+    and `slowest` is a heap of the `(wall, cpu, collection, doc_id)` timings
+    of the `slowest_count` documents whose conversions took the longest. If
+    `pstats` is `True`, the conversion is also run under cProfile, in
+    `profiler`.
+
+    """
+
+    def __init__(self, slowest_count=PROFILE_SLOWEST_DOCS, pstats=False):
+        self.stages = OrderedDict()
+        self.reading = [0.0, 0.0]
+        self.doc_types = OrderedDict()
+        self.slowest = []
+        self.slowest_count = slowest_count
+        self.profiler = cProfile.Profile() if pstats else None
+        self.convert_workers = 1
+        self.mark = None
+
+    def start(self, convert_workers=1):
+        """Start timing the first stage of the conversion (and profiling it,
+        if `profiler` is set).
+
+        """
+
+        self.convert_workers = convert_workers
+        self.mark = (time.time(), time.clock())
+        if self.profiler:
+            self.profiler.enable()
+
+    def lap(self, stage):
+        """Add the time since the last lap (or the start) to `stage`."""
+
+        wall, cpu = time.time(), time.clock()
+        times = self.stages.setdefault(stage, [0.0, 0.0])
+        times[0] += wall - self.mark[0]
+        times[1] += cpu - self.mark[1]
+        self.mark = (wall, cpu)
+
+    def stop(self, stage):
+        """Add the time since the last lap to `stage` and stop profiling."""
+
+        if self.profiler:
+            self.profiler.disable()
+        self.lap(stage)
+
+    def iter_timed(self, iterable):
+        """Generate the items of `iterable`, adding the time taken to produce
+        each to `reading`.
+
+        """
+
+        iterator = iter(iterable)
+        while True:
+            wall, cpu = time.time(), time.clock()
+            try:
+                item = next(iterator)
+            finally:
+                self.reading[0] += time.time() - wall
+                self.reading[1] += time.clock() - cpu
+            yield item
+
+    def add_doc_time(self, collection, doc_id, wall, cpu):
+        """Add the `wall` and `cpu` times of the conversion of the LingSync
+        document `doc_id` from `collection`.
+
+        """
 
-    summary = [u'\nOLD resources to be created.']
-    for resource_name in sorted(old_data.keys()):
-        resource_list = old_data[resource_name]
-        summary.append(u'  %s: %d' % (resource_name, len(resource_list)))
-    return u'\n'.join(summary)
+        times = self.doc_types.setdefault(collection, [0, 0.0, 0.0])
+        times[0] += 1
+        times[1] += wall
+        times[2] += cpu
+        timing = (wall, cpu, collection, doc_id)
+        if len(self.slowest) < self.slowest_count:
+            heapq.heappush(self.slowest, timing)
+        elif timing > self.slowest[0]:
+            heapq.heapreplace(self.slowest, timing)
 
 
-def print_summary(lingsync_db_name, rows, old_data, warnings):
-    """Print a summary of the OLD data and warnings generated.
-    Also save to disk the summaries of downloaded LingSync data and converted
-    OLD data. We save these so that the --verbose option can work consistently.
+def get_conversion_profile_filename(database_name, extension='txt'):
+    """Return the path of the file (with `extension`) where the profile of
+    the conversion of the LingSync database `database_name` is written.
 
     """
 
-    lingsync_summary = get_lingsync_corpus_summary(rows)
-    path = os.path.join(LINGSYNC_DIR, '%s-summary.txt' % lingsync_db_name)
-    with codecs.open(path, mode='w', encoding='utf-8') as f:
-        f.write(lingsync_summary)
-    print lingsync_summary
+    return os.path.join(OLD_DIR, '%s-profile.%s' % (database_name, extension))
 
-    old_summary = get_summary_of_old_data(old_data)
-    path = os.path.join(OLD_DIR, '%s-summary.txt' % lingsync_db_name)
-    with codecs.open(path, mode='w', encoding='utf-8') as f:
-        f.write(old_summary)
-    print old_summary
 
-    warnings_text = []
-    if warnings:
+def iter_conversion_profile_report(profile, lingsync_db_name):
+    """Generate the lines of the report of the `ConversionProfile` `profile`
+    of the conversion of `lingsync_db_name`: the times of the stages of the
+    conversion, of the conversion of each type of LingSync document, of the
+    slowest documents, and, if it was run under cProfile, of the functions
+    that took the longest, cumulatively.
 
-        warnings_count = 0
-        for warning_locus, warnings_set in warnings.iteritems():
-            warnings_count += len(warnings_set)
+    """
 
-        if warnings_count == 1:
-            warnings_text.append(u'\n%s%d Conversion Warning.%s' % (ANSI_WARNING,
-                warnings_count, ANSI_ENDC))
-        else:
-            warnings_text.append(u'\n%s%d Conversion Warnings.%s' % (
-                ANSI_WARNING, warnings_count, ANSI_ENDC))
-
-        index = 0
-        if warnings.get('general'):
-            warnings_text.append(u'\n  General warnings:')
-            for warning in warnings['general']:
-                index += 1
-                warnings_text.append(u'    %d. %s' % (index, warning))
-
-        for warning_locus in sorted(warnings.keys()):
-            if warning_locus != 'general':
-                warnings_set = warnings[warning_locus]
-                warnings_text.append(u'\n  Warning(s) for %s:' % warning_locus)
-                for warning in sorted(warnings_set):
-                    index += 1
-                    warnings_text.append(u'    %d. %s' % (index, warning))
+    yield u'\nConversion profile of %s.' % lingsync_db_name
+    yield u'\n  %-44s %10s %10s' % (u'Stage', u'Wall (s)', u'CPU (s)')
+    total_wall = total_cpu = 0.0
+    for stage, (wall, cpu) in profile.stages.iteritems():
+        total_wall += wall
+        total_cpu += cpu
+        yield u'  %-44s %10.3f %10.3f' % (stage, wall, cpu)
+        if stage == PROFILE_CONVERT_STAGE and profile.reading[0]:
+            yield u'    %-42s %10.3f %10.3f' % (
+                u'(of which reading the documents)', profile.reading[0],
+                profile.reading[1])
+    yield u'  %-44s %10.3f %10.3f' % (u'Total', total_wall, total_cpu)
+    if profile.convert_workers > 1:
+        yield (u'  The documents were converted by %d processes; the CPU'
+            u' times of the stages are those of the main process only.' %
+            profile.convert_workers)
+
+    if profile.doc_types:
+        yield u'\n  %-20s %10s %10s %10s %12s' % (u'Document type',
+            u'Documents', u'Wall (s)', u'CPU (s)', u'ms/document')
+        for collection, (count, wall, cpu) in profile.doc_types.iteritems():
+            yield u'  %-20s %10d %10.3f %10.3f %12.3f' % (collection, count,
+                wall, cpu, 1000.0 * wall / count)
     else:
-        warnings_text.append(u'\nNo warnings.')
+        yield u'\n  No LingSync documents were converted.'
+
+    if profile.slowest:
+        yield u'\n  The %d slowest LingSync documents to convert:' % len(
+            profile.slowest)
+        for index, (wall, cpu, collection, doc_id) in enumerate(
+                sorted(profile.slowest, reverse=True)):
+            yield u'    %d. %s %s: %.3f ms (CPU %.3f ms)' % (index + 1,
+                collection, doc_id, 1000.0 * wall, 1000.0 * cpu)
+
+    if profile.profiler:
+        stream = StringIO.StringIO()
+        stats = pstats.Stats(profile.profiler, stream=stream)
+        stats.sort_stats('cumulative').print_stats(PROFILE_PSTATS_LINES)
+        yield u'\n  cProfile statistics (the full statistics are in %s):' % (
+            get_conversion_profile_filename(lingsync_db_name, 'pstats'),)
+        for line in stream.getvalue().splitlines():
+            yield u'  %s' % line.decode('utf8', 'replace').rstrip()
+
+
+def write_conversion_profile(profile, lingsync_db_name):
+    """Write the report of the `ConversionProfile` `profile` of the
+    conversion of `lingsync_db_name` (see `iter_conversion_profile_report`)
+    next to the summary of the OLD data and print it, and dump its cProfile
+    statistics, if any.
 
-    warnings_text = u'\n'.join(warnings_text)
-    path = os.path.join(OLD_DIR, '%s-conversion-warnings.txt' %
-        lingsync_db_name)
+    """
+
+    if profile.profiler:
+        profile.profiler.dump_stats(get_conversion_profile_filename(
+            lingsync_db_name, 'pstats'))
+    path = get_conversion_profile_filename(lingsync_db_name)
     with codecs.open(path, mode='w', encoding='utf-8') as f:
-        f.write(warnings_text)
-    print warnings_text
+        for index, line in enumerate(iter_conversion_profile_report(profile,
+                lingsync_db_name)):
+            if index:
+                f.write(u'\n')
+            f.write(line)
+            print line
+    print 'The conversion profile was written to %s.' % path
 
 
-def update_state(old_object, old_data, warnings):
+def update_state(old_object, old_data, warnings, index=None):
     """Update `old_data` and `warnings` with the contents of `old_object`,
     where `old_object` is the OLD resource-as-object/dict that was derived from
     a LingSync document.
 
+    If `index` is given, it is used (and kept up to date) as a hash index of
+    the resources in `old_data`; see `add_old_resource`. The same `index` must
+    be passed to every call that updates the same `old_data`.
+
     """
 
     # Add our primary "old_resource" `old_data`
     if old_object['old_resource']:
         key = old_object['old_resource']
         val = old_object['old_value']
-        old_data.setdefault(key, [])
-        if val not in old_data[key]:
-            old_data[key].append(val)
+        add_old_resource(old_data, key, val, index)
 
     # Add any auxiliary resources to `old_data`
     if len(old_object['old_auxiliary_resources']) > 0:
         for rname, rlist in old_object['old_auxiliary_resources'].items():
-            existing = old_data.setdefault(rname, [])
             for resource in rlist:
-                if resource not in existing:
-                    existing.append(resource)
+                add_old_resource(old_data, rname, resource, index)
 
-    # Add any gathered warnings to accrued warnings
+    # Add any gathered warnings to accrued warnings (a `ConversionWarnings`)
     if old_object['warnings']['docspecific']:
-        warnings_key = u'OLD %s resource generated from LingSync %s %s' % (
-            old_object['old_resource'], old_object['lingsync_type'],
-            old_object['originaldoc']['_id'])
-        warnings.setdefault(warnings_key, set())
-        for warning in old_object['warnings']['docspecific']:
-            warnings[warnings_key].add(warning)
+        warnings.add_doc_warnings((old_object['old_resource'],
+            old_object['lingsync_type'], old_object['originaldoc']['_id']),
+            old_object['warnings']['docspecific'])
     if old_object['warnings']['general']:
         warnings.setdefault('general', set())
         for warning in old_object['warnings']['general']:
@@ -1069,6 +3610,50 @@ def update_state(old_object, old_data, warnings):
     return (old_data, warnings)
 
 
+def add_old_resource(old_data, resource_name, resource, index=None):
+    """Append `resource` to the `resource_name` list of `old_data`, unless an
+    equal resource is already there.
+
+    Without an `index`, this means comparing `resource` to every resource in
+    the list. With one, `resource` is only compared to the resources that
+    have the same key (see `get_old_resource_index_key`), which `index` maps
+    to, per resource name, so the cost no longer grows with the size of the
+    list.
+
+    """
+
+    existing = old_data.setdefault(resource_name, [])
+    if index is None:
+        if resource not in existing:
+            existing.append(resource)
+        return
+    bucket = index.setdefault(resource_name, {}).setdefault(
+        get_old_resource_index_key(resource_name, resource), [])
+    if resource not in bucket:
+        bucket.append(resource)
+        existing.append(resource)
+
+
+def get_old_resource_index_key(resource_name, resource):
+    """Return the key under which `resource` (an OLD resource dict in the
+    `resource_name` list of `old_data`) is indexed, i.e., the values of its
+    fields in `OLD_RESOURCE_INDEX_FIELDS`. Equal resources always have equal
+    keys. Resources of other types, or whose key is unhashable, all share
+    the key `None`.
+
+    """
+
+    fields = OLD_RESOURCE_INDEX_FIELDS.get(resource_name)
+    if fields is None:
+        return None
+    key = tuple(resource.get(field) for field in fields)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
 def timestamp2human(timestamp):
     """Return a timestamp in a "human-readable" format.
 
@@ -1119,9 +3704,8 @@ def process_lingsync_comments_val(ls_comments, warnings):
                 # An comment whose text value is just an empty string is just
                 # ignored.
                 if comment_obj.get('text').strip() != u'':
-                    warnings['docspecific'].append(u'Unable to process the'
-                        ' following comment: \u2018%s\u2019' % (
-                        unicode(comment_obj)))
+                    warnings['docspecific'].append(('unprocessable-comment',
+                        (unicode(comment_obj),)))
     else:
         if (type(ls_comments) is type('')) or (type(ls_comments) is type(u'')):
             if ls_comments.strip():
@@ -1130,6 +3714,26 @@ def process_lingsync_comments_val(ls_comments, warnings):
     return (comments_to_return, warnings)
 
 
+# These are the LingSync datalist attrs that we know how to deal with for
+# to-OLD conversion.
+LINGSYNC_DATALIST_ATTRS = frozenset([
+    '_id', # u'0d69a355b63fa165273111aa739802c1',
+    '_rev', # u'1-285126da331e5b2c7df7552599de2960',
+    'audioVideo', # [],
+    'collection', # u'datalists',
+    'comments', # [],
+    'dateCreated', # u'"2014-11-10T02:29:25.168Z"',
+    'dateModified', # u'"2014-11-10T02:29:25.309Z"',
+    'datumIds', # [u'a8b939f86a76109b121100e944b6a758', ...],
+    'description', # u'This is the result of searching for : morphemes:#nit- In Blackfoot on Sun Nov 09 2014 18:29:24 GMT-0800 (PST)',
+    'pouchname',
+    'timestamp', # 1415586565309,
+    'title', # u'All Data as of Sun Nov 09 2014 18:29:25 GMT-0800 (PST)'}
+    'trashed', # ignoring this attribute; only value I've seen is "deleted1428640331225" ...
+    'dbname' # Same as pouchname above, it's the name of the LingSync corpus.
+])
+
+
 def process_lingsync_datalist(doc):
     """Convert a LingSync datalist document to an OLD corpus dict.
 
@@ -1148,35 +3752,14 @@ def process_lingsync_datalist(doc):
 
     auxiliary_resources = {}
 
-    # These are the LingSync datalist attrs that we know how to deal with for
-    # to-OLD conversion.
-    known_attrs = [
-        '_id', # u'0d69a355b63fa165273111aa739802c1',
-        '_rev', # u'1-285126da331e5b2c7df7552599de2960',
-        'audioVideo', # [],
-        'collection', # u'datalists',
-        'comments', # [],
-        'dateCreated', # u'"2014-11-10T02:29:25.168Z"',
-        'dateModified', # u'"2014-11-10T02:29:25.309Z"',
-        'datumIds', # [u'a8b939f86a76109b121100e944b6a758', ...],
-        'description', # u'This is the result of searching for : morphemes:#nit- In Blackfoot on Sun Nov 09 2014 18:29:24 GMT-0800 (PST)',
-        'pouchname',
-        'timestamp', # 1415586565309,
-        'title', # u'All Data as of Sun Nov 09 2014 18:29:25 GMT-0800 (PST)'}
-        'trashed', # ignoring this attribute; only value I've seen is "deleted1428640331225" ...
-        'dbname' # Same as pouchname above, it's the name of the LingSync corpus.
-    ]
-
     # Add warnings to this.
     warnings = {
         'general': [],
         'docspecific': []
     }
 
-    for k in doc:
-        if k not in known_attrs:
-            warnings['docspecific'].append(u'\u2018%s\u2019 not a recognized'
-                u' attribute in datalist %s' % (k, datalist_id))
+    add_unrecognized_attribute_warnings(doc, u'datalist',
+        LINGSYNC_DATALIST_ATTRS, datalist_id, warnings)
 
     # This will be our return value.
     oldobj = {
@@ -1189,7 +3772,7 @@ def process_lingsync_datalist(doc):
     }
 
     # This dict will be used to create the OLD corpus.
-    old_corpus = copy.deepcopy(old_schemata['corpus'])
+    old_corpus = new_old_resource('corpus')
 
     # Description.
     old_description = []
@@ -1231,12 +3814,12 @@ def process_lingsync_datalist(doc):
     ls_title = doc.get('title')
     if not ls_title:
         old_name = u'Corpus from LingSync datalist %s' % datalist_id
-        warnings['docspecific'].append(u'Datalist %s has no title value; the corpus generated'
-            ' from it has "%s" as its name value.' % (datalist_id, old_name))
+        warnings['docspecific'].append(('datalist-without-title',
+            (datalist_id, old_name)))
     elif len(ls_title) > 255:
         title_too_long = True
-        warnings['docspecific'].append('The title "%s" of datalist %s is too long and will be'
-            ' truncated.' % (ls_title, datalist_id))
+        warnings['docspecific'].append(('value-too-long',
+            (u'title', ls_title, u'datalist', datalist_id)))
         old_name = ls_title[:255]
     else:
         old_name = ls_title
@@ -1262,6 +3845,35 @@ def my_strip(thing):
         return thing
 
 
+# These are the LingSync user attrs that we know how to deal with for to-OLD
+# conversion.
+LINGSYNC_USER_ATTRS = frozenset([
+    '_id',
+    '_rev',
+    'authUrl',
+    'collection',
+    'gravatar',
+    'id',
+    'username',
+    'firstname',
+    'lastname',
+    'description',
+    'markAsNeedsToBeSaved',
+    'researchInterest',
+    'email',
+    'subtitle',
+    'affiliation',
+    # Ignoring the following:
+    'api',
+    'fieldDBtype',
+    'version',
+    # New from weisskircherisch. Ignored.
+    'appbrand',
+    'corpora',
+    'dateCreated'
+])
+
+
 def process_lingsync_user(doc):
     """Convert a LingSync user document to an OLD user dict.
 
@@ -1274,44 +3886,14 @@ def process_lingsync_user(doc):
 
     auxiliary_resources = {}
 
-    # These are the LingSync user attrs that we know how to deal with for
-    # to-OLD conversion.
-    known_attrs = [
-        '_id',
-        '_rev',
-        'authUrl',
-        'collection',
-        'gravatar',
-        'id',
-        'username',
-        'firstname',
-        'lastname',
-        'description',
-        'markAsNeedsToBeSaved',
-        'researchInterest',
-        'email',
-        'subtitle',
-        'affiliation',
-        # Ignoring the following:
-        'api',
-        'fieldDBtype',
-        'version',
-        # New from weisskircherisch. Ignored.
-        'appbrand',
-        'corpora',
-        'dateCreated'
-    ]
-
     # Add warnings to this.
     warnings = {
         'general': [],
         'docspecific': []
     }
 
-    for k in doc:
-        if k not in known_attrs:
-            warnings['docspecific'].append(u'\u2018%s\u2019 not a recognized'
-                u' attribute in user %s' % (k, user_id))
+    add_unrecognized_attribute_warnings(doc, u'user', LINGSYNC_USER_ATTRS,
+        user_id, warnings)
 
     # This will be our return value.
     oldobj = {
@@ -1324,7 +3906,7 @@ def process_lingsync_user(doc):
     }
 
     # This dict will be used to create the OLD user.
-    old_user = copy.deepcopy(old_schemata['user'])
+    old_user = new_old_resource('user')
 
     # Attested value: "lingsync". Ignoring.
     ls_appbrand = doc.get('appbrand')
@@ -1400,6 +3982,590 @@ def process_lingsync_user(doc):
     return oldobj
 
 
+def get_lingsync_session_values(ls_session):
+    """Return a dict of the values that a LingSync datum derives from the
+    LingSync session `ls_session` embedded in it: the raw
+    `date_session_elicited`, its MM/DD/YYYY `date_elicited` (`None` if it
+    cannot be parsed) and the OLD `speakers` (which must be copied before
+    they are used). These are computed only once per session (i.e., for all
+    of the datums that embed the same `_id` and `_rev`) and cached in
+    `SESSION_VALUES_CACHE`.
+
+    """
+
+    key = (ls_session.get('_id'), ls_session.get('_rev'))
+    try:
+        cached_session, session_values = SESSION_VALUES_CACHE[key]
+    except (KeyError, TypeError):
+        pass
+    else:
+        if cached_session is ls_session or cached_session == ls_session:
+            return session_values
+    session_fields = ls_session.get('sessionFields', [])
+    field_values, _ = get_lingsync_field_values(session_fields,
+        LINGSYNC_SESSION_FIELD_SPECS)
+    date_session_elicited = field_values.get('dateElicited')
+    session_values = {
+        'date_session_elicited': date_session_elicited,
+        'date_elicited': None,
+        'speakers': get_lingsync_session_speakers(ls_session,
+            field_values if session_fields else None)
+    }
+    if date_session_elicited:
+        session_values['date_elicited'] = parse_lingsync_date(
+            date_session_elicited)
+    try:
+        if len(SESSION_VALUES_CACHE) >= SESSION_VALUES_CACHE_SIZE:
+            SESSION_VALUES_CACHE.clear()
+        SESSION_VALUES_CACHE[key] = (ls_session, session_values)
+    except TypeError:
+        pass
+    return session_values
+
+
+def get_lingsync_session_speakers(ls_session, field_values=None):
+    """Return the list of OLD speakers that the datums of the LingSync session
+    `ls_session` are assigned, from its consultants (and dialect) fields.
+    Pass the `field_values` of its `sessionFields` (see
+    `get_lingsync_field_values`) if they have already been read.
+    WARNING: it's not practical to try to perfectly parse free-form
+    consultants values.
+
+    """
+
+    speakers = []
+    if field_values is None:
+        session_fields = ls_session.get('sessionFields')
+        if not session_fields:
+            session_fields = ls_session.get('fields', [])
+        field_values, _ = get_lingsync_field_values(session_fields,
+            LINGSYNC_SESSION_FIELD_SPECS)
+    consultants = field_values.get('consultants')
+    dialect = field_values.get('dialect')
+    if not dialect:
+        dialect = ls_session.get('dialect')
+    if consultants:
+        consultants_list = consultants.split()
+        # If consultants is two capitalized words, e.g., Dave Smith, then
+        # we assume we have a first name/ last name situation.
+        if len(consultants_list) == 2 and \
+        consultants_list[0] == consultants_list[0].lower().capitalize() and \
+        consultants_list[1] == consultants_list[1].lower().capitalize():
+            old_speaker = new_old_resource('speaker')
+            old_speaker['first_name'] = consultants_list[0]
+            old_speaker['last_name'] = consultants_list[1]
+            speakers.append(old_speaker)
+        # Otherwise, we assume we have an initials situation (e.g., DS).
+        else:
+            for consultant in consultants_list:
+                old_speaker = new_old_resource('speaker')
+                # If consultant is all-caps, we assume it is initials, where the
+                # first char is the first name initial and the remaining char(s)
+                # is/are the last name initial(s).
+                if consultant.upper() == consultant:
+                    old_speaker['first_name'] = consultant[0]
+                    old_speaker['last_name'] = consultant[1:]
+                else:
+                    old_speaker['first_name'] = consultant
+                    old_speaker['last_name'] = consultant
+                if dialect:
+                    old_speaker['dialect'] = dialect
+                speakers.append(old_speaker)
+    return speakers
+
+
+def parse_lingsync_date(date_string):
+    """Return the LingSync date `date_string` as an OLD-compatible MM/DD/YYYY
+    string, or `None` if it cannot be parsed. At present, we are only
+    recognizing date strings in YYYY-MM-DD and MM/DD/YYYY formats.
+
+    """
+
+    try:
+        datetime_inst = datetime.datetime.strptime(date_string, '%Y-%m-%d')
+    except Exception, e:
+        try:
+            datetime_inst = datetime.datetime.strptime(date_string, '%m/%d/%Y')
+        except Exception, e:
+            return None
+    return u'%s/%s/%s' % (str(datetime_inst.month).zfill(2),
+        str(datetime_inst.day).zfill(2), str(datetime_inst.year))
+
+
+################################################################################
+# LingSync datum and session field specifications
+################################################################################
+
+# The LingSync datum and session fields that we know how to deal with for
+# to-OLD conversion are declared in the tables below, one row per field label,
+# and compiled (see `compile_lingsync_field_specs`) into a dict from label to
+# `LingSyncFieldSpec` and a dict from each stage of the conversion to the
+# specs of the fields that are handled at it. The values of a document's
+# fields are then all read in a single pass over them (see
+# `get_lingsync_field_values`). A spec's attributes are:
+# - `label`: the label of the field.
+# - `stage`: `None` if the value is used by the code of the conversion
+#   function itself; 'ignore' if the field is known but its value is ignored;
+#   otherwise, the stage of the conversion at which `handler` is called with
+#   the (non-empty) value (see `apply_lingsync_field_handlers`).
+# - `handler`: a function of the spec, the value, and the lists of comments
+#   and tags of the OLD resource being built.
+# - `target`: the OLD attribute (or 'comments' or 'tags') that the value goes
+#   to, if any.
+# - `max_length`: the maximum length of the `target` attribute, if any.
+# - `text`: the format string that `handler` renders the value with or, for
+#   values that may be truncated, the name of the value in warnings.
+LingSyncFieldSpec = namedtuple('LingSyncFieldSpec',
+    'label stage handler target max_length text')
+
+
+def add_field_comment(spec, value, comments, tags):
+    """Add the value of a field (as a string, ending in a period), formatted
+    by `spec.text`, to `comments`.
+
+    """
+
+    if not isinstance(value, basestring):
+        value = unicode(value)
+    comments.append(spec.text % punctuate_period_safe(value))
+
+
+def add_stripped_field_comment(spec, value, comments, tags):
+    """Add the value of a field, stripped of surrounding whitespace and
+    formatted by `spec.text`, to `comments`.
+
+    """
+
+    add_field_comment(spec, value.strip(), comments, tags)
+
+
+def add_field_tag(spec, value, comments, tags):
+    """Add a tag named by the value of a field, formatted by `spec.text`, to
+    `tags`.
+
+    """
+
+    tags.append({
+        'name': spec.text % value,
+        'description': u''
+    })
+
+
+def report_field_value(spec, value, comments, tags):
+    """Print the value of a field that we have never seen valuated (and so do
+    not migrate), formatted by `spec.text`.
+
+    """
+
+    print spec.text % (value,)
+
+
+def report_related_data(spec, value, comments, tags):
+    """Report the value of a datum's relatedData field, unless it is the empty
+    related data object.
+
+    """
+
+    if (isinstance(value, dict) and
+            isinstance(value.get('relatedData'), list) and
+            len(value['relatedData']) == 0):
+        return
+    report_field_value(spec, value, comments, tags)
+
+
+def report_session_source(spec, value, comments, tags):
+    """Report the value of a session's source field, unless it is one of the
+    placeholder values.
+
+    """
+
+    if value not in ('XY', 'Unknown'):
+        report_field_value(spec, value, comments, tags)
+
+
+# The LingSync datum fields: (label, stage, handler, target, max_length, text).
+LINGSYNC_DATUM_FIELDS = (
+
+    # Added to the comments field, when content-ful, before anything else.
+    ('itemNumber', 'head', add_field_comment, 'comments', None,
+        u'Item number: %s'),
+    ('context', 'head', add_field_comment, 'comments', None,
+        u'Context: %s'),
+    # The `links` field appears to consistently be a string of comma-separated
+    # expressions of the form "similarTo:4f868ba9a79e57479ddbe4f62ae671c8"
+    # where the string after the colon is a datum id. `create_old_forms`
+    # transforms these datum ids into form ids, once the forms have been
+    # created.
+    ('links', 'head', add_field_comment, 'comments', None,
+        u'Links: %s'),
+    ('documentation', 'head', add_stripped_field_comment, 'comments', None,
+        u'Documentation: \u2018%s\u2019'),
+
+    # New fields from weisskircherisch-firstcorpus, handled after the phonetic
+    # transcription.
+    # german is an (assumedly Standard German) rendering/translation of the
+    # Transylvanian Saxon utterance.
+    ('german', 'weisskircherisch', add_field_comment, 'comments', None,
+        u'German: \u2018%s\u2019'),
+    # rudi and ursula are, like german, alternative transcriptions of some
+    # kind.
+    ('rudi', 'weisskircherisch', add_field_comment, 'comments', None,
+        u'Rudi: \u2018%s\u2019'),
+    ('ursula', 'weisskircherisch', add_field_comment, 'comments', None,
+        u'Ursula: \u2018%s\u2019'),
+    ('audioFileName', 'weisskircherisch', report_field_value, None, None,
+        u'Datum has ls_audioFileName:  %s'),
+    # Assumedly the time in an audio/video file that the utterance comes from.
+    # Format is (hh:)mm:ss.ms, e.g., "49:37.9".
+    ('begintimehh:mm:ssms', 'weisskircherisch', add_field_comment, 'comments',
+        None, u'Begin time (hh:mm:ss.ms): %s'),
+    ('begintimehhMmSsms', 'weisskircherisch', report_field_value, None, None,
+        u'Datum has ls_begintimehhMmSsms:  %s'),
+    ('endTime', 'weisskircherisch', report_field_value, None, None,
+        u'Datum has ls_endTime:  %s'),
+    ('fields', 'weisskircherisch', report_field_value, None, None,
+        u'Datum has ls_fields:  %s'),
+    ('genDach', 'weisskircherisch', report_field_value, None, None,
+        u'Datum has ls_genDach:  %s'),
+    # Only one token attested ("spoken").
+    ('modality', 'weisskircherisch', add_field_tag, 'tags', None,
+        u'modality: %s'),
+    ('relatedData', 'weisskircherisch', report_related_data, None, None,
+        u'Datum has ls_relatedData:  %s'),
+    ('startTime', 'weisskircherisch', report_field_value, None, None,
+        u'Datum has ls_startTime:  %s'),
+    ('tier', 'weisskircherisch', report_field_value, None, None,
+        u'Datum has ls_tier:  %s'),
+
+    # Chapter and verse. Only used in gina-inuktitut, a Genesis translation.
+    # Added to the comments field after the translations.
+    ('chapter', 'chapter', add_field_comment, 'comments', None,
+        u'Chapter %s'),
+    ('verse', 'chapter', add_field_comment, 'comments', None,
+        u'Verse %s'),
+
+    # Non-standard but attested. Added to the comments field after the
+    # LingSync comments.
+    ('notes', 'notes', add_field_comment, 'comments', None,
+        u'LingSync notes: %s'),
+
+    # The values of these fields are used by `process_lingsync_datum` itself.
+    ('judgement', None, None, 'grammaticality', None, None),
+    # This trumps the standard "judgement" field.
+    ('judgment', None, None, 'grammaticality', None, None),
+    ('utterance', None, None, 'transcription', 510, None),
+    ('morphemes', None, None, 'morpheme_break', 510, u'morphemes'),
+    # This trumps the standard "morphemes" field.
+    ('morpheme', None, None, 'morpheme_break', 510, u'morphemes'),
+    # gina-inuktitut uses this and it is sometimes different from 'morphemes'?
+    ('allomorphs', None, None, 'comments', None, None),
+    # Non-standard but attested.
+    ('phonetic', None, None, 'phonetic_transcription', 510,
+        u'phonetic value'),
+    ('gloss', None, None, 'morpheme_gloss', 510, u'gloss'),
+    ('syntacticTreeLatex', None, None, 'syntax', 1023,
+        u'syntacticTreeLatex'),
+    ('translation', None, None, 'translations', None, None),
+    ('contextTranslation', None, None, 'translations', None, None),
+    ('another_translation', None, None, 'translations', None, None), # in gina-inuktitut
+    ('context_translation', None, None, 'translations', None, None), # in gina-inuktitut
+    ('validationStatus', None, None, 'status', None, None),
+    ('tags', None, None, 'tags', None, None),
+    ('syntacticCategory', None, None, 'comments', None, None),
+    # Can contain a dict in its 'user' attribute.
+    ('enteredByUser', None, None, 'elicitor', None, None),
+    # Can contain an array in its 'users' attribute.
+    ('modifiedByUser', None, None, 'comments', None, None),
+    ('comments', None, None, 'comments', None, None),
+    ('speaker', None, None, 'speaker', None, None),
+    # Name of .wav audio file, but don't know how to get URL (TODO)
+    ('audio', None, None, None, None, None),
+    # Name of .wav audio file, but don't know how to get URL (TODO)
+    ('contextFile', None, None, None, None, None),
+    # Just a string of digits, e.g., '1' or '15'.
+    ('consultant', None, None, None, None, None),
+
+    # Strangely, there can be multiple fields with this label in a
+    # datumFields array ...
+    ('markAsNeedsToBeSaved', 'ignore', None, None, None, None),
+    # It can evaluate to `true`, and may be relevant to `validationStatus` and
+    # the OLD form's `status`, but I think it's safe to ignore it.
+    ('checked', 'ignore', None, None, None, None),
+    # These fields appear to always be empty ...
+    ('housekeeping', 'ignore', None, None, None, None),
+    ('orthography', 'ignore', None, None, None, None),
+    ('spanish', 'ignore', None, None, None, None),
+    ('consultants', 'ignore', None, None, None, None),
+    ('dataelicited', 'ignore', None, None, None, None),
+    ('dialect', 'ignore', None, None, None, None),
+    ('language', 'ignore', None, None, None, None),
+    # Never has a real value; only values ever seen are sequences of question
+    # marks.
+    ('undefined', 'ignore', None, None, None, None),
+    # Timestamp.
+    ('dateSEntered', 'ignore', None, None, None, None)
+)
+
+# The attributes of a LingSync datum that we know how to deal with.
+LINGSYNC_DATUM_ATTRS = frozenset([
+    '_id', # u'c297e5ceecafe6b340876e07ac477736',
+    '_rev', # u'2-63e6d77f0e9f834000b77ff59fa7abd2',
+    'audioVideo', # [],
+    'collection', # u'datums',
+    'comments', # [],
+    'dateEntered', # u'2015-04-01T16:50:30.852Z',
+    'dateModified', # u'2015-04-01T16:50:30.852Z',
+    'datumFields', # []
+    'fields', # [] Sometimes used instead of 'datumFields'
+    'datumTags', # [],
+    'images', # [],
+    'jsonType', # u'Datum',
+    'pouchname',
+    'session', # {...} redundantly stores the session of each datum ...
+    'timestamp', # 1427907030852,
+    'trashed', # u'deleted'
+    'api', # Ignorable
+    'dateCreated', # Unix timestamp; Is this different value from `dateEntered`? Doesn't really matter for this migration script.
+    'dbname', # Ignorable
+    'fieldDBtype', # Ignorable
+    'version', # Ignorable
+
+    'datumStates', # Ignoring this. It's only found in gina-inuktitut.
+
+    'lastModifiedBy', # This is ignored because you can't write modifiers to OLD forms, only the OLD does that, server-side.
+    'enteredByUser', # This attribute appears to be redundant, given the enteredByUser-labelled field (see above). Ignoring.
+    '_attachments', # May contain references to audio files, but I don't know how to get their URLs. TODO.
+    'attachmentInfo' # Ignorable: never has a real value.
+])
+
+# The LingSync session fields: (label, stage, handler, target, max_length,
+# text).
+LINGSYNC_SESSION_FIELDS = (
+
+    # These idiosyncratic session fields (the first four are new from
+    # weisskircherisch) have never been observed with values, so their values
+    # are only reported.
+    ('device', 'report', report_field_value, None, None,
+        u'Session has device: %s'),
+    ('location', 'report', report_field_value, None, None,
+        u'Session has location: %s'),
+    ('register', 'report', report_field_value, None, None,
+        u'Session has register: %s'),
+    ('source', 'report', report_session_source, None, None,
+        u'Session has source: %s'),
+    ('annotationDate', 'report', report_field_value, None, None,
+        u'Session has annotationDate: %s'),
+    ('annotationsFundedBy', 'report', report_field_value, None, None,
+        u'Session has annotationsFundedBy: %s'),
+    ('attributionInfo', 'report', report_field_value, None, None,
+        u'Session has ls_attributionInfo: %s'),
+    ('collection', 'report', report_field_value, None, None,
+        u'Session has ls_collection: %s'),
+    ('originalTranscriber', 'report', report_field_value, None, None,
+        u'Session has ls_originalTranscriber: %s'),
+    ('publisher', 'report', report_field_value, None, None,
+        u'Session has ls_publisher: %s'),
+
+    # The values of these fields are used by `process_lingsync_session`
+    # itself.
+    ('goal', None, None, 'title', 255, None),
+    ('consultants', None, None, 'speaker', None, None),
+    ('dialect', None, None, 'description', None, None),
+    ('language', None, None, 'description', None, None),
+    ('dateElicited', None, None, 'date_elicited', None, None),
+    ('user', None, None, 'elicitor', None, None),
+
+    ('dateSEntered', 'ignore', None, None, None, None),
+    # It seems to consistently be an empty string.
+    ('participants', 'ignore', None, None, None, None),
+    # It seems to consistently be an empty string.
+    ('DateSessionEntered', 'ignore', None, None, None, None),
+    # It seems to be the same date as the date_created datetime, just in a
+    # different format.
+    ('dateSessionEntered', 'ignore', None, None, None, None)
+)
+
+# The attributes of a LingSync session that we know how to deal with.
+LINGSYNC_SESSION_ATTRS = frozenset([
+    '_id',
+    '_rev',
+    'collection',
+    'comments',
+    'dateCreated',
+    'dateModified',
+    'lastModifiedBy',
+    'pouchname',
+    'sessionFields',
+    'title', # This attr occurs in some sessions. I am ignoring this attr in sessions; I think it holds 'Change this session'.
+    'timestamp', # This attr also occurs only sometimes. I am ignoring it. It appears to be the same value as the dateModified.
+    'api', # Ignorable
+    'dbname', # Ignorable
+    'fieldDBtype', # Ignorable
+    'fields', # Ignorable
+    'modifiedByUser', # NOTE: this should maybe be migrated, but its `value` value is just a string of usernames and its `json.users` value is an array of objects whose only relevant attribute appears to be `username`, which is redundant with the aforementioned `value`. No modification timestamp for each modification.
+    'version', # Ignorable
+    'dialect', # Note: this attr appears to be valuated when its corresponding field is not, and vice versa.
+    'language', # Note: this attr appears to be valuated when its corresponding field is not, and vice versa.
+    'trashed', # May be set to 'deleted'. Note: we are ignoring deleted sessions and will not create and then delete OLD corpora to simulate them (as we do with forms).
+    'trashedReason' # Optional text describing why the session was deleted.
+])
+
+
+def compile_lingsync_field_specs(fields):
+    """Compile `fields`, a table of LingSync field rows (e.g.,
+    `LINGSYNC_DATUM_FIELDS`), into a dict that maps each label to its
+    `LingSyncFieldSpec` and a dict that maps each stage of the conversion to
+    the tuple of the specs of the fields with handlers at that stage, in table
+    order.
+
+    """
+
+    specs = {}
+    stages = {}
+    for row in fields:
+        spec = LingSyncFieldSpec(*row)
+        assert spec.label not in specs, 'Duplicate field %s' % spec.label
+        specs[spec.label] = spec
+        if spec.handler:
+            stages.setdefault(spec.stage, []).append(spec)
+    return specs, dict((stage, tuple(stage_specs)) for stage, stage_specs
+        in stages.iteritems())
+
+
+LINGSYNC_DATUM_FIELD_SPECS, LINGSYNC_DATUM_FIELD_STAGES = \
+    compile_lingsync_field_specs(LINGSYNC_DATUM_FIELDS)
+LINGSYNC_SESSION_FIELD_SPECS, LINGSYNC_SESSION_FIELD_STAGES = \
+    compile_lingsync_field_specs(LINGSYNC_SESSION_FIELDS)
+
+
+def add_unrecognized_attribute_warnings(doc, lingsync_type, known_attrs,
+        doc_id, warnings):
+    """Add a warning to `warnings` for each attribute of `doc`, a LingSync
+    document of type `lingsync_type` (e.g., u'datum') with id `doc_id`, that is
+    not in `known_attrs`. Since most documents of a corpus share one of a few
+    shapes (the same keys, in the same order), the unrecognized attributes
+    are cached by shape.
+
+    """
+
+    shape = (lingsync_type, tuple(doc))
+    try:
+        unrecognized = DOC_ATTRS_CACHE[shape]
+    except KeyError:
+        unrecognized = tuple(k for k in shape[1] if k not in known_attrs)
+        if len(DOC_ATTRS_CACHE) >= DOC_SHAPE_CACHE_SIZE:
+            DOC_ATTRS_CACHE.clear()
+        DOC_ATTRS_CACHE[shape] = unrecognized
+    for k in unrecognized:
+        warnings['docspecific'].append(('unrecognized-attribute',
+            (k, lingsync_type, doc_id)))
+
+
+def compile_lingsync_field_layout(labels, specs):
+    """Compile `labels`, the labels of a list of LingSync datum or session
+    fields, in order, against `specs` (e.g., `LINGSYNC_DATUM_FIELD_SPECS`).
+    Return the tuple of the `(label, position)` pairs of the first field with
+    each label in `specs` (except the ignored ones), the tuple of the labels
+    that are not in `specs`, in order of first occurrence, and the tuple of
+    the `(label, positions)` pairs of the labels in `specs` that more than one
+    field has.
+
+    """
+
+    first_positions = OrderedDict()
+    repeated = OrderedDict()
+    unknown_labels = []
+    for position, label in enumerate(labels):
+        try:
+            spec = specs.get(label)
+        except TypeError: # An unhashable label
+            spec = None
+            label = unicode(label)
+        if spec is None:
+            if label not in unknown_labels:
+                unknown_labels.append(label)
+        elif spec.stage != 'ignore':
+            if label in first_positions:
+                repeated.setdefault(label, [first_positions[label]]).append(
+                    position)
+            else:
+                first_positions[label] = position
+    return (tuple(first_positions.iteritems()), tuple(unknown_labels),
+        tuple((label, tuple(positions)) for label, positions in
+        repeated.iteritems()))
+
+
+def get_lingsync_field_values(fields, specs, differing_only=False):
+    """Read the LingSync datum or session `fields` in a single pass and return
+    a dict that maps each label in `specs` (except the ignored ones) to the
+    value of the first field with that label, and the list of the labels that
+    are not in `specs`, in order of first occurrence. A warning is printed for
+    each label that more than one field has; if `differing_only` is `True`,
+    only for labels whose fields have different values, and these fields are
+    printed too. The layout of `fields` (see `compile_lingsync_field_layout`)
+    is cached by shape, i.e., by `specs` and the tuple of their labels.
+
+    """
+
+    shape = (id(specs), tuple(f['label'] for f in fields))
+    try:
+        layout = FIELD_LAYOUT_CACHE[shape]
+    except KeyError:
+        layout = compile_lingsync_field_layout(shape[1], specs)
+        if len(FIELD_LAYOUT_CACHE) >= DOC_SHAPE_CACHE_SIZE:
+            FIELD_LAYOUT_CACHE.clear()
+        FIELD_LAYOUT_CACHE[shape] = layout
+    except TypeError: # An unhashable label; don't cache.
+        layout = compile_lingsync_field_layout(shape[1], specs)
+    first_positions, unknown_labels, repeated = layout
+    values = dict((label, fields[position].get('value')) for label, position
+        in first_positions)
+    for label, positions in repeated:
+        repeated_fields = [fields[position] for position in positions]
+        if differing_only:
+            first_value = repeated_fields[0].get('value')
+            if all(f.get('value') == first_value for f in repeated_fields):
+                continue
+        print 'WARNING: more than one %s in field list!' % label
+        if differing_only:
+            p(repeated_fields)
+    return values, list(unknown_labels)
+
+
+def apply_lingsync_field_handlers(stage_specs, field_values, comments, tags):
+    """Call the handler of each spec in `stage_specs` (a stage of the
+    conversion, e.g., `LINGSYNC_DATUM_FIELD_STAGES['head']`) whose field has a
+    non-empty value in `field_values`.
+
+    """
+
+    for spec in stage_specs:
+        value = field_values.get(spec.label)
+        if value:
+            spec.handler(spec, value, comments, tags)
+
+
+def set_truncated_field_value(old_resource, spec, value, lingsync_type,
+        doc_id, warnings, overflow=True):
+    """Set the `spec.target` attribute of `old_resource` to `value`, truncated
+    to `spec.max_length` characters, and return `True` if it had to be
+    truncated, in which case a warning is added to `warnings` (and, if
+    `overflow` is `True`, the length of `value` to `OVERFLOWS`).
+
+    """
+
+    if len(value) <= spec.max_length:
+        old_resource[spec.target] = value
+        return False
+    if not QUIET:
+        if overflow:
+            OVERFLOWS.add(len(value))
+        warnings['docspecific'].append(('value-too-long',
+            (spec.text, value, lingsync_type, doc_id)))
+    old_resource[spec.target] = value[:spec.max_length]
+    return True
+
+
 def process_lingsync_datum(doc, collections, lingsync_db_name):
     """Process a LingSync datum. This will be encoded as an OLD form.
 
@@ -1416,98 +4582,6 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
         print '\n'
         return None
 
-    # These are the LingSync datum fields that we know how to deal with for
-    # to-OLD conversion.
-    known_fields = [
-        'judgement',
-        'morphemes',
-        'allomorphs', # gina-nuktitut uses this and it is sometimes different from 'morphemes'?
-        'utterance',
-        'gloss',
-        'translation',
-        'another_translation', # in gina-inuktitut
-        'context_translation', # in gina-inuktitut
-        'validationStatus',
-        'tags',
-        'syntacticCategory',
-        'syntacticTreeLatex',
-        'enteredByUser', # Can contain a dict in its 'user' attribute (see below)
-        'modifiedByUser', # Can contain an array in its 'users' attribute. Forget what, exactly, this array can contain.
-        'comments',
-        'markAsNeedsToBeSaved', # Ignoring this. Strangely, there can be multiple fields with this label in a datimFields array ...
-        'checked', # Ignoring this. It can evaluate to `true`, but and may be relevant to `validationStatus` and the OLD form's `status`, but I think it's safe to ignore it.
-        'notes', # non-standard but attested
-        'phonetic', # non-standard but attested
-        'itemNumber', # added to comments field, when content-ful
-        'speaker', # added to OLD form.speaker (and possibly also comments field)
-        'context', # added to comments field, when content-ful
-        'documentation', # Never seen this not empty, so ignoring it for now.
-        'links', # added to comments field, when content-ful
-        'audio', # Name of .wav audio file, but don't know how to get URL (TODO)
-        'contextFile', # Name of .wav audio file, but don't know how to get URL (TODO)
-        'consultant', # Ignoring this for now, it's just a string of digits, e.g., '1' or '15'
-        'contextTranslation', # Adding this to OLD form's translations list
-        'housekeeping', # This field appears to always be empty ...
-        'orthography', # This field appears to always be empty ...
-        'spanish', # This field appears to always be empty ...
-        'consultants', # This field appears to always be empty ...
-        'dataelicited', # This field appears to always be empty ...
-        'dialect', # This field appears to always be empty ...
-        'judgment', # This trumps the standard "judgement" field (see above).
-        'language', # This field appears to always be empty ...
-        'morpheme', # This field trumps the standard "morphemes" field (see above).
-        'undefined', # Ignorable: never has a real value; only values ever seen are sequences of question marks.
-        'chapter', # Used in gina-inuktitut for chapter of Genesis.
-        'dateSEntered', # Timestamp that is ignored.
-        'verse', # Used in gina-inuktitut for verse of Genesis.
-        # New fields from weisskircherisch-firstcorpus
-        'audioFileName',
-        'begintimehh:mm:ssms',
-        'begintimehhMmSsms',
-        'endTime',
-        'fields',
-        'genDach',
-        'german',
-        'modality',
-        'relatedData',
-        'rudi',
-        'startTime',
-        'tier',
-        'ursula'
-    ]
-
-    known_attrs = [
-        '_id', # u'c297e5ceecafe6b340876e07ac477736',
-        '_rev', # u'2-63e6d77f0e9f834000b77ff59fa7abd2',
-        'audioVideo', # [],
-        'collection', # u'datums',
-        'comments', # [],
-        'dateEntered', # u'2015-04-01T16:50:30.852Z',
-        'dateModified', # u'2015-04-01T16:50:30.852Z',
-        'datumFields', # []
-        'fields', # [] Sometimes used instead of 'datumFields'
-        'datumTags', # [],
-        'images', # [],
-        'jsonType', # u'Datum',
-        'pouchname',
-        'session', # {...} redundantly stores the session of each datum ...
-        'timestamp', # 1427907030852,
-        'trashed', # u'deleted'
-        'api', # Ignorable
-        'dateCreated', # Unix timestamp; Is this different value from `dateEntered`? Doesn't really matter for this migration script.
-        'dbname', # Ignorable
-        'fieldDBtype', # Ignorable
-        'version', # Ignorable
-
-        'datumStates', # Ignoring this. It's only found in gina-inuktitut.
-
-        'lastModifiedBy', # This is ignored because you can't write modifiers to OLD forms, only the OLD does that, server-side.
-        'enteredByUser', # This attribute appears to be redundant, given the enteredByUser-labelled field (see above). Ignoring.
-        '_attachments', # May contain references to audio files, but I don't know how to get their URLs. TODO.
-        'attachmentInfo' # Ignorable: never has a real value.
-
-    ]
-
     # Fill this with OLD resources that are implicit in the LingSync datum.
     auxiliary_resources = {}
 
@@ -1517,14 +4591,18 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
         'docspecific': []
     }
 
-    for k in doc:
-        if k not in known_attrs:
-            warnings['docspecific'].append(u'\u2018%s\u2019 not a recognized'
-                u' attribute in datum %s' % (k, datum_id))
-    for obj in datum_fields:
-        if obj['label'] and obj['label'] not in known_fields:
-            warnings['docspecific'].append(u'\u2018%s\u2019 not a recognized'
-                u' label in fields for datum %s' % (obj['label'], datum_id))
+    # The attributes and fields of the datum are checked against those that
+    # we know how to deal with (see `LINGSYNC_DATUM_ATTRS` and
+    # `LINGSYNC_DATUM_FIELDS`), and the values of its fields are read, in a
+    # single pass over each, whose outcome is cached by document shape.
+    add_unrecognized_attribute_warnings(doc, u'datum', LINGSYNC_DATUM_ATTRS,
+        datum_id, warnings)
+    field_values, unknown_labels = get_lingsync_field_values(datum_fields,
+        LINGSYNC_DATUM_FIELD_SPECS, differing_only=True)
+    for label in unknown_labels:
+        if label:
+            warnings['docspecific'].append(('unrecognized-label',
+                (label, u'datum', datum_id)))
 
     # This will be our return value.
     oldobj = {
@@ -1537,7 +4615,7 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
     }
 
     # This dict will be used to create the OLD collection.
-    old_form = copy.deepcopy(old_schemata['form'])
+    old_form = new_old_resource('form')
     old_form['status'] = u'tested'
 
     # LingSync datum metadata, as well as truncated or invalid values, and
@@ -1545,111 +4623,65 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
     # ultimately.
     old_comments = []
 
-    # Some datums have an `itemNumber` field.
-    ls_itemNumber = get_val_from_datum_fields('itemNumber', datum_fields)
-    if ls_itemNumber:
-        old_comments.append('Item number: %s' % (
-            punctuate_period_safe(ls_itemNumber),))
-
-    # Some datums have a `context` field.
-    ls_context = get_val_from_datum_fields('context', datum_fields)
-    if ls_context:
-        old_comments.append('Context: %s' % (
-            punctuate_period_safe(ls_context),))
-
-    # Some datums have a `links` field, which contains references to other
-    # datums.
-    # The `links` field appears to consistently be a string of comma-separated
-    # expressions of the form "similarTo:4f868ba9a79e57479ddbe4f62ae671c8"
-    # where the string after the colon is a datum id. That datum id should be
-    # transformed into a form id, if possible.
-    # TODO: post-process links; i.e., once the forms have been entered, update
-    # those with links so that the links reference the ids of the corresponding
-    # forms in the new OLD.
-    ls_links = get_val_from_datum_fields('links', datum_fields)
-    if ls_links:
-        old_comments.append('Links: %s' % (
-            punctuate_period_safe(ls_links),))
-
     # Certain LingSync values may also be made into tags.
     old_tags = []
 
+    # Some datums have `itemNumber`, `context`, `links` (references to other
+    # datums) and `documentation` fields; adding them to the comments field.
+    apply_lingsync_field_handlers(LINGSYNC_DATUM_FIELD_STAGES['head'],
+        field_values, old_comments, old_tags)
+
     # NOTE: these values cannot be valuated by LingSync datum values.
     # 'elicitation_method': None, # = ValidOLDModelObject(model_name='ElicitationMethod')
     # 'syntactic_category': None, # = ValidOLDModelObject(model_name='SyntacticCategory')
     # 'source': None, # = ValidOLDModelObject(model_name='Source')
 
     # These values (from LingSync datum fields) are used elsewhere.
-    ls_judgement = get_val_from_datum_fields('judgement', datum_fields)
-    ls_morphemes = get_val_from_datum_fields('morphemes', datum_fields)
-    ls_allomorphs = get_val_from_datum_fields('allomorphs', datum_fields)
-    ls_utterance = get_val_from_datum_fields('utterance', datum_fields)
-    ls_gloss = get_val_from_datum_fields('gloss', datum_fields)
-    ls_translation = get_val_from_datum_fields('translation', datum_fields)
-    ls_another_translation = get_val_from_datum_fields('another_translation',
-            datum_fields)
-    ls_context_translation = get_val_from_datum_fields('context_translation',
-            datum_fields)
-    ls_validationStatus = get_val_from_datum_fields('validationStatus', datum_fields)
-    ls_tags = get_val_from_datum_fields('tags', datum_fields)
-    ls_syntacticTreeLatex = get_val_from_datum_fields('syntacticTreeLatex', datum_fields)
-    ls_chapter = get_val_from_datum_fields('chapter', datum_fields)
-    ls_verse = get_val_from_datum_fields('verse', datum_fields)
+    ls_judgement = field_values.get('judgement')
+    ls_morphemes = field_values.get('morphemes')
+    ls_allomorphs = field_values.get('allomorphs')
+    ls_utterance = field_values.get('utterance')
+    ls_gloss = field_values.get('gloss')
+    ls_translation = field_values.get('translation')
+    ls_another_translation = field_values.get('another_translation')
+    ls_context_translation = field_values.get('context_translation')
+    ls_validationStatus = field_values.get('validationStatus')
+    ls_tags = field_values.get('tags')
+    ls_syntacticTreeLatex = field_values.get('syntacticTreeLatex')
     ls_datumTags = doc.get('datumTags')
     ls_session = doc.get('session')
+    session_values = None
+    if ls_session:
+        session_values = get_lingsync_session_values(ls_session)
 
     ls_datumStates = doc.get('datumStates')
     if ls_datumStates:
         print 'datumStates: %s\n' % ls_datumStates
 
-    # Some datums have a 'documentation' field; adding it to the comments field.
-    ls_documentation = get_val_from_datum_fields('documentation', datum_fields)
-    if ls_documentation:
-        ls_documentation = ls_documentation.strip()
-        old_comments.append(
-            u'Documentation: \u2018%s\u2019' % punctuate_period_safe(
-                ls_documentation))
-
     # Date Elicited. Date in 'MM/DD/YYYY' format. From
     # datum.session.sessionFields.dateElicited.
     # Attempt to create a MM/DD/YYYY string from `date_session_elicited`. At
     # present, we are only recognizing date strings in MM/DD/YYYY and
     # YYYY-MM-DD formats.
+    # The session's date is parsed only once for all of its datums (see
+    # `get_lingsync_session_values`), but each datum gets its own warning.
     date_datum_elicited_unparseable = False
-    if ls_session:
-        session_fields = ls_session.get('sessionFields', [])
-        date_session_elicited = get_val_from_session_fields('dateElicited', session_fields)
+    if session_values:
+        date_session_elicited = session_values['date_session_elicited']
         if date_session_elicited:
-            date_elicited = None
-            try:
-                datetime_inst = datetime.datetime.strptime(date_session_elicited,
-                    '%Y-%m-%d')
-            except Exception, e:
-                try:
-                    datetime_inst = datetime.datetime.strptime(
-                        date_session_elicited, '%m/%d/%Y')
-                except Exception, e:
-                    datetime_inst = None
-                    date_datum_elicited_unparseable = True
-                    if date_session_elicited != 'none' and not QUIET:
-                        warnings['docspecific'].append(u'Unable to parse %s to an OLD-compatible date'
-                            u' in MM/DD/YYYY format for datum %s.' % (
-                            date_session_elicited, datum_id))
-            if datetime_inst:
-                y = datetime_inst.year
-                m = datetime_inst.month
-                d = datetime_inst.day
-                date_elicited = u'%s/%s/%s' % (str(m).zfill(2),
-                    str(d).zfill(2), str(y))
-            else:
-                date_elicited = None
+            date_elicited = session_values['date_elicited']
             if date_elicited:
                 old_form['date_elicited'] = date_elicited
+            else:
+                date_datum_elicited_unparseable = True
+                if date_session_elicited != 'none' and not QUIET:
+                    warnings['docspecific'].append(('unparseable-date',
+                        (date_session_elicited, datum_id)))
 
     # TODO: this datum field ("audio") can sometimes name an audio file.
     # However, I have not been able to discover how to get my hands on the URL of
     # that file.
-    ls_audio = get_val_from_datum_fields('audio', datum_fields)
+    ls_audio = field_values.get('audio')
     # if ls_audio:
     #     print '\naudio field:'
     #     pprint.pprint(ls_audio)
@@ -1659,7 +4691,7 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
     # file. As with the "audio" field mentioned above, I have not been able to
     # discover how to get my hands on the URL of that file. Note, these are all
     # .wav file names.
-    ls_contextFile = get_val_from_datum_fields('contextFile', datum_fields)
+    ls_contextFile = field_values.get('contextFile')
     if ls_contextFile and ls_contextFile != 'contextFile' and ('.wav' not in ls_contextFile):
         print '\ncontextFile field:'
         pprint.pprint(ls_contextFile)
@@ -1677,68 +4709,26 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
     #         u'md5-vl3deBSesSf4uWsn6Ctf5g=='}
     # }
 
-    # Files. Array of OLD file objects. The `audioVideo` attribute holds an
-    # array of objects, each of which has 'URL' and 'type' attributes. The
-    # `images` attribute holds ...
+    # Files. Array of OLD file objects. The `audioVideo` and `images`
+    # attributes each hold an array of objects, each of which has 'URL' and
+    # 'type' attributes.
     ls_audioVideo = doc.get('audioVideo')
     ls_images = doc.get('images')
     if ls_audioVideo and (type(ls_audioVideo) is type([])):
-        for av in ls_audioVideo:
-            if (type(av) is type({})) and av.get('URL') and \
-            (av.get('trashed')  != 'deleted'):
-
-                # We're guessing the MIME type based on the extension, not the
-                # file contents, cuz we're lazy right now...
-                mime_type = mimetypes.guess_type(av['URL'])[0]
-                print 'MIME type of audioVideo object: %s' % mime_type
-                if (not mime_type) or (mime_type not in old_allowed_file_types):
-                    continue
-                old_file = copy.deepcopy(old_schemata['file'])
-                old_file['MIME_type'] = mime_type
-                file_description = [(u'This file was generated from the LingSync'
-                    u' audio/video file stored at %s.' % av['URL'])]
-                if av.get('description'):
-                    file_description.append(av['description'].strip())
-                if av.get('dateCreated'):
-                    file_description.append(u'This file was created on LingSync'
-                        u' at %s.' % av['dateCreated'])
-                old_file['description'] = u'\n\n'.join(file_description)
-                if av.get('filename'):
-                    old_file['filename'] = av['filename'].strip()
-
-                # The only value I've seen here is "304 Not Modified", i.e., an
-                # HTTP status code. Ignoring this.
-                ls_av_uploadStatus = av.get('uploadStatus', u'')
-                # if ls_av_uploadStatus:
-                #     print 'audioVideo uploadStatus: %s' % ls_av_uploadStatus
-
-                # Loop through all of the A/V attributes that are "known"
-                # and issue warnings when unknown ones are encountered.
-                for attr in av:
-                    if attr not in known_audio_video_attrs:
-                        warnings['docspecific'].append(u'Attribute'
-                            u' \u2018%s\u2019 is not recognized in the'
-                            u' `audioVideo` value of datum %s' % (attr,
-                            datum_id))
-                # Store these "private" keys for possible use during file data
-                # download.
-                old_file['__lingsync_datum_id'] = datum_id
-                old_file['__lingsync_file_url'] = av['URL']
-                if av.get('size'):
-                    old_file['__lingsync_file_size'] = av['size']
-                # LingSync's `type` attr is OLD's MIME_type. We probably want
-                # to programmatically extract this value from the filename
-                # and/or the file data though.
-                if av.get('type'):
-                    old_file['__lingsync_MIME_type'] = av['type']
-                old_form['files'].append(old_file)
-                auxiliary_resources.setdefault('files', []).append(old_file)
-
-    # Files -- Images. Add `datum.images` to `form.files`, once we know what is
-    # in a LingSync datum's images attribute.
+        add_lingsync_media_files(ls_audioVideo, u'audio/video',
+            'unrecognized-audio-video-attribute', datum_id, old_form,
+            auxiliary_resources, warnings)
+
+    # Files -- Images. Image objects with URLs are added to `form.files` like
+    # audio/video ones; any other `images` value is ignored.
     if ls_images:
-        warnings['docspecific'].append(u'Datum %s has an `images` attribute that has been'
-            u' ignored.' % datum_id)
+        if (type(ls_images) is type([])) and all((type(image) is type({})) and
+                image.get('URL') for image in ls_images):
+            add_lingsync_media_files(ls_images, u'image',
+                'unrecognized-image-attribute', datum_id, old_form,
+                auxiliary_resources, warnings)
+        else:
+            warnings['docspecific'].append(('ignored-images', (datum_id,)))
 
     # Tags. [] or a list of OLD tags.
     if ls_tags:
@@ -1753,13 +4743,12 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
             TAGSTOFIX[ls_tags]['tags_created'] = ls_tags.split()
 
             for tag in ls_tags.split():
-                old_tag = copy.deepcopy(old_schemata['tag'])
+                old_tag = new_old_resource('tag')
                 old_tag['name'] = tag
                 old_tags.append(old_tag)
         else:
-            warnings['docspecific'].append(u'Unable to use value \u2018%s\u2019'
-                u' from datumField tags of datum %s' % (unicode(ls_tags),
-                datum_id))
+            warnings['docspecific'].append(('unusable-tags-value',
+                (unicode(ls_tags), datum_id)))
     if ls_datumTags:
         if type(ls_datumTags) is type([]):
             for tag in ls_datumTags:
@@ -1774,24 +4763,21 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
                         TAGSTOFIX[tag['tag']].setdefault('datum_ids', []).append(datum_id)
                         TAGSTOFIX[tag['tag']]['tags_created'] = [tag['tag']]
 
-                        old_tag = copy.deepcopy(old_schemata['tag'])
+                        old_tag = new_old_resource('tag')
                         old_tag['name'] = tag['tag']
                         old_tags.append(old_tag)
                     else:
                         if not QUIET:
-                            warnings['docspecific'].append(u'Tag object \u2018%s\u2019'
-                                u' from datum.datumTags of datum %s has no `tag`'
-                                u' attribute and cannot be used.' % (
-                                unicode(tag), datum_id))
+                            warnings['docspecific'].append((
+                                'tag-object-without-tag',
+                                (unicode(tag), datum_id)))
 
                 else:
-                    warnings['docspecific'].append(u'Unable to use tag \u2018%s\u2019'
-                        u' from datum.datumTags of datum %s' %
-                        (unicode(tag), datum_id))
+                    warnings['docspecific'].append(('unusable-datum-tag',
+                        (unicode(tag), datum_id)))
         else:
-            warnings['docspecific'].append(u'Unable to use value \u2018%s\u2019'
-                u' from datum.datumTags of datum %s' %
-                (unicode(ls_datumTags), datum_id))
+            warnings['docspecific'].append(('unusable-datum-tags-value',
+                (unicode(ls_datumTags), datum_id)))
 
     # If `ls_trashed == 'deleted'` then we mark the to-be-uploaded form as such
     # and we will delete it in the OLD after creating it.
@@ -1806,7 +4792,7 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
     # TODO: some datums have a field labelled "consultant". However, from what
     # I have seen, the value of this field is just a string containing digits,
     # like '1' or '15' so I am ignoring it for now.
-    ls_consultant = get_val_from_datum_fields('consultant', datum_fields)
+    ls_consultant = field_values.get('consultant')
     if ls_consultant:
         non_digits = []
         for ch in ls_consultant:
@@ -1823,48 +4809,15 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
 
 
     speakers = []
-    if ls_session:
-        session_fields = ls_session.get('sessionFields')
-        if not session_fields:
-            session_fields = ls_session.get('fields', [])
-        consultants = get_val_from_session_fields('consultants', session_fields)
-        dialect = get_val_from_session_fields('dialect', session_fields)
-        if not dialect:
-            dialect = ls_session.get('dialect')
-        if consultants:
-            consultants_list = consultants.split()
-            # If consultants is two capitalized words, e.g., Dave Smith, then
-            # we assume we have a first name/ last name situation.
-            if len(consultants_list) == 2 and \
-            consultants_list[0] == consultants_list[0].lower().capitalize() and \
-            consultants_list[1] == consultants_list[1].lower().capitalize():
-                old_speaker = copy.deepcopy(old_schemata['speaker'])
-                old_speaker['first_name'] = consultants_list[0]
-                old_speaker['last_name'] = consultants_list[1]
-                speakers.append(old_speaker)
-            # Otherwise, we assume we have an initials situation (e.g., DS).
-            else:
-                for consultant in consultants_list:
-                    old_speaker = copy.deepcopy(old_schemata['speaker'])
-                    # If consultant is all-caps, we assume it is initials, where the
-                    # first char is the first name initial and the remaining char(s)
-                    # is/are the last name initial(s).
-                    if consultant.upper() == consultant:
-                        old_speaker['first_name'] = consultant[0]
-                        old_speaker['last_name'] = consultant[1:]
-                    else:
-                        old_speaker['first_name'] = consultant
-                        old_speaker['last_name'] = consultant
-                    if dialect:
-                        old_speaker['dialect'] = dialect
-                    speakers.append(old_speaker)
+    if session_values:
+        speakers = [dict(speaker) for speaker in session_values['speakers']]
 
     # Aside from the datum's session's consultants field, some datums can have
     # a 'speaker' field. This speaker value seems to consistently be a
     # one-character string.
-    ls_speaker = get_val_from_datum_fields('speaker', datum_fields)
+    ls_speaker = field_values.get('speaker')
     if ls_speaker:
-        old_speaker = copy.deepcopy(old_schemata['speaker'])
+        old_speaker = new_old_resource('speaker')
         old_speaker['first_name'] = ls_speaker
         old_speaker['last_name'] = ls_speaker
         speakers.append(old_speaker)
@@ -1873,13 +4826,8 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
         old_form['speaker'] = speakers[0]
         if len(speakers) > 1:
             if not QUIET:
-                warnings['docspecific'].append('Datum %s has more than one'
-                    ' consultant listed. Since OLD forms only allow one speaker, we'
-                    ' are just going to associate the first speaker to the OLD form'
-                    ' created form this LingSync datum. The additional LingSync'
-                    ' speakers will still be created as OLD speakers, however, and'
-                    ' ALL LingSync consultants will be documented in the form\'s'
-                    ' comments field.' % datum_id)
+                warnings['docspecific'].append((
+                    'datum-with-several-consultants', (datum_id,)))
             speaker_strs = [u'%s %s' % (s['first_name'], s['last_name']) for s
                 in speakers]
             old_comments.append(punctuate_period_safe(
@@ -1889,12 +4837,12 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
         auxiliary_resources.setdefault('speakers', []).append(speaker)
 
     # Elicitor. Null or a valid user resource. From datum enteredByUser.
-    ls_enteredByUser = get_val_from_datum_fields('enteredByUser', datum_fields)
+    ls_enteredByUser = field_values.get('enteredByUser')
     if ls_enteredByUser:
         warnings['general'].append(u'Form elicitor values are being supplied by'
             u' datum.session.enteredByUser values. This may be inaccurate. Change'
             u' as needed in the Dative/OLD interface.')
-        old_elicitor = copy.deepcopy(old_schemata['user'])
+        old_elicitor = new_old_resource('user')
         old_elicitor['username'] = fix_user_name(ls_enteredByUser)
         old_elicitor['first_name'] = fix_user_name(ls_enteredByUser)
         old_elicitor['last_name'] = fix_user_name(ls_enteredByUser)
@@ -1930,18 +4878,20 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
             """
 
     # Transcription. Not empty, max 510 chars. From LingSync utterance.
+    max_transcription_length = LINGSYNC_DATUM_FIELD_SPECS[
+        'utterance'].max_length
     ls_utterance_too_long = False
     if not ls_utterance:
         old_transcription = u'PLACEHOLDER'
         # warnings['docspecific'].append(u'Datum %s has no utterance value; the form generated'
         #     ' from it has "PLACEHOLDER" as its transcription value.' % datum_id)
-    elif len(ls_utterance) > 510:
+    elif len(ls_utterance) > max_transcription_length:
         ls_utterance_too_long = True
         if not QUIET:
             OVERFLOWS.add(len(ls_utterance))
-            warnings['docspecific'].append('The utterance "%s" of datum %s is too long (%d chars) and will be'
-                ' truncated.' % (ls_utterance, datum_id, len(ls_utterance)))
-        old_transcription = ls_utterance[:510]
+            warnings['docspecific'].append(('utterance-too-long',
+                (ls_utterance, datum_id, len(ls_utterance))))
+        old_transcription = ls_utterance[:max_transcription_length]
     else:
         old_transcription = ls_utterance
     old_form['transcription'] = old_transcription
@@ -1952,20 +4902,14 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
     # The idiosyncratic "morpheme" field trumps the standard "morpheme" one.
     # I've only seen this field rarely, but when it is present it appears to
     # contain more information than the "morphemes", hence the trump.
-    ls_morpheme = get_val_from_datum_fields('morpheme', datum_fields)
+    ls_morpheme = field_values.get('morpheme')
     if ls_morpheme:
         ls_morphemes = ls_morpheme
 
     if ls_morphemes:
-        if len(ls_morphemes) > 510:
-            ls_morphemes_too_long = True
-            if not QUIET:
-                OVERFLOWS.add(len(ls_morphemes))
-                warnings['docspecific'].append('The morphemes "%s" of datum %s is too long and'
-                    ' will be truncated.' % (ls_morphemes, datum_id))
-            old_form['morpheme_break'] = ls_morphemes[:510]
-        else:
-            old_form['morpheme_break'] = ls_morphemes
+        ls_morphemes_too_long = set_truncated_field_value(old_form,
+            LINGSYNC_DATUM_FIELD_SPECS['morphemes'], ls_morphemes, u'datum',
+            datum_id, warnings)
 
     # If we have allomorphs and they are different from our morphemes, then put
     # them in the comments field.
@@ -1975,111 +4919,18 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
 
     # Phonetic Transcription. Max 510 chars. From the non-standard LingSync
     # field "phonetic".
-    ls_phonetic = get_val_from_datum_fields('phonetic', datum_fields)
+    ls_phonetic = field_values.get('phonetic')
     ls_phonetic_too_long = False
     if ls_phonetic:
-        if len(ls_phonetic) > 510:
-            ls_phonetic_too_long = True
-            if not QUIET:
-                OVERFLOWS.add(len(ls_phonetic))
-                warnings['docspecific'].append('The phonetic value "%s" of datum %s'
-                    ' is too long and will be truncated.' % (ls_phonetic, datum_id))
-            old_form['phonetic_transcription'] = ls_phonetic[:510]
-        else:
-            old_form['phonetic_transcription'] = ls_phonetic
-
-    ############################################################################
-    # START New datum fields from weisskircherisch-firstcorpus
-    ############################################################################
-
-    # german field (in weisskircherisch) is an (assumedly Standard German)
-    # rendering/translation of the Transylvanian Saxon utterance. Putting it in
-    # the comments field.
-    ls_german = get_val_from_datum_fields('german', datum_fields)
-    if ls_german:
-        old_comments.append(
-            u'German: \u2018%s\u2019' % punctuate_period_safe(ls_german))
-
-    # rudi field (in weisskircherisch) is like the German field, an alternative
-    # transcription of some kind.
-    ls_rudi = get_val_from_datum_fields('rudi', datum_fields)
-    if ls_rudi:
-        old_comments.append(
-            u'Rudi: \u2018%s\u2019' % punctuate_period_safe(ls_rudi))
-
-    # ursula field (in weisskircherisch) is like the German field, an
-    # alternative transcription of some kind.
-    ls_ursula = get_val_from_datum_fields('ursula', datum_fields)
-    if ls_ursula:
-        old_comments.append(
-            u'Ursula: \u2018%s\u2019' % punctuate_period_safe(ls_ursula))
-
-    # audioFileName. Ignoring this: no value attested yet.
-    ls_audioFileName = get_val_from_datum_fields('audioFileName', datum_fields)
-    if ls_audioFileName:
-        print 'Datum has ls_audioFileName: ', ls_audioFileName
-
-    # begintimehh:mm:ssms. Assumedly the time in an audio/video file that the
-    # utterance comes from. Format is (hh:)mm:ss.ms, e.t., "49:37.9".
-    ls_begintimehhmmssms = get_val_from_datum_fields('begintimehh:mm:ssms', datum_fields)
-    if ls_begintimehhmmssms:
-        old_comments.append(
-                u'Begin time (hh:mm:ss.ms): %s' % punctuate_period_safe(
-                    str(ls_begintimehhmmssms)))
-
-    # begintimehhMmSsms. Ignoring this: no value attested. Assumedly the time
-    # in an audio/video file that the utterance comes from.
-    ls_begintimehhMmSsms = get_val_from_datum_fields(
-        'begintimehhMmSsms', datum_fields)
-    if ls_begintimehhMmSsms:
-        print 'Datum has ls_begintimehhMmSsms: ', ls_begintimehhMmSsms
-
-    # endTime. Ignoring this: no value attested.
-    ls_endTime = get_val_from_datum_fields('endTime', datum_fields)
-    if ls_endTime:
-        print 'Datum has ls_endTime: ', ls_endTime
-
-    # fields. Ignoring this: no value attested.
-    ls_fields = get_val_from_datum_fields('fields', datum_fields)
-    if ls_fields:
-        print 'Datum has ls_fields: ', ls_fields
-
-    # genDach. Ignoring this: no value attested.
-    ls_genDach = get_val_from_datum_fields('genDach', datum_fields)
-    if ls_genDach:
-        print 'Datum has ls_genDach: ', ls_genDach
-
-    # modality. Only one token attested ("spoken"). Creating it as an OLD tag.
-    ls_modality = get_val_from_datum_fields('modality', datum_fields)
-    if ls_modality:
-        old_tags.append({
-            'name': u'modality: %s' % ls_modality,
-            'description': u''
-        })
-
-    # relatedData. Ignoring this: no value attested.
-    ls_relatedData = get_val_from_datum_fields('relatedData', datum_fields)
-    if ls_relatedData:
-        if (isinstance(ls_relatedData, dict) and
-                isinstance(ls_relatedData.get('relatedData'), list) and
-                len(ls_relatedData['relatedData']) == 0):
-            pass
-        else:
-            print 'Datum has ls_relatedData: ', ls_relatedData
+        ls_phonetic_too_long = set_truncated_field_value(old_form,
+            LINGSYNC_DATUM_FIELD_SPECS['phonetic'], ls_phonetic, u'datum',
+            datum_id, warnings)
 
-    # startTime. Ignoring this: no value attested.
-    ls_startTime = get_val_from_datum_fields('startTime', datum_fields)
-    if ls_startTime:
-        print 'Datum has ls_startTime: ', ls_startTime
-
-    # tier. Ignoring this: no value attested.
-    ls_tier = get_val_from_datum_fields('tier', datum_fields)
-    if ls_tier:
-        print 'Datum has ls_tier: ', ls_tier
-
-    ############################################################################
-    # END New datum fields from weisskircherisch-firstcorpus
-    ############################################################################
+    # New datum fields from weisskircherisch-firstcorpus (see
+    # `LINGSYNC_DATUM_FIELDS`).
+    apply_lingsync_field_handlers(
+        LINGSYNC_DATUM_FIELD_STAGES['weisskircherisch'], field_values,
+        old_comments, old_tags)
 
     # Grammaticality. From LingSync judgement (or from LingSync judgment, note spelling)
 
@@ -2087,7 +4938,7 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
     # migrations I have made, it appears to contain roughly the same
     # information as "judgement", only better formatted. Therefore, if judgment
     # exists, we use it instead of judgement.
-    ls_judgment = get_val_from_datum_fields('judgment', datum_fields)
+    ls_judgment = field_values.get('judgment')
     if ls_judgment:
         ls_judgement = ls_judgment
 
@@ -2117,15 +4968,9 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
     # Morpheme Gloss. Max 510 chars. From LingSync gloss.
     ls_gloss_too_long = False
     if ls_gloss:
-        if len(ls_gloss) > 510:
-            ls_gloss_too_long = True
-            if not QUIET:
-                OVERFLOWS.add(len(ls_gloss))
-                warnings['docspecific'].append('The gloss "%s" of datum %s is too long and'
-                    ' will be truncated.' % (ls_gloss, datum_id))
-            old_form['morpheme_gloss'] = ls_gloss[:510]
-        else:
-            old_form['morpheme_gloss'] = ls_gloss
+        ls_gloss_too_long = set_truncated_field_value(old_form,
+            LINGSYNC_DATUM_FIELD_SPECS['gloss'], ls_gloss, u'datum', datum_id,
+            warnings)
 
 
     # Translations. Has to be at least one. From LingSync translation. Also
@@ -2137,7 +4982,7 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
 
     # "contextTranslation", an idiosyncratic field. TODO: does this belong in
     # OLD translations?
-    ls_contextTranslation = get_val_from_datum_fields('contextTranslation', datum_fields)
+    ls_contextTranslation = field_values.get('contextTranslation')
     if ls_contextTranslation:
         translations.append(ls_contextTranslation)
 
@@ -2165,22 +5010,16 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
             })
 
     # Chapter and verse. Only used in gina-inuktitut, a Genesis translation.
-    if ls_chapter:
-        old_comments.append(u'Chapter %s' % punctuate_period_safe(ls_chapter))
-    if ls_verse:
-        old_comments.append(u'Verse %s' % punctuate_period_safe(ls_verse))
+    apply_lingsync_field_handlers(LINGSYNC_DATUM_FIELD_STAGES['chapter'],
+        field_values, old_comments, old_tags)
 
     # Syntax. Max 1023 chars. From LingSync syntacticTreeLatex.
     ls_syntacticTreeLatex_too_long = False
     if ls_syntacticTreeLatex:
-        if len(ls_syntacticTreeLatex) > 1023:
-            ls_syntacticTreeLatex_too_long = True
-            if not QUIET:
-                warnings['docspecific'].append('The syntacticTreeLatex "%s" of datum %s is too'
-                    ' long and will be truncated.' % (ls_syntacticTreeLatex, datum_id))
-            old_form['syntax'] = ls_syntacticTreeLatex[:1023]
-        else:
-            old_form['syntax'] = ls_syntacticTreeLatex
+        ls_syntacticTreeLatex_too_long = set_truncated_field_value(old_form,
+            LINGSYNC_DATUM_FIELD_SPECS['syntacticTreeLatex'],
+            ls_syntacticTreeLatex, u'datum', datum_id, warnings,
+            overflow=False)
 
 
     # Comments.
@@ -2190,7 +5029,7 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
     # All of these values should go into prose in the OLD's form.comments value.
 
     # Datum metadata -> form comments
-    ls_modifiedByUser = get_val_from_datum_fields('modifiedByUser', datum_fields)
+    ls_modifiedByUser = field_values.get('modifiedByUser')
     ls_dateModified = doc.get('dateModified')
     ls_dateEntered = doc.get('dateEntered')
     # We remember the date entered so that we can get the correct sort order for
@@ -2217,7 +5056,7 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
         old_comments.append(old_form_creation_metadata)
 
     # Datum comments field -> form comments
-    ls_comments = get_val_from_datum_fields('comments', datum_fields)
+    ls_comments = field_values.get('comments')
     if ls_comments:
         processed_comments, warnings = process_lingsync_comments_val(
             ls_comments, warnings)
@@ -2234,9 +5073,8 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
 
     # Datum notes field -> form comments. (Some LingSync corpora have the
     # non-standard "notes" field in their datums.)
-    ls_notes = get_val_from_datum_fields('notes', datum_fields)
-    if ls_notes:
-        old_comments.append('LingSync notes: %s' % punctuate_period_safe(ls_notes))
+    apply_lingsync_field_handlers(LINGSYNC_DATUM_FIELD_STAGES['notes'],
+        field_values, old_comments, old_tags)
 
     # Datum errored fields -> put them (redundantly) into a paragraph in form
     # comments.
@@ -2244,8 +5082,7 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
     # forms' syntactic_category_string field since that field is read-only. We
     # can add it to the comments prose though.
     old_form_errored_data = []
-    ls_syntacticCategory = get_val_from_datum_fields('syntacticCategory',
-        datum_fields)
+    ls_syntacticCategory = field_values.get('syntacticCategory')
     if ls_utterance_too_long:
         old_form_errored_data.append(u'LingSync datum utterance value without'
             u' truncation: \u2018%s\u2019' %
@@ -2296,9 +5133,69 @@ def process_lingsync_datum(doc, collections, lingsync_db_name):
     return oldobj
 
 
-# These are the attributes of a LingSync Datum's AudioVideo object attribute
-# that we know about.
-known_audio_video_attrs = [
+def add_lingsync_media_files(media_objects, media_kind,
+        unrecognized_attribute_warning, datum_id, old_form,
+        auxiliary_resources, warnings):
+    """Add an OLD file to `old_form` (and to `auxiliary_resources`) for each
+    LingSync media object (from a datum's `audioVideo` or `images` array) in
+    `media_objects` that has a URL and an allowed MIME type. `media_kind`
+    (e.g., u'audio/video') is used in the descriptions of the files.
+
+    """
+
+    for av in media_objects:
+        if (type(av) is type({})) and av.get('URL') and \
+        (av.get('trashed')  != 'deleted'):
+
+            # We're guessing the MIME type based on the extension, not the
+            # file contents, cuz we're lazy right now...
+            mime_type = mimetypes.guess_type(av['URL'])[0]
+            print 'MIME type of %s object: %s' % (media_kind, mime_type)
+            if (not mime_type) or (mime_type not in old_allowed_file_types):
+                continue
+            old_file = new_old_resource('file')
+            old_file['MIME_type'] = mime_type
+            file_description = [(u'This file was generated from the LingSync'
+                u' %s file stored at %s.' % (media_kind, av['URL']))]
+            if av.get('description'):
+                file_description.append(av['description'].strip())
+            if av.get('dateCreated'):
+                file_description.append(u'This file was created on LingSync'
+                    u' at %s.' % av['dateCreated'])
+            old_file['description'] = u'\n\n'.join(file_description)
+            if av.get('filename'):
+                old_file['filename'] = av['filename'].strip()
+
+            # The only value I've seen here is "304 Not Modified", i.e., an
+            # HTTP status code. Ignoring this.
+            ls_av_uploadStatus = av.get('uploadStatus', u'')
+            # if ls_av_uploadStatus:
+            #     print 'audioVideo uploadStatus: %s' % ls_av_uploadStatus
+
+            # Loop through all of the A/V attributes that are "known"
+            # and issue warnings when unknown ones are encountered.
+            for attr in av:
+                if attr not in LINGSYNC_AUDIO_VIDEO_ATTRS:
+                    warnings['docspecific'].append((
+                        unrecognized_attribute_warning, (attr, datum_id)))
+            # Store these "private" keys for possible use during file data
+            # download.
+            old_file['__lingsync_datum_id'] = datum_id
+            old_file['__lingsync_file_url'] = av['URL']
+            if av.get('size'):
+                old_file['__lingsync_file_size'] = av['size']
+            # LingSync's `type` attr is OLD's MIME_type. We probably want
+            # to programmatically extract this value from the filename
+            # and/or the file data though.
+            if av.get('type'):
+                old_file['__lingsync_MIME_type'] = av['type']
+            old_form['files'].append(old_file)
+            auxiliary_resources.setdefault('files', []).append(old_file)
+
+
+# These are the attributes of a LingSync Datum's AudioVideo (and Image) object
+# attributes that we know about.
+LINGSYNC_AUDIO_VIDEO_ATTRS = frozenset([
     '_id',
     'dateCreated',
     'URL',
@@ -2330,7 +5227,7 @@ known_audio_video_attrs = [
     'webResultStatus',
     # New from weisskircherisch corpus
     'uploadStatus'
-]
+])
 
 
 def process_lingsync_session(doc):
@@ -2360,57 +5257,6 @@ def process_lingsync_session(doc):
     if doc.get('trashed') == 'deleted':
         return None
 
-    # These are the LingSync session fields that we know how to deal with for
-    # to-OLD conversion.
-    known_fields = [
-        'goal',
-        'consultants',
-        'dialect',
-        'language',
-        'dateElicited',
-        'user',
-        'dateSEntered',
-        'participants', # Sometimes a field with this label. I'm ignoring it. It seems to consitently be an empty string.
-        'DateSessionEntered', # Sometimes a field with this label. I'm ignoring it. It seems to consistently be an empty string.
-        'dateSessionEntered', # Sometimes a field with this label. I'm ignoring it. It seems to be the same date as the date_created datetime, just in a different format.
-        # The following idiosyncratic session fields have never been observed with values, so they are being ignored.
-        'annotationDate', # I've never seen this field with a value, so I'm ignoring it for now.
-        'annotationsFundedBy', # I've never seen this field with a value, so I'm ignoring it for now.
-        'attributionInfo', # I've never seen this field with a value, so I'm ignoring it for now.
-        'collection', # I've never seen this field with a value, so I'm ignoring it for now.
-        'originalTranscriber', # I've never seen this field with a value, so I'm ignoring it for now.
-        'publisher', # I've never seen this field with a value, so I'm ignoring it for now.
-        # new fields from weisskircherisch
-        'device',
-        'location',
-        'register',
-        'source'
-    ]
-
-    known_attrs = [
-        '_id',
-        '_rev',
-        'collection',
-        'comments',
-        'dateCreated',
-        'dateModified',
-        'lastModifiedBy',
-        'pouchname',
-        'sessionFields',
-        'title', # This attr occurs in some sessions. I am ignoring this attr in sessions; I think it holds 'Change this session'.
-        'timestamp', # This attr also occurs only sometimes. I am ignoring it. It appears to be the same value as the dateModified.
-        'api', # Ignorable
-        'dbname', # Ignorable
-        'fieldDBtype', # Ignorable
-        'fields', # Ignorable
-        'modifiedByUser', # NOTE: this should maybe be migrated, but its `value` value is just a string of usernames and its `json.users` value is an array of objects whose only relevant attribute appears to be `username`, which is redundant with the aforementioned `value`. No modification timestamp for each modification.
-        'version', # Ignorable
-        'dialect', # Note: this attr appears to be valuated when its corresponding field is not, and vice versa.
-        'language', # Note: this attr appears to be valuated when its corresponding field is not, and vice versa.
-        'trashed', # May be set to 'deleted'. Note: we are ignoring deleted sessions and will not create and then delete OLD corpora to simulate them (as we do with forms).
-        'trashedReason' # Optional text describing why the session was deleted.
-    ]
-
     # Fill this with OLD resources that are implicit in the LingSync session.
     auxiliary_resources = {}
 
@@ -2420,14 +5266,17 @@ def process_lingsync_session(doc):
         'docspecific': []
     }
 
-    for k in doc:
-        if k not in known_attrs:
-            warnings['docspecific'].append(u'\u2018%s\u2019 not a recognized'
-                u' attribute in session %s' % (k, session_id))
-    for obj in session_fields:
-        if obj['label'] not in known_fields:
-            warnings['docspecific'].append(u'\u2018%s\u2019 not a recognized'
-                u' label in fields for session %s' % (obj['label'], session_id))
+    # The attributes and fields of the session are checked against those
+    # that we know how to deal with (see `LINGSYNC_SESSION_ATTRS` and
+    # `LINGSYNC_SESSION_FIELDS`), and the values of its fields are read, in a
+    # single pass over each, whose outcome is cached by document shape.
+    add_unrecognized_attribute_warnings(doc, u'session',
+        LINGSYNC_SESSION_ATTRS, session_id, warnings)
+    field_values, unknown_labels = get_lingsync_field_values(session_fields,
+        LINGSYNC_SESSION_FIELD_SPECS)
+    for label in unknown_labels:
+        warnings['docspecific'].append(('unrecognized-label',
+            (label, u'session', session_id)))
 
     # This will be our return value.
     oldobj = {
@@ -2440,114 +5289,49 @@ def process_lingsync_session(doc):
     }
 
     # This dict will be used to create th eOLD collection.
-    old_collection = copy.deepcopy(old_schemata['collection'])
+    old_collection = new_old_resource('collection')
     old_collection['type'] = u'elicitation'
 
     # Get the values of the LingSync session fields.
-    goal = get_val_from_session_fields('goal', session_fields)
-    consultants = get_val_from_session_fields('consultants', session_fields)
-    date_session_elicited = get_val_from_session_fields('dateElicited',
-        session_fields)
-    user = get_val_from_session_fields('user', session_fields)
+    goal = field_values.get('goal')
+    consultants = field_values.get('consultants')
+    date_session_elicited = field_values.get('dateElicited')
+    user = field_values.get('user')
     date_created = doc.get('dateCreated')
     date_modified = doc.get('dateModified')
     last_modified_by = doc.get('lastModifiedBy')
 
-    ############################################################################
-    # START New session fields from weisskircherisch corpus
-    ############################################################################
-
-    # Device. Ignoring this because I've never seen it not empty.
-    ls_device = get_val_from_session_fields('device',
-        session_fields)
-    if ls_device:
-        print 'Session has device: %s' % ls_device
-
-    # Location. Ignoring this because I've never seen it not empty.
-    ls_location = get_val_from_session_fields('location',
-        session_fields)
-    if ls_location:
-        print 'Session has location: %s' % ls_location
-
-    # Register. Ignoring this because I've never seen it not empty.
-    ls_register = get_val_from_session_fields('register',
-        session_fields)
-    if ls_register:
-        print 'Session has register: %s' % ls_register
-
-    # Source. Ignoring this because I've never seen it not empty.
-    ls_source = get_val_from_session_fields('source',
-        session_fields)
-    if ls_source and ls_source not in ('XY', 'Unknown'):
-        print 'Session has source: %s' % ls_source
-
-    ############################################################################
-    # END New session fields from weisskircherisch corpus
-    ############################################################################
-
-    # Annotation Date. Ignoring this because I've never seen it not empty.
-    ls_annotationDate = get_val_from_session_fields('annotationDate',
-        session_fields)
-    if ls_annotationDate:
-        print 'Session has annotationDate: %s' % ls_annotationDate
-
-    # Annotations Funded By. Ignoring this because I've never seen it not empty.
-    ls_annotationsFundedBy = get_val_from_session_fields('annotationsFundedBy',
-        session_fields)
-    if ls_annotationsFundedBy:
-        print 'Session has annotationsFundedBy: %s' % ls_annotationsFundedBy
-
-    # Attribution Info. Ignoring this because I've never seen it not empty.
-    ls_attributionInfo = get_val_from_session_fields('attributionInfo',
-        session_fields)
-    if ls_attributionInfo:
-        print 'Session has ls_attributionInfo: %s' % ls_attributionInfo
-
-    # Collection. Ignoring this because I've never seen it not empty.
-    ls_collection = get_val_from_session_fields('collection', session_fields)
-    if ls_collection:
-        print 'Session has ls_collection: %s' % ls_collection
-
-    # Original Transcriber. Ignoring this because I've never seen it not empty.
-    ls_originalTranscriber = get_val_from_session_fields('originalTranscriber',
-        session_fields)
-    if ls_originalTranscriber:
-        print 'Session has ls_originalTranscriber: %s' % ls_originalTranscriber
-
-    # Publisher. Ignoring this because I've never seen it not empty.
-    ls_publisher = get_val_from_session_fields('publisher', session_fields)
-    if ls_publisher:
-        print 'Session has ls_publisher: %s' % ls_publisher
+    # Report the values of the session fields that we have never seen
+    # valuated (see `LINGSYNC_SESSION_FIELDS`).
+    apply_lingsync_field_handlers(LINGSYNC_SESSION_FIELD_STAGES['report'],
+        field_values, None, None)
 
     # We use the dialect and language fields if present. If not, we try to get
     # these values from the corresponding attributes.
-    dialect = get_val_from_session_fields('dialect', session_fields)
+    dialect = field_values.get('dialect')
     if not dialect:
         dialect = doc.get('dialect')
-    language = get_val_from_session_fields('language', session_fields)
+    language = field_values.get('language')
     if not language:
         language = doc.get('language')
 
     # Title. Get the OLD collection's title value.
     if (not goal) or len(goal) == 0:
         if not QUIET:
-            warnings['docspecific'].append('Session %s has no goal so its date'
-                ' elicited is being used for title of the the OLD collection'
-                ' built from it.' % (session_id,))
+            warnings['docspecific'].append(('session-without-goal',
+                (session_id,)))
         if date_session_elicited and len(date_session_elicited) > 0:
             title = u'Elicitation Session on %s' % date_session_elicited
         else:
             if not QUIET:
-                warnings['docspecific'].append('Session %s has no date elicited so its id is being'
-                    ' used for the title of the OLD collection built from it.' % (
-                    session_id,))
+                warnings['docspecific'].append((
+                    'session-without-date-elicited', (session_id,)))
             title = u'Elicitation Session %s' % session_id
-    elif len(goal) > 255:
+    elif len(goal) > LINGSYNC_SESSION_FIELD_SPECS['goal'].max_length:
         if not QUIET:
-            warnings['docspecific'].append('The goal "%s" of session %s is too long'
-                ' and will be truncated. However, its non-truncated form is in the'
-                ' collection\'s description field.' % (goal, session_id))
-        title = goal[:255]
+            warnings['docspecific'].append(('goal-too-long',
+                (goal, session_id)))
+        title = goal[:LINGSYNC_SESSION_FIELD_SPECS['goal'].max_length]
     else:
         title = goal
     old_collection['title'] = title
@@ -2600,7 +5384,7 @@ def process_lingsync_session(doc):
     speakers = []
     if consultants:
         for consultant in consultants.split():
-            old_speaker = copy.deepcopy(old_schemata['speaker'])
+            old_speaker = new_old_resource('speaker')
             # If consultant is all-caps, we assume it is initials wehre the
             # first char is the first name initial and the remaining char(s)
             # is/are the last name initial(s).
@@ -2617,13 +5401,8 @@ def process_lingsync_session(doc):
         old_collection['speaker'] = speakers[0]
         if len(speakers) > 1:
             if not QUIET:
-                warnings['docspecific'].append('Session %s has more than one consultant listed. Since'
-                    ' OLD collections only allow one speaker, we are just going to'
-                    ' associate the first speaker to the OLD collection created form this'
-                    ' LingSync session. The additional LingSync speakers will still be'
-                    ' created as OLD speakers, however, and all OLD collections'
-                    ' will list all of the consultants from their source'
-                    ' LingSync sessions in their description values.' % session_id)
+                warnings['docspecific'].append((
+                    'session-with-several-consultants', (session_id,)))
     for speaker in speakers:
         auxiliary_resources.setdefault('speakers', []).append(speaker)
 
@@ -2632,7 +5411,7 @@ def process_lingsync_session(doc):
     # We stupidly just set the username, first_name, and lastname attributes to
     # the LingSync user value.
     if user:
-        old_elicitor = copy.deepcopy(old_schemata['user'])
+        old_elicitor = new_old_resource('user')
         old_elicitor['username'] = user
         old_elicitor['first_name'] = user
         old_elicitor['last_name'] = user
@@ -2645,30 +5424,10 @@ def process_lingsync_session(doc):
     # Attempt to create a MM/DD/YYYY string from `date_session_elicited`. At
     # present, we are only recognizing date strings in MM/DD/YYYY and
     # YYYY-MM-DD formats.
+    # No point in warning about an unparseable date. Any unparseable
+    # dateElicited values will be put in the text of the description anyway.
     if date_session_elicited:
-        date_elicited = None
-        try:
-            datetime_inst = datetime.datetime.strptime(date_session_elicited,
-                '%Y-%m-%d')
-        except Exception, e:
-            try:
-                datetime_inst = datetime.datetime.strptime(
-                    date_session_elicited, '%m/%d/%Y')
-            except Exception, e:
-                datetime_inst = None
-                # No point in warning about this. Any unparseable dateElicited
-                # values will be put in the text of the description anyway.
-                # warnings['docspecific'].append(u'Unable to parse %s to an'
-                #     u' OLD-compatible date in MM/DD/YYYY format.' % (
-                #     date_session_elicited,))
-        if datetime_inst:
-            y = datetime_inst.year
-            m = datetime_inst.month
-            d = datetime_inst.day
-            date_elicited = u'%s/%s/%s' % (str(m).zfill(2),
-                str(d).zfill(2), str(y))
-        else:
-            date_elicited = None
+        date_elicited = parse_lingsync_date(date_session_elicited)
         if date_elicited:
             old_collection['date_elicited'] = date_elicited
 
@@ -2695,66 +5454,6 @@ def punctuate_period_safe(string):
         return '%s.' % string
 
 
-def get_dict_from_session_fields(attr, session_fields):
-    """Given a list of dicts (`session_fields`), return the first one whose
-    'label' value is `attr`.
-
-    """
-
-    val_list = [f for f in session_fields if f['label'] == attr]
-    if len(val_list) is 0:
-        return None
-    elif len(val_list) is 1:
-        return val_list[0]
-    else:
-        print 'WARNING: more than one %s in field list!' % attr
-        return val_list[0]
-
-
-def get_val_from_session_fields(attr, session_fields):
-    """Given a list of dicts (`session_fields`), return the first one whose
-    'label' value is `attr` and return its 'value' value.
-
-    """
-
-    val_dict = get_dict_from_session_fields(attr, session_fields)
-    if val_dict:
-        return val_dict.get('value')
-    else:
-        return val_dict
-
-
-def get_dict_from_datum_fields(attr, datum_fields):
-    """Given a list of dicts (`datum_fields`), return the first one whose
-    'label' value is `attr`.
-
-    """
-
-    val_list = [f for f in datum_fields if f['label'] == attr]
-    if len(val_list) is 0:
-        return None
-    elif len(val_list) is 1:
-        return val_list[0]
-    else:
-        if len(set([x.get('value') for x in val_list])) != 1:
-            print 'WARNING: more than one %s in field list!' % attr
-            p(val_list)
-        return val_list[0]
-
-
-def get_val_from_datum_fields(attr, datum_fields):
-    """Given a list of dicts (`datum_fields`), return the first one whose
-    'label' value is `attr` and return its 'value' value.
-
-    """
-
-    val_dict = get_dict_from_datum_fields(attr, datum_fields)
-    if val_dict:
-        return val_dict.get('value')
-    else:
-        return val_dict
-
-
 def lingsync_comments2old_description(comments_list):
     """Return a LingSync session comments array as a string of text that can be
     put into the description of an OLD collection. Each comment should be its
@@ -2960,20 +5659,35 @@ def download(options, lingsync_config, lingsync_db_name):
     """
 
     print '\n%sStep 1. Download the LingSync data.%s' % (ANSI_HEADER, ANSI_ENDC)
-    if options.force_download:
+    if options.delta_download and not options.force_download and \
+    read_lingsync_checkpoint(lingsync_db_name) is not None and \
+    find_data_file(get_lingsync_json_filename(lingsync_db_name)) is not None:
+        lingsync_data_fname = download_lingsync_changes(lingsync_config,
+            lingsync_db_name, options.page_size, options.filter_docs)
+    elif options.force_download:
         flush('Downloading the LingSync data...')
         lingsync_data_fname = download_lingsync_json(lingsync_config,
-            lingsync_db_name)
+            lingsync_db_name, options.page_size, options.download_workers,
+            resume=False, filter_docs=options.filter_docs,
+            compress=options.compress)
     else:
-        lingsync_data_fname = get_lingsync_json_filename(lingsync_db_name)
-        if os.path.isfile(lingsync_data_fname):
+        lingsync_data_fname = find_data_file(
+            get_lingsync_json_filename(lingsync_db_name, options.compress))
+        if lingsync_data_fname is not None:
             print 'We already have the LingSync data in %s.' % (
                 lingsync_data_fname,)
+        elif read_download_manifest(lingsync_db_name) is not None:
+            print ('The LingSync data have been partially downloaded; finishing'
+                u' the download now')
+            lingsync_data_fname = download_lingsync_json(lingsync_config,
+                lingsync_db_name, options.page_size, options.download_workers,
+                filter_docs=options.filter_docs, compress=options.compress)
         else:
             print ('The LingSync data have not been downloaded; downloading them'
                 u' now')
             lingsync_data_fname = download_lingsync_json(lingsync_config,
-                lingsync_db_name)
+                lingsync_db_name, options.page_size, options.download_workers,
+                filter_docs=options.filter_docs, compress=options.compress)
     if lingsync_data_fname is None:
         sys.exit('Unable to download the LingSync JSON data.\nAborting.')
     return lingsync_data_fname
@@ -2987,13 +5701,35 @@ def convert(options, lingsync_data_fname, lingsync_db_name):
 
     print ('\n%sStep 2. Convert the LingSync data to an OLD-compatible'
         u' structure.%s' % (ANSI_HEADER, ANSI_ENDC))
+    profile = None
+    if options.profile or options.profile_pstats:
+        profile = ConversionProfile(pstats=options.profile_pstats)
     if options.force_convert:
         flush('Converting the LingSync data to an OLD-compatible format...')
+        if options.incremental_convert:
+            open_conversion_cache(lingsync_db_name, reset=True).close()
         old_data_fname = lingsync2old(lingsync_data_fname, lingsync_db_name,
-            options.force_file_download)
+            options.force_file_download, options.compress,
+            options.convert_workers, options.compact_records,
+            options.incremental_convert, options.sharded_output,
+            options.max_warning_examples, profile,
+            options.file_download_workers, options.file_download_host_workers)
     else:
-        old_data_fname = get_old_json_filename(lingsync_db_name)
-        if os.path.isfile(old_data_fname):
+        old_data_fname = find_old_data(lingsync_db_name, options.compress,
+            options.sharded_output)
+        if (old_data_fname is not None and options.incremental_convert and
+                os.path.getmtime(lingsync_data_fname) >
+                os.path.getmtime(old_data_fname)):
+            print ('The LingSync data have changed since they were converted;'
+                u' converting the new and changed documents.')
+            old_data_fname = lingsync2old(lingsync_data_fname,
+                lingsync_db_name, options.force_file_download,
+                options.compress, options.convert_workers,
+                options.compact_records, options.incremental_convert,
+                options.sharded_output, options.max_warning_examples,
+                profile, options.file_download_workers,
+                options.file_download_host_workers)
+        elif old_data_fname is not None:
             print 'We already have the converted OLD data in %s.' % (
                 old_data_fname,)
             if options.verbose:
@@ -3013,7 +5749,12 @@ def convert(options, lingsync_data_fname, lingsync_db_name):
             print ('The LingSync data have not yet been converted; doing that'
                 u' now.')
             old_data_fname = lingsync2old(lingsync_data_fname,
-                lingsync_db_name, options.force_file_download)
+                lingsync_db_name, options.force_file_download,
+                options.compress, options.convert_workers,
+                options.compact_records, options.incremental_convert,
+                options.sharded_output, options.max_warning_examples,
+                profile, options.file_download_workers,
+                options.file_download_host_workers)
     if old_data_fname is None:
         sys.exit('Unable to convert the LingSync JSON data to an OLD-compatible'
             ' format.\nAborting.')
@@ -3029,7 +5770,7 @@ def create_old_application_settings(old_data, c):
 
     """
 
-    appsett = old_data['applicationsettings'][0]
+    appsett = list(old_data['applicationsettings'])[0]
     # Only set new grammaticalities if the existing grammaticalities doesn't
     # contain all of the grammaticality values we need.
     existing_appsett = c.get('applicationsettings')[-1]
@@ -3074,9 +5815,10 @@ def upload(options, old_data_fname):
     print (u'\n%sStep 3. Upload the converted data to the OLD web service.%s' % (
         ANSI_HEADER, ANSI_ENDC))
 
-    # Get converted JSON data.
+    # Get converted JSON data. The resources in a directory of JSON Lines
+    # files are read lazily, as they are uploaded.
     try:
-        old_data = json.load(open(old_data_fname))
+        old_data = load_old_data(old_data_fname)
     except:
         sys.exit(u'%sUnable to locate file %s. Aborting.%s' % (ANSI_FAIL,
             old_data_fname, ANSI_ENDC))
@@ -3194,6 +5936,16 @@ def create_old_collections(old_data, c, old_url, relational_map):
             sys.exit(u'%sFailed to get the OLD id for the migration tag.'
                 u' Aborting.%s' % (ANSI_FAIL, ANSI_ENDC))
 
+        # Map each LingSync session id to the `(date_entered, datum_id)`
+        # pairs of the forms generated from its (non-deleted) datums, in a
+        # single pass over the forms.
+        session_forms = {}
+        for form in old_data.get('forms', []):
+            if not form.get('__lingsync_deleted'):
+                session_forms.setdefault(form.get('__lingsync_session_id'),
+                    []).append((form['date_entered'],
+                    form['__lingsync_datum_id']))
+
         # Issue the create (POST) requests.
         for collection in old_data['collections']:
 
@@ -3242,19 +5994,14 @@ def create_old_collections(old_data, c, old_url, relational_map):
             # being created without any forms in them even though the LingSync
             # sessions that they are derived from do have datums in them.
             contents = []
-            for form in old_data.get('forms', []):
-                if not form.get('__lingsync_deleted'):
-                    form_s_id = form.get('__lingsync_session_id')
-                    form_d_id = form['__lingsync_datum_id']
-                    if form_s_id == session_id:
-                        form_id = relational_map.get('forms', {}).get(form_d_id)
-                        if form_id:
-                            contents.append((form['date_entered'], form_id))
-                        else:
-                            print (u'%sWarning: unable to find id for OLD form'
-                                u' generated from LingSync datum %s.%s' % (
-                                ANSI_WARNING, form['__lingsync_datum_id'],
-                                ANSI_ENDC))
+            for date_entered, form_d_id in session_forms.get(session_id, []):
+                form_id = relational_map.get('forms', {}).get(form_d_id)
+                if form_id:
+                    contents.append((date_entered, form_id))
+                else:
+                    print (u'%sWarning: unable to find id for OLD form'
+                        u' generated from LingSync datum %s.%s' % (
+                        ANSI_WARNING, form_d_id, ANSI_ENDC))
             if not contents:
                 print '%sWARNING: collection "%s" has no contents.%s' % (
                     ANSI_WARNING, collection['title'], ANSI_ENDC)
@@ -3395,6 +6142,7 @@ def create_old_forms(old_data, c, old_url, relational_map):
 
         # Issue the create (POST) requests.
         last_form = None
+        linked_form_ids = []
         for form in old_data['forms']:
 
             datum_id = form.get('__lingsync_datum_id')
@@ -3528,6 +6276,8 @@ def create_old_forms(old_data, c, old_url, relational_map):
                         u' LingSync form %s that was migrated.%s' % (ANSI_FAIL,
                         datum_id, ANSI_ENDC))
 
+            if u'Links: ' in form['comments'] and 'id' in form:
+                linked_form_ids.append(form['id'])
             last_form = form
 
         # If the form has "Links: " in it, then we convert the LingSync ids to
@@ -3546,39 +6296,38 @@ def create_old_forms(old_data, c, old_url, relational_map):
                 return 'form(%d)' % form_id
             else:
                 return 'similar to LingSync datum %s' % datum_id
-        for form in old_data['forms']:
-            if u'Links: ' in form['comments']:
-                print 'requesting form for linking ...'
-                form_r = c.get('forms/%d' % form['id'])
-                print 'form_r is '
-                print form_r
-                if form_r.get('error'):
-                    print ('Form %d has LingSync links but we could not retrieve'
-                        ' it.' % form['id'])
-                    continue
-                form_r['comments'] = patt.sub(fix, form_r['comments'])
-                if form_r['elicitation_method']:
-                    form_r['elicitation_method'] = form_r['elicitation_method']['id']
-                if form_r['syntactic_category']:
-                    form_r['syntactic_category'] = form_r['syntactic_category']['id']
-                if form_r['speaker']:
-                    form_r['speaker'] = form_r['speaker']['id']
-                if form_r['elicitor']:
-                    form_r['elicitor'] = form_r['elicitor']['id']
-                if form_r['verifier']:
-                    form_r['verifier'] = form_r['verifier']['id']
-                if form_r['source']:
-                    form_r['source'] = form_r['source']['id']
-                if form_r['tags']:
-                    form_r['tags'] = [t['id'] for t in form_r['tags']]
-                if form_r['files']:
-                    form_r['files'] = [t['id'] for t in form_r['files']]
-                if form_r['date_elicited']:
-                    x = form_r['date_elicited']
-                    if len(x.split('-')) == 3:
-                        y, m, d = x.split('-')
-                        form_r['date_elicited'] = u'%s/%s/%s' % (m, d, y)
-                r = c.update('forms/%d' % form_r['id'], form_r)
+        for form_id in linked_form_ids:
+            print 'requesting form for linking ...'
+            form_r = c.get('forms/%d' % form_id)
+            print 'form_r is '
+            print form_r
+            if form_r.get('error'):
+                print ('Form %d has LingSync links but we could not retrieve'
+                    ' it.' % form_id)
+                continue
+            form_r['comments'] = patt.sub(fix, form_r['comments'])
+            if form_r['elicitation_method']:
+                form_r['elicitation_method'] = form_r['elicitation_method']['id']
+            if form_r['syntactic_category']:
+                form_r['syntactic_category'] = form_r['syntactic_category']['id']
+            if form_r['speaker']:
+                form_r['speaker'] = form_r['speaker']['id']
+            if form_r['elicitor']:
+                form_r['elicitor'] = form_r['elicitor']['id']
+            if form_r['verifier']:
+                form_r['verifier'] = form_r['verifier']['id']
+            if form_r['source']:
+                form_r['source'] = form_r['source']['id']
+            if form_r['tags']:
+                form_r['tags'] = [t['id'] for t in form_r['tags']]
+            if form_r['files']:
+                form_r['files'] = [t['id'] for t in form_r['files']]
+            if form_r['date_elicited']:
+                x = form_r['date_elicited']
+                if len(x.split('-')) == 3:
+                    y, m, d = x.split('-')
+                    form_r['date_elicited'] = u'%s/%s/%s' % (m, d, y)
+            r = c.update('forms/%d' % form_r['id'], form_r)
 
         print 'Done.'
 
@@ -3688,7 +6437,7 @@ def create_old_tags(old_data, c, old_url, lingsync_corpus_name, relational_map):
 
     if old_data.get('tags'):
         tags_to_create = []
-        tags = old_data.get('tags')
+        tags = list(old_data.get('tags'))
         tag_names = [t['name'] for t in tags]
 
         # Retrieve the existing tags from the OLD. This may affect what
@@ -3740,7 +6489,7 @@ def create_old_speakers(old_data, c, old_url, relational_map):
         relational_map.setdefault('speakers', {})
         speakers_to_create = []
         speakers_to_update = []
-        speakers = old_data.get('speakers')
+        speakers = list(old_data.get('speakers'))
         speaker_names = [(s['first_name'], s['last_name']) for s in speakers]
 
         # Retrieve the existing speakers from the OLD. This may affect what
@@ -3868,7 +6617,7 @@ def create_old_users(old_data, c, old_url, relational_map):
         relational_map.setdefault('users', {})
         users_to_create = []
         users_to_update = []
-        users = old_data.get('users')
+        users = list(old_data.get('users'))
 
         # LingSync users may have objects/dicts as values for their 'username'
         # fields. Therefore we transform these to strings here.
@@ -3889,10 +6638,7 @@ def create_old_users(old_data, c, old_url, relational_map):
         # with the same username. Since the OLD doesn't allow this, we have to
         # fix it here.
         new_users = []
-        usersdict = {}
-        for user in users:
-            usersdict.setdefault(user['username'], []).append(user)
-        for username, users_list in usersdict.iteritems():
+        for users_list in group_resources(users, lambda u: u['username']):
             if len(users_list) == 1:
                 new_users.append(users_list[0])
             else:
@@ -0,0 +1,523 @@
+#!/usr/bin/python
+# coding=utf8
+
+"""
+================================================================================
+  Synthetic LingSync Corpus Generator
+================================================================================
+
+This script generates a synthetic LingSync corpus, i.e., a JSON file in the
+`_all_docs?include_docs=true` format that lingsync2old.py downloads from
+CouchDB, so that the conversion can be tested and benchmarked (see
+benchmark_conversion.py) without a real corpus. The corpus is random but
+reproducible: the same options (including the seed) always generate the same
+file.
+
+The corpus has the shapes that lingsync2old.py deals with:
+
+- sessions, with `sessionFields` (goals, consultants, dialects, dates in
+  several formats, etc.), copies of which are embedded in their datums, some
+  of them at an older revision;
+
+- datums, whose `datumFields` follow a handful of layouts with varied labels
+  (including non-standard, unknown and repeated ones), with tags (as `tags`
+  fields and `datumTags`), comments and `audioVideo` entries;
+
+- users, datalists, and a few documents that are not migrated (design
+  documents, corpus documents);
+
+- pathological values: glosses, morphemes and utterances longer than the OLD
+  allows, runs of question marks, grammaticality values with comments in them,
+  comma-separated tag strings, non-ASCII characters, empty and missing values.
+
+
+Usage
+--------------------------------------------------------------------------------
+
+Generate a corpus with 10,000 datums::
+
+    $ ./synthetic_lingsync_corpus.py --datums=10000 --output=synthetic.json
+
+The result can then be converted by lingsync2old.py as if it had been
+downloaded, i.e., by saving it as `_ls2old_lingsyncjson/<corpus>.json`.
+
+Full param/option listing:
+
+    --datums: the number of datums to generate. Default is 1000.
+
+    --datums-per-session: the average number of datums per session. Default
+        is 20.
+
+    --users: the number of users to generate. Default is 5.
+
+    --datalists: the number of datalists to generate. Default is 3.
+
+    --pathological-rate: the proportion (0 to 1) of datum values that are
+        pathological (too long, question marks, etc.). Default is 0.05.
+
+    --media-rate: the proportion (0 to 1) of datums that have an audio file
+        in their `audioVideo` attribute. Default is 0.02.
+
+    --media-url: the URL under which the audio files of the datums are
+        served (see `write_synthetic_media_files`). Default is
+        'http://127.0.0.1:8765/'.
+
+    --seed: the seed of the random number generator. Default is 0.
+
+    --output: the path of the JSON file to write. It is compressed if it ends
+        in '.gz' or '.bz2'. Default is 'synthetic-lingsync.json'.
+
+"""
+
+from lingsync2old import open_data_file
+import optparse
+import hashlib
+import random
+import json
+import os
+
+
+# Number of distinct audio files that the `audioVideo` entries of the datums
+# refer to, and the size of each, in bytes.
+MEDIA_FILE_COUNT = 50
+MEDIA_FILE_SIZE = 2048
+
+# Raw material for the values of the generated documents.
+MORPHEMES = [u'ni', u'waak', u'hp', u'oo', u'ikak', u'sstoyi', u'ʔat',
+    u'ŋa', u'ki', u'aw', u'pii', u'nitsi', u'akaa', u'omaa', u'ssk']
+GLOSSES = [u'1', u'see', u'3', u'go', u'PST', u'cold', u'DUR', u'here',
+    u'and', u'PL', u'INAN', u'already', u'tree', u'AN', u'dog']
+WORDS = [u'the', u'dog', u'saw', u'a', u'tree', u'I', u'went', u'home',
+    u'it', u'is', u'cold', u'already', u'they', u'are', u'here', u'café']
+NAMES = [u'gina', u'jdunham', u'alan', u'mary', u'Dave', u'leo', u'ursula']
+LANGUAGES = [u'Blackfoot', u'Inuktitut', u'Transylvanian Saxon', u'']
+DIALECTS = [u'Kainai', u'Siksika', u'north', u'', u'']
+TAGS = [u'imperative', u'question', u'negation', u'evidential', u'text',
+    u'paradigm', u'elicitation']
+VALIDATION_STATUSES = [u'Checked', u'Checked', u'toBeChecked', u'',
+    u'Deleted', u'Published']
+
+# The `datumFields` layouts of the datums. Real corpora have only a few, and
+# most datums follow one of them; some datums get extra fields.
+DATUM_LAYOUTS = [
+    [u'judgement', u'utterance', u'morphemes', u'gloss', u'translation',
+        u'comments', u'tags', u'validationStatus', u'syntacticCategory',
+        u'enteredByUser', u'modifiedByUser'],
+    [u'judgement', u'utterance', u'morphemes', u'gloss', u'translation',
+        u'context', u'comments', u'tags', u'validationStatus',
+        u'enteredByUser', u'modifiedByUser', u'markAsNeedsToBeSaved',
+        u'checked'],
+    [u'utterance', u'phonetic', u'morpheme', u'allomorphs', u'gloss',
+        u'translation', u'contextTranslation', u'notes', u'itemNumber',
+        u'speaker', u'links', u'tags', u'validationStatus', u'enteredByUser',
+        u'modifiedByUser', u'consultant', u'dialect', u'language'],
+    [u'judgment', u'utterance', u'morphemes', u'gloss', u'translation',
+        u'another_translation', u'context_translation', u'chapter', u'verse',
+        u'documentation', u'enteredByUser', u'undefined'],
+    [u'utterance', u'german', u'rudi', u'ursula', u'begintimehh:mm:ssms',
+        u'modality', u'relatedData', u'gloss', u'translation', u'tags',
+        u'enteredByUser', u'audioFileName']
+]
+EXTRA_DATUM_LABELS = [u'syntacticTreeLatex', u'notes', u'audio',
+    u'contextFile', u'orthography', u'housekeeping', u'elicitationNotes',
+    u'semanticField', u'gloss']
+
+
+def get_doc_id(seed, kind, number):
+    """Return the id of the `number`th document of `kind` (e.g., 'datum') in
+    the corpus generated with `seed`. Ids are derived, rather than drawn, so
+    that documents can refer to each other before they are generated.
+
+    """
+
+    return hashlib.md5('%s-%s-%d' % (seed, kind, number)).hexdigest()
+
+
+def random_date(rng):
+    """Return a random ISO 8601 timestamp from 2012 to 2015."""
+
+    return u'%d-%02d-%02dT%02d:%02d:%02d.%03dZ' % (rng.randint(2012, 2015),
+        rng.randint(1, 12), rng.randint(1, 28), rng.randint(0, 23),
+        rng.randint(0, 59), rng.randint(0, 59), rng.randint(0, 999))
+
+
+def random_words(rng, words, count):
+    """Return a string of `count` words drawn from `words`."""
+
+    return u' '.join(rng.choice(words) for _ in xrange(count))
+
+
+def random_morphemes(rng, word_count):
+    """Return a morphologically segmented sentence and its gloss."""
+
+    morphemes = []
+    glosses = []
+    for _ in xrange(word_count):
+        size = rng.randint(1, 3)
+        indexes = [rng.randrange(len(MORPHEMES)) for _ in xrange(size)]
+        morphemes.append(u'-'.join(MORPHEMES[i] for i in indexes))
+        glosses.append(u'-'.join(GLOSSES[i] for i in indexes))
+    return u' '.join(morphemes), u' '.join(glosses)
+
+
+def pathological_value(rng, value):
+    """Return a pathological variant of the string `value`."""
+
+    choice = rng.randrange(5)
+    if choice == 0:
+        # Longer than the 510 characters that the OLD allows.
+        return (value + u' ') * (1 + 600 // (len(value) + 1))
+    elif choice == 1:
+        return u'???'
+    elif choice == 2:
+        return u'%s ?? %s' % (value, u'?' * rng.randint(2, 12))
+    elif choice == 3:
+        return u''
+    return u'  %s’  ' % value
+
+
+def make_session(rng, number, seed, rev=2):
+    """Return the `number`th session of the corpus, at revision `rev`."""
+
+    session_id = get_doc_id(seed, 'session', number)
+    date_format = rng.randrange(4)
+    year, month, day = (rng.randint(2012, 2015), rng.randint(1, 12),
+        rng.randint(1, 28))
+    if date_format == 0:
+        date_elicited = u'%d-%02d-%02d' % (year, month, day)
+    elif date_format == 1:
+        date_elicited = u'%02d/%02d/%d' % (month, day, year)
+    elif date_format == 2:
+        date_elicited = rng.choice([u'spring %d' % year, u'none', u''])
+    else:
+        date_elicited = u'%d-%02d-%02d' % (year, month, day)
+    goal = rng.choice([u'Elicit %s' % random_words(rng, WORDS, 3), u'',
+        u'Goal %d' % number])
+    if rng.random() < 0.02:
+        goal = goal * 40
+    consultants = rng.choice([u'DS', u'AB CD', u'mary', u'', u'Dave Smith'])
+    fields = [
+        {u'label': u'goal', u'value': goal},
+        {u'label': u'consultants', u'value': consultants},
+        {u'label': u'dialect', u'value': rng.choice(DIALECTS)},
+        {u'label': u'language', u'value': rng.choice(LANGUAGES)},
+        {u'label': u'dateElicited', u'value': date_elicited},
+        {u'label': u'user', u'value': rng.choice(NAMES)},
+        {u'label': u'dateSEntered', u'value': random_date(rng)}
+    ]
+    if rng.random() < 0.1:
+        fields.append({u'label': u'participants', u'value': u''})
+    if rng.random() < 0.05:
+        fields.append({u'label': u'sessionNotes', u'value': u'notes'})
+    session = {
+        u'_id': session_id,
+        u'_rev': u'%d-%s' % (rev, get_doc_id(seed, 'rev', number)),
+        u'collection': u'sessions',
+        u'sessionFields': fields,
+        u'dateCreated': random_date(rng),
+        u'dateModified': random_date(rng),
+        u'lastModifiedBy': rng.choice(NAMES),
+        u'pouchname': u'synthetic-corpus',
+        u'comments': []
+    }
+    if rng.random() < 0.2:
+        session[u'comments'].append({u'text': random_words(rng, WORDS, 6),
+            u'username': rng.choice(NAMES), u'timestamp': 1427907030852})
+    if rng.random() < 0.01:
+        session[u'trashed'] = u'deleted'
+    return session
+
+
+def make_datum(rng, number, seed, session, options):
+    """Return the `number`th datum of the corpus, embedding `session`."""
+
+    pathological_rate = options.pathological_rate
+    word_count = rng.randint(1, 8)
+    morphemes, gloss = random_morphemes(rng, word_count)
+    utterance = morphemes.replace(u'-', u'')
+    values = {
+        u'judgement': rng.choice([u'', u'', u'*', u'?', u'#',
+            u'*this sounds odd to her']),
+        u'utterance': utterance,
+        u'morphemes': morphemes,
+        u'morpheme': morphemes,
+        u'allomorphs': morphemes if rng.random() < 0.5 else gloss,
+        u'phonetic': utterance,
+        u'gloss': gloss,
+        u'translation': random_words(rng, WORDS, word_count + 1),
+        u'contextTranslation': random_words(rng, WORDS, 4),
+        u'another_translation': random_words(rng, WORDS, 4),
+        u'context_translation': random_words(rng, WORDS, 4),
+        u'comments': random_words(rng, WORDS, 5),
+        u'tags': rng.choice([u'', u'', rng.choice(TAGS), u'%s, %s' % (
+            rng.choice(TAGS), rng.choice(TAGS))]),
+        u'validationStatus': rng.choice(VALIDATION_STATUSES),
+        u'syntacticCategory': rng.choice([u'', u'S', u'VP', u'N-Num']),
+        u'syntacticTreeLatex': u'\\Tree [.S %s ]' % utterance,
+        u'enteredByUser': rng.choice(NAMES),
+        u'modifiedByUser': rng.choice(NAMES),
+        u'context': random_words(rng, WORDS, 3),
+        u'notes': random_words(rng, WORDS, 3),
+        u'itemNumber': unicode(number),
+        u'speaker': rng.choice([u'', u'A', u'B']),
+        u'links': u'similarTo:%s' % get_doc_id(seed, 'datum',
+            rng.randrange(options.datums)),
+        u'consultant': rng.choice([u'1', u'15', u'participant']),
+        u'chapter': unicode(rng.randint(1, 50)),
+        u'verse': unicode(rng.randint(1, 30)),
+        u'documentation': u'  %s  ' % random_words(rng, WORDS, 2),
+        u'undefined': u'?' * rng.randint(1, 6),
+        u'german': random_words(rng, WORDS, 3),
+        u'rudi': utterance,
+        u'ursula': utterance,
+        u'begintimehh:mm:ssms': u'%d:%02d.%d' % (rng.randint(0, 59),
+            rng.randint(0, 59), rng.randint(0, 9)),
+        u'modality': u'spoken',
+        u'relatedData': {u'relatedData': []}
+    }
+    layout = list(rng.choice(DATUM_LAYOUTS))
+    if rng.random() < 0.1:
+        layout.append(rng.choice(EXTRA_DATUM_LABELS))
+    fields = []
+    for label in layout:
+        value = values.get(label, u'')
+        if isinstance(value, unicode) and rng.random() < pathological_rate:
+            value = pathological_value(rng, value)
+        fields.append({u'label': label, u'value': value})
+    datum_id = get_doc_id(seed, 'datum', number)
+    datum = {
+        u'_id': datum_id,
+        u'_rev': u'1-%s' % get_doc_id(seed, 'datum-rev', number),
+        u'collection': u'datums',
+        u'datumFields': fields,
+        u'session': session,
+        u'dateEntered': random_date(rng),
+        u'dateModified': random_date(rng),
+        u'datumTags': [],
+        u'comments': [],
+        u'audioVideo': [],
+        u'images': [],
+        u'jsonType': u'Datum',
+        u'pouchname': u'synthetic-corpus',
+        u'timestamp': 1427907030852
+    }
+    if rng.random() < 0.05:
+        # Some datums use `fields` instead of `datumFields`.
+        datum[u'fields'] = datum.pop(u'datumFields')
+        datum[u'fieldDBtype'] = u'Datum'
+        del datum[u'collection']
+    if rng.random() < 0.3:
+        datum[u'datumTags'].append({u'tag': rng.choice(TAGS)})
+    if rng.random() < 0.01:
+        datum[u'datumTags'].append({u'color': u'red'})
+    if rng.random() < 0.2:
+        datum[u'comments'].append({u'text': random_words(rng, WORDS, 6),
+            u'username': rng.choice(NAMES), u'timestamp': 1427907030852})
+    if rng.random() < options.media_rate:
+        media_number = rng.randrange(MEDIA_FILE_COUNT)
+        filename = get_media_filename(media_number)
+        datum[u'audioVideo'].append({
+            u'URL': options.media_url + filename,
+            u'filename': filename,
+            u'type': u'audio/x-wav',
+            u'size': MEDIA_FILE_SIZE,
+            u'dateCreated': random_date(rng),
+            u'description': random_words(rng, WORDS, 3)
+        })
+    if rng.random() < 0.01:
+        datum[u'trashed'] = u'deleted'
+    if rng.random() < 0.005:
+        datum[u'unknownAttribute'] = True
+    return datum
+
+
+def make_user(rng, number, seed):
+    """Return the `number`th user of the corpus."""
+
+    name = NAMES[number % len(NAMES)]
+    if number >= len(NAMES):
+        name = u'%s%d' % (name, number)
+    return {
+        u'_id': get_doc_id(seed, 'user', number),
+        u'_rev': u'1-%s' % get_doc_id(seed, 'user-rev', number),
+        u'collection': u'users',
+        u'username': name,
+        u'firstname': name.capitalize(),
+        u'lastname': rng.choice([u'Smith', u'', u'Holden']),
+        u'email': rng.choice([u'', u'%s@example.com' % name]),
+        u'affiliation': rng.choice([u'', u'University']),
+        u'researchInterest': u'',
+        u'description': u'',
+        u'gravatar': get_doc_id(seed, 'gravatar', number)
+    }
+
+
+def make_datalist(rng, number, seed, datum_count):
+    """Return the `number`th datalist of the corpus."""
+
+    size = min(datum_count, rng.randint(1, 200))
+    datum_ids = [get_doc_id(seed, 'datum', rng.randrange(datum_count))
+        for _ in xrange(size)]
+    return {
+        u'_id': get_doc_id(seed, 'datalist', number),
+        u'_rev': u'1-%s' % get_doc_id(seed, 'datalist-rev', number),
+        u'collection': u'datalists',
+        u'title': rng.choice([u'', u'Datalist %d' % number]),
+        u'description': random_words(rng, WORDS, 6),
+        u'datumIds': datum_ids,
+        u'dateCreated': random_date(rng),
+        u'dateModified': random_date(rng),
+        u'pouchname': u'synthetic-corpus'
+    }
+
+
+def get_media_filename(number):
+    """Return the name of the `number`th audio file of the corpus."""
+
+    return u'synthetic-%03d.wav' % number
+
+
+def write_synthetic_media_files(dirpath, count=MEDIA_FILE_COUNT):
+    """Write the audio files that the datums of a synthetic corpus refer to
+    into `dirpath`, so that they can be served under `--media-url`.
+
+    """
+
+    if not os.path.isdir(dirpath):
+        os.makedirs(dirpath)
+    for number in xrange(count):
+        path = os.path.join(dirpath, get_media_filename(number))
+        with open(path, 'wb') as f:
+            f.write('RIFF' + '\0' * (MEDIA_FILE_SIZE - 4))
+
+
+def iter_synthetic_docs(options):
+    """Generate the documents of the synthetic corpus described by `options`
+    (see `get_default_options`), in an arbitrary (but fixed) order.
+
+    """
+
+    seed = options.seed
+    rng = random.Random(seed)
+    session_count = max(1, options.datums // max(1, options.datums_per_session))
+    sessions = [make_session(rng, number, seed) for number in
+        xrange(session_count)]
+    # Datums may embed an older revision of their session.
+    old_sessions = [make_session(random.Random('%s-%d' % (seed, number)),
+        number, seed, rev=1) for number in xrange(session_count)]
+    for session in sessions:
+        yield session
+    for number in xrange(options.datums):
+        session_number = rng.randrange(session_count)
+        if rng.random() < 0.02:
+            session = old_sessions[session_number]
+        else:
+            session = sessions[session_number]
+        yield make_datum(rng, number, seed, session, options)
+    for number in xrange(options.users):
+        yield make_user(rng, number, seed)
+    for number in xrange(options.datalists):
+        yield make_datalist(rng, number, seed, max(1, options.datums))
+    yield {u'_id': u'_design/deprecated', u'_rev': u'1-0',
+        u'views': {u'by_date': {u'map': u'function (doc) {}'}}}
+    yield {u'_id': get_doc_id(seed, 'corpus', 0), u'_rev': u'1-0',
+        u'fieldDBtype': u'Corpus', u'title': u'Synthetic corpus'}
+
+
+def count_synthetic_docs(options):
+    """Return the number of documents that `iter_synthetic_docs` generates."""
+
+    session_count = max(1, options.datums // max(1, options.datums_per_session))
+    return session_count + options.datums + options.users + options.datalists + 2
+
+
+def write_synthetic_corpus(options, path):
+    """Write the synthetic corpus described by `options` to `path` as
+    LingSync `_all_docs` JSON, one row at a time, and return the number of
+    rows written.
+
+    """
+
+    total_rows = count_synthetic_docs(options)
+    rows = 0
+    with open_data_file(path, 'w') as outfile:
+        outfile.write('{"total_rows": %d, "offset": 0, "rows": [\n' % (
+            total_rows,))
+        for doc in iter_synthetic_docs(options):
+            if rows:
+                outfile.write(',\n')
+            outfile.write(json.dumps({u'id': doc[u'_id'], u'key': doc[u'_id'],
+                u'value': {u'rev': doc[u'_rev']}, u'doc': doc}))
+            rows += 1
+        outfile.write('\n]}\n')
+    return rows
+
+
+def add_optparser_options(parser):
+    """Add the options of this script to the optparse `parser`."""
+
+    parser.add_option("--datums", dest="datums", type="int", default=1000,
+            metavar="DATUMS",
+            help="The number of datums to generate. Default is 1000.")
+
+    parser.add_option("--datums-per-session", dest="datums_per_session",
+            type="int", default=20, metavar="DATUMS_PER_SESSION",
+            help="The average number of datums per session. Default is 20.")
+
+    parser.add_option("--users", dest="users", type="int", default=5,
+            metavar="USERS",
+            help="The number of users to generate. Default is 5.")
+
+    parser.add_option("--datalists", dest="datalists", type="int", default=3,
+            metavar="DATALISTS",
+            help="The number of datalists to generate. Default is 3.")
+
+    parser.add_option("--pathological-rate", dest="pathological_rate",
+            type="float", default=0.05, metavar="PATHOLOGICAL_RATE",
+            help="The proportion of datum values that are pathological."
+            " Default is 0.05.")
+
+    parser.add_option("--media-rate", dest="media_rate", type="float",
+            default=0.02, metavar="MEDIA_RATE",
+            help="The proportion of datums that have an audio file. Default"
+            " is 0.02.")
+
+    parser.add_option("--media-url", dest="media_url",
+            default="http://127.0.0.1:8765/", metavar="MEDIA_URL",
+            help="The URL under which the audio files of the datums are"
+            " served. Default is http://127.0.0.1:8765/.")
+
+    parser.add_option("--seed", dest="seed", type="int", default=0,
+            metavar="SEED",
+            help="The seed of the random number generator. Default is 0.")
+
+
+def get_default_options(**kwargs):
+    """Return the options of this script, with their defaults overridden by
+    `kwargs`, for use from other scripts (e.g., benchmark_conversion.py).
+
+    """
+
+    parser = optparse.OptionParser()
+    add_optparser_options(parser)
+    options, _ = parser.parse_args([])
+    for key, value in kwargs.iteritems():
+        setattr(options, key, value)
+    return options
+
+
+def main():
+    parser = optparse.OptionParser()
+    add_optparser_options(parser)
+    parser.add_option("--output", dest="output",
+            default="synthetic-lingsync.json", metavar="OUTPUT",
+            help="The path of the JSON file to write. Default is"
+            " synthetic-lingsync.json.")
+    options, _ = parser.parse_args()
+    rows = write_synthetic_corpus(options, options.output)
+    print 'Wrote %d LingSync documents (%d datums) to %s.' % (rows,
+        options.datums, options.output)
+
+
+if __name__ == '__main__':
+    main()